@@ -1,59 +1,113 @@
 """
-Application configuration using Pydantic Settings
+Application configuration loaded from environment variables
 """
 
-from functools import lru_cache
-from typing import List
+import json
+import os
+from dataclasses import dataclass, field
+from typing import List, Optional
 
-from pydantic import Field
-from pydantic_settings import BaseSettings
+ENV_FILE = ".env"
 
 
-class Settings(BaseSettings):
+def _env_str(name: str, default: str) -> str:
+    """Read a string setting from the environment"""
+    return os.environ.get(name, default)
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment"""
+    value = os.environ.get(name)
+    return int(value) if value is not None else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean setting from the environment"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_list(name: str, default: List[str]) -> List[str]:
+    """Read a list setting given as a JSON array or comma-separated string"""
+    value = os.environ.get(name)
+    if value is None:
+        return list(default)
+    value = value.strip()
+    if value.startswith("["):
+        return json.loads(value)
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
     """Application settings"""
 
     # Server settings
-    host: str = Field(default="0.0.0.0", description="Server host")
-    port: int = Field(default=8000, description="Server port")
-    debug: bool = Field(default=True, description="Debug mode")
+    host: str = "0.0.0.0"
+    port: int = 8000
+    debug: bool = True
 
     # CORS settings
-    cors_origins: List[str] = Field(
-        default=["http://localhost:3000", "http://localhost:5173"],
-        description="Allowed CORS origins",
+    cors_origins: List[str] = field(
+        default_factory=lambda: ["http://localhost:3000", "http://localhost:5173"]
     )
 
     # Database settings
-    firebase_credentials_path: str = Field(
-        default="firebase-service.json",
-        description="Path to Firebase credentials JSON file",
-    )
+    firebase_credentials_path: str = "firebase-service.json"
 
     # External services
-    meilisearch_url: str = Field(
-        default="http://localhost:7700", description="MeiliSearch URL"
-    )
-    meilisearch_api_key: str = Field(default="", description="MeiliSearch API key")
+    meilisearch_url: str = "http://localhost:7700"
+    meilisearch_api_key: str = ""
 
     # Payment settings
-    moysar_pk: str = Field(default="", description="Moysar public key")
-    moysar_sk: str = Field(default="", description="Moysar secret key")
+    moysar_pk: str = ""
+    moysar_sk: str = ""
 
     # Security
-    secret_key: str = Field(
-        default="your-secret-key-change-in-production", description="JWT secret key"
-    )
-    algorithm: str = Field(default="HS256", description="JWT algorithm")
-    access_token_expire_minutes: int = Field(
-        default=30, description="Access token expiration"
-    )
+    secret_key: str = "your-secret-key-change-in-production"
+    algorithm: str = "HS256"
+    access_token_expire_minutes: int = 30
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Build settings from environment variables, falling back to defaults"""
+        if os.path.exists(ENV_FILE):
+            # Existing environment variables take precedence over the file
+            from dotenv import load_dotenv
+
+            load_dotenv(ENV_FILE)
+
+        defaults = cls()
+        return cls(
+            host=_env_str("HOST", defaults.host),
+            port=_env_int("PORT", defaults.port),
+            debug=_env_bool("DEBUG", defaults.debug),
+            cors_origins=_env_list("CORS_ORIGINS", defaults.cors_origins),
+            firebase_credentials_path=_env_str(
+                "FIREBASE_CREDENTIALS_PATH", defaults.firebase_credentials_path
+            ),
+            meilisearch_url=_env_str("MEILISEARCH_URL", defaults.meilisearch_url),
+            meilisearch_api_key=_env_str(
+                "MEILISEARCH_API_KEY", defaults.meilisearch_api_key
+            ),
+            moysar_pk=_env_str("MOYSAR_PK", defaults.moysar_pk),
+            moysar_sk=_env_str("MOYSAR_SK", defaults.moysar_sk),
+            secret_key=_env_str("SECRET_KEY", defaults.secret_key),
+            algorithm=_env_str("ALGORITHM", defaults.algorithm),
+            access_token_expire_minutes=_env_int(
+                "ACCESS_TOKEN_EXPIRE_MINUTES", defaults.access_token_expire_minutes
+            ),
+        )
+
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
+_settings: Optional[Settings] = None
 
 
-@lru_cache()
 def get_settings() -> Settings:
     """Get cached settings instance"""
-    return Settings()
+    global _settings
+    if _settings is None:
+        _settings = Settings.from_env()
+    return _settings
@@ -2,39 +2,182 @@
 Base classes for domain entities and value objects
 """
 
-import uuid
-from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+import os
+import threading
+from dataclasses import MISSING, dataclass, field, fields
 from datetime import datetime
-from typing import Any, Dict, Optional
-
-
-@dataclass
-class Entity(ABC):
+from typing import Any, Dict, Iterable, List, Optional
+
+# Bound once so entity construction skips the attribute lookup on datetime
+_now = datetime.now
+
+# Entity IDs are drawn from a per-thread pool of random bytes so the
+# os.urandom syscall is paid once per batch instead of once per entity
+_ID_BATCH_SIZE = 1024
+_ID_VARIANT = {c: "89ab"[int(c, 16) & 0x3] for c in "0123456789abcdef"}
+_id_pool = threading.local()
+
+# A forked child (e.g. a preloaded gunicorn worker) inherits the pool, and
+# would hand out the parent's IDs in the same order unless it draws its own
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=lambda: _id_pool.__dict__.clear())
+
+
+def _refill_id_pool() -> list:
+    """Generate a batch of UUID4 strings from a single urandom read"""
+    raw = os.urandom(16 * _ID_BATCH_SIZE).hex()
+    ids = []
+    for i in range(0, len(raw), 32):
+        h = raw[i : i + 32]
+        # Set the version (4) and RFC 4122 variant bits like uuid.uuid4()
+        ids.append(
+            f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{_ID_VARIANT[h[16]]}{h[17:20]}-{h[20:]}"
+        )
+    _id_pool.ids = ids
+    return ids
+
+
+def new_id() -> str:
+    """Return a new random UUID4 string"""
+    ids = getattr(_id_pool, "ids", None) or _refill_id_pool()
+    return ids.pop()
+
+
+def first_value(data: Dict[str, Any], *keys: str, default: Any = None) -> Any:
+    """
+    Return the first non-None value among keys in data, else default
+    Unlike nested data.get(k1, data.get(k2, x)), later keys are only
+    looked up when the earlier ones are missing
+    """
+    for key in keys:
+        value = data.get(key)
+        if value is not None:
+            return value
+    return default
+
+
+# Per-class loaders used by Entity.from_trusted, generated on first use
+_TRUSTED_LOADERS: Dict[type, Any] = {}
+
+
+def _build_trusted_loader(cls):
+    """Generate a function that assigns each dataclass field straight from a dict.
+
+    Like the dataclass-generated __init__, the body is emitted as source so
+    each field costs one assignment rather than a trip through a generic loop.
+    """
+    namespace: Dict[str, Any] = {"cls": cls, "new": object.__new__}
+    lines = ["def load(data):", "    self = new(cls)"]
+    for f in fields(cls):
+        if f.default_factory is not MISSING:
+            namespace[f"_factory_{f.name}"] = f.default_factory
+            value = f"data[{f.name!r}] if {f.name!r} in data else _factory_{f.name}()"
+        elif f.default is not MISSING:
+            namespace[f"_default_{f.name}"] = f.default
+            value = f"data.get({f.name!r}, _default_{f.name})"
+        else:
+            value = f"data[{f.name!r}]"
+        lines.append(f"    self.{f.name} = {value}")
+    lines.append("    return self")
+    exec("\n".join(lines), namespace)
+    loader = _TRUSTED_LOADERS[cls] = namespace["load"]
+    return loader
+
+
+def generate_to_dict(cls):
+    """Class decorator compiling cls._TO_DICT_FIELDS into a to_dict method.
+
+    Each entry is a (key, expression) pair where the expression is Python
+    source evaluated with ``self`` bound to the instance. The method is a
+    single dict literal, the same way dataclasses generates __init__.
+
+    An optional cls._TO_DICT_OPTIONAL table of (key, attribute, check_none)
+    entries adds keys only when the attribute is set: truthy by default, or
+    ``is not None`` when check_none is true.
+    """
+    items = "".join(f"        {key!r}: {expr},\n" for key, expr in cls._TO_DICT_FIELDS)
+    optional = getattr(cls, "_TO_DICT_OPTIONAL", ())
+    lines = [f"    data = {{\n{items}    }}\n"]
+    for key, attr, check_none in optional:
+        test = "value is not None" if check_none else "value"
+        lines.append(
+            f"    value = self.{attr}\n"
+            f"    if {test}:\n"
+            f"        data[{key!r}] = value\n"
+        )
+    namespace: Dict[str, Any] = {}
+    exec(f"def to_dict(self):\n{''.join(lines)}    return data\n", namespace)
+    to_dict = namespace["to_dict"]
+    to_dict.__qualname__ = f"{cls.__qualname__}.to_dict"
+    to_dict.__doc__ = "Convert to dictionary for serialization"
+    cls.to_dict = to_dict
+    return cls
+
+
+@dataclass(slots=True)
+class Entity:
     """Base class for all domain entities"""
 
     # These fields will be added by __post_init__ to avoid ordering issues
     id: str = field(default="", init=False)
-    created_at: datetime = field(default_factory=datetime.now, init=False)
-    updated_at: datetime = field(default_factory=datetime.now, init=False)
+    created_at: Optional[datetime] = field(default=None, init=False)
+    updated_at: Optional[datetime] = field(default=None, init=False)
 
     def __post_init__(self):
         """Called after initialization"""
-        if not self.id or self.id == "new" or self.id == "":
-            self.id = str(uuid.uuid4())
-        if not hasattr(self, "created_at") or not self.created_at:
-            self.created_at = datetime.now()
-        if not hasattr(self, "updated_at") or not self.updated_at:
-            self.updated_at = datetime.now()
-
-    def mark_updated(self):
-        """Mark entity as updated"""
-        self.updated_at = datetime.now()
-
-    @abstractmethod
+        if not self.id or self.id == "new":
+            self.id = new_id()
+        # Single clock read shared by both timestamps
+        now = _now()
+        if not self.created_at:
+            self.created_at = now
+        if not self.updated_at:
+            self.updated_at = now
+
+    @classmethod
+    def from_trusted(cls, data: Dict[str, Any]):
+        """Build an entity from already-validated data without running validate.
+
+        Intended for repositories loading stored records; fields missing from
+        data take their declared defaults.
+        """
+        loader = _TRUSTED_LOADERS.get(cls) or _build_trusted_loader(cls)
+        try:
+            instance = loader(data)
+        except KeyError as e:
+            raise ValidationError(f"Missing required field: {e.args[0]}")
+        # Base hook only fills in the ID and timestamps
+        Entity.__post_init__(instance)
+        return instance
+
+    @classmethod
+    def bulk_from_trusted(cls, records: Iterable[Dict[str, Any]]) -> List[Any]:
+        """Build many entities from trusted data, as from_trusted does for one.
+
+        The loader is looked up once and the clock read once for the batch.
+        """
+        loader = _TRUSTED_LOADERS.get(cls) or _build_trusted_loader(cls)
+        try:
+            instances = list(map(loader, records))
+        except KeyError as e:
+            raise ValidationError(f"Missing required field: {e.args[0]}")
+        now = _now()
+        for instance in instances:
+            if not instance.id or instance.id == "new":
+                instance.id = new_id()
+            if not instance.created_at:
+                instance.created_at = now
+            if not instance.updated_at:
+                instance.updated_at = now
+        return instances
+
+    def mark_updated(self, now: Optional[datetime] = None):
+        """Mark entity as updated, reusing the caller's clock read if given"""
+        self.updated_at = now or _now()
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert entity to dictionary for serialization"""
-        pass
+        raise NotImplementedError
 
     def __eq__(self, other):
         """Entities are equal if they have the same ID"""
@@ -47,18 +190,17 @@ class Entity(ABC):
         return hash(self.id)
 
 
-@dataclass(frozen=True)
-class ValueObject(ABC):
+@dataclass(frozen=True, slots=True)
+class ValueObject:
     """Base class for all value objects"""
 
     def __post_init__(self):
         """Validate value object after creation"""
         self.validate()
 
-    @abstractmethod
     def validate(self):
         """Validate the value object"""
-        pass
+        raise NotImplementedError
 
 
 class DomainException(Exception):
@@ -8,7 +8,7 @@ from typing import Any, Dict, Optional
 # Simple dataclass, no need for base Entity
 
 
-@dataclass
+@dataclass(slots=True)
 class AppSettings:
     """Application-wide settings entity"""
 
@@ -20,6 +20,21 @@ class AppSettings:
     home_screen_week_discount: Optional[float] = None
     home_screen_month_discount: Optional[float] = None
 
+    @property
+    def day_discount(self) -> float:
+        """Home screen day discount, falling back to the main discount"""
+        return self.home_screen_day_discount or self.main_discount
+
+    @property
+    def week_discount(self) -> float:
+        """Home screen week discount, falling back to the main discount"""
+        return self.home_screen_week_discount or self.main_discount
+
+    @property
+    def month_discount(self) -> float:
+        """Home screen month discount, falling back to the main discount"""
+        return self.home_screen_month_discount or self.main_discount
+
     @property
     def effective_discount(self) -> float:
         """Get the effective discount based on active status"""
@@ -32,12 +47,9 @@ class AppSettings:
             "settings": {
                 "activeMainDiscount": self.active_main_discount,
                 "mainDiscount": {"dayDiscount": self.main_discount},
-                "homeScreenDayDiscount": self.home_screen_day_discount
-                or self.main_discount,
-                "homeScreenWeekDiscount": self.home_screen_week_discount
-                or self.main_discount,
-                "homeScreenMonthDiscount": self.home_screen_month_discount
-                or self.main_discount,
+                "homeScreenDayDiscount": self.day_discount,
+                "homeScreenWeekDiscount": self.week_discount,
+                "homeScreenMonthDiscount": self.month_discount,
             },
         }
 
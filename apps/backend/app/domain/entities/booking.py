@@ -2,18 +2,19 @@
 Booking entity - Business object for rental bookings
 """
 
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, Optional
 
-from ..base import BusinessRuleViolation, Entity, ValidationError
+from ..base import BusinessRuleViolation, Entity, ValidationError, generate_to_dict
 from ..value_objects.date_range import DateRange
 from ..value_objects.location import LocationPair
 from ..value_objects.money import Money
 
 
-class BookingStatus(Enum):
+class BookingStatus(str, Enum):
     """Booking status enumeration"""
 
     PENDING = "pending"
@@ -24,7 +25,7 @@ class BookingStatus(Enum):
     COMPLETED = "completed"
 
 
-class PaymentStatus(Enum):
+class PaymentStatus(str, Enum):
     """Payment status enumeration"""
 
     PENDING = "pending"
@@ -34,7 +35,17 @@ class PaymentStatus(Enum):
     REFUNDED = "refunded"
 
 
-@dataclass
+# Status sets checked by the state transition guards
+_CANCELLABLE_STATUSES = frozenset(
+    {BookingStatus.PENDING, BookingStatus.CONFIRMED, BookingStatus.ACCEPTED}
+)
+_EDITABLE_STATUSES = frozenset({BookingStatus.PENDING, BookingStatus.CONFIRMED})
+
+_BOOKING_TYPES = frozenset({"Day", "Week", "Month"})
+
+
+@generate_to_dict
+@dataclass(slots=True)
 class Booking(Entity):
     """Booking entity with business logic"""
 
@@ -73,8 +84,11 @@ class Booking(Entity):
 
     def __post_init__(self):
         """Validate booking after creation"""
-        super().__post_init__()
+        # Explicit base call: zero-arg super() breaks on slots=True dataclasses
+        Entity.__post_init__(self)
         self.validate()
+        # Only three booking types exist, so share a single copy of each
+        self.booking_type = sys.intern(self.booking_type)
 
     def validate(self):
         """Validate booking business rules"""
@@ -93,7 +107,7 @@ class Booking(Entity):
         if self.count <= 0:
             raise ValidationError("Count must be positive")
 
-        if self.booking_type not in ["Day", "Week", "Month"]:
+        if self.booking_type not in _BOOKING_TYPES:
             raise ValidationError("Booking type must be Day, Week, or Month")
 
         if self.is_package_booking and (
@@ -120,20 +134,17 @@ class Booking(Entity):
 
     def can_cancel(self) -> bool:
         """Check if booking can be cancelled"""
-        return self.status in [
-            BookingStatus.PENDING,
-            BookingStatus.CONFIRMED,
-            BookingStatus.ACCEPTED,
-        ]
+        return self.status in _CANCELLABLE_STATUSES
 
     def accept(self) -> None:
         """Accept the booking"""
         if not self.can_accept():
             raise BusinessRuleViolation("Booking cannot be accepted in current state")
 
+        now = datetime.now()
         self.status = BookingStatus.ACCEPTED
-        self.accepted_at = datetime.now()
-        self.mark_updated()
+        self.accepted_at = now
+        self.mark_updated(now)
 
     def deny(self, reason: str) -> None:
         """Deny the booking"""
@@ -145,24 +156,26 @@ class Booking(Entity):
 
         self.status = BookingStatus.DENIED
         self.denied_reason = reason
-        self.denied_at = datetime.now()
-        self.mark_updated()
+        now = datetime.now()
+        self.denied_at = now
+        self.mark_updated(now)
 
     def cancel(self, reason: Optional[str] = None) -> None:
         """Cancel the booking"""
         if not self.can_cancel():
             raise BusinessRuleViolation("Booking cannot be cancelled in current state")
 
+        now = datetime.now()
         self.status = BookingStatus.CANCELLED
-        self.mark_updated()
+        self.mark_updated(now)
 
         if reason:
             self.booking_details["cancellation_reason"] = reason
-            self.booking_details["cancelled_at"] = datetime.now().isoformat()
+            self.booking_details["cancelled_at"] = now.isoformat()
 
     def update_dates(self, new_date_range: DateRange) -> None:
         """Update booking dates"""
-        if self.status not in [BookingStatus.PENDING, BookingStatus.CONFIRMED]:
+        if self.status not in _EDITABLE_STATUSES:
             raise BusinessRuleViolation(
                 "Cannot update dates after booking is processed"
             )
@@ -174,11 +187,7 @@ class Booking(Entity):
         self, new_car_id: str, new_booking_cost: Money, new_total_cost: Money
     ) -> None:
         """Replace car in booking"""
-        if self.status not in [
-            BookingStatus.PENDING,
-            BookingStatus.CONFIRMED,
-            BookingStatus.ACCEPTED,
-        ]:
+        if self.status not in _CANCELLABLE_STATUSES:
             raise BusinessRuleViolation("Cannot replace car in current booking state")
 
         if not new_car_id or not new_car_id.strip():
@@ -197,7 +206,7 @@ class Booking(Entity):
 
     def update_locations(self, new_locations: LocationPair) -> None:
         """Update pickup and dropoff locations"""
-        if self.status not in [BookingStatus.PENDING, BookingStatus.CONFIRMED]:
+        if self.status not in _EDITABLE_STATUSES:
             raise BusinessRuleViolation(
                 "Cannot update locations after booking is processed"
             )
@@ -205,33 +214,42 @@ class Booking(Entity):
         self.locations = new_locations
         self.mark_updated()
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for serialization"""
-        return {
-            "id": self.id,
-            "OrderId": self.order_id,
-            "BookingNumber": self.booking_number,
-            "user_id": self.user_id,
-            "car_id": self.car_id,
-            "start_date": self.date_range.start_date.isoformat(),
-            "end_date": self.date_range.end_date.isoformat(),
-            "count": self.count,
-            "BookingType": self.booking_type,
-            "booking_cost": self.booking_cost.to_float(),
-            "taxes": self.taxes.to_float(),
-            "Delivery": self.delivery_fee.to_float(),
-            "offersTotal": self.offers_total.to_float(),
-            "total_cost": self.total_cost.to_float(),
-            "Currency": self.total_cost.currency,
-            "OrderStatus": self.status.value,
-            "payment_status": self.payment_status.value,
-            "isPackageBooking": self.is_package_booking,
-            "packageMonths": self.package_months,
-            "isInstallment": self.is_installment,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
-            "BookingDetails": self.booking_details,
-            "denied_reason": self.denied_reason,
-            "accepted_at": self.accepted_at.isoformat() if self.accepted_at else None,
-            "denied_at": self.denied_at.isoformat() if self.denied_at else None,
-        }
+    # (key, expression) pairs compiled into to_dict by generate_to_dict. Values
+    # are JSON-safe, matching Car, Contract and User: ISO strings and enum values.
+    _TO_DICT_FIELDS = (
+        ("id", "self.id"),
+        ("OrderId", "self.order_id"),
+        ("BookingNumber", "self.booking_number"),
+        ("user_id", "self.user_id"),
+        ("car_id", "self.car_id"),
+        ("start_date", "self.date_range.start_date.isoformat()"),
+        ("end_date", "self.date_range.end_date.isoformat()"),
+        ("count", "self.count"),
+        ("BookingType", "self.booking_type"),
+        ("booking_cost", "self.booking_cost.to_float()"),
+        ("taxes", "self.taxes.to_float()"),
+        ("Delivery", "self.delivery_fee.to_float()"),
+        ("offersTotal", "self.offers_total.to_float()"),
+        ("total_cost", "self.total_cost.to_float()"),
+        ("Currency", "self.total_cost.currency"),
+        ("OrderStatus", "self.status.value"),
+        ("payment_status", "self.payment_status.value"),
+        ("isPackageBooking", "self.is_package_booking"),
+        ("packageMonths", "self.package_months"),
+        ("isInstallment", "self.is_installment"),
+        (
+            "created_at",
+            "self.created_at.isoformat() if self.created_at else None",
+        ),
+        (
+            "updated_at",
+            "self.updated_at.isoformat() if self.updated_at else None",
+        ),
+        ("BookingDetails", "self.booking_details"),
+        ("denied_reason", "self.denied_reason"),
+        (
+            "accepted_at",
+            "self.accepted_at.isoformat() if self.accepted_at else None",
+        ),
+        ("denied_at", "self.denied_at.isoformat() if self.denied_at else None"),
+    )
@@ -2,16 +2,18 @@
 Car entity - Core business object for vehicle management
 """
 
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from time import monotonic
+from typing import Any, Dict, Optional
 
-from ..base import BusinessRuleViolation, Entity, ValidationError
+from ..base import BusinessRuleViolation, Entity, ValidationError, generate_to_dict
 from ..value_objects.money import Money
 
 
-class CarStatus(Enum):
+class CarStatus(str, Enum):
     """Car status enumeration"""
 
     AVAILABLE = "available"
@@ -20,7 +22,7 @@ class CarStatus(Enum):
     OUT_OF_SERVICE = "out_of_service"
 
 
-class FuelType(Enum):
+class FuelType(str, Enum):
     """Fuel type enumeration"""
 
     GASOLINE = "gasoline"
@@ -29,7 +31,7 @@ class FuelType(Enum):
     ELECTRIC = "electric"
 
 
-class TransmissionType(Enum):
+class TransmissionType(str, Enum):
     """Transmission type enumeration"""
 
     MANUAL = "manual"
@@ -37,7 +39,32 @@ class TransmissionType(Enum):
     CVT = "cvt"
 
 
-@dataclass
+# The current year is re-read from the clock at most once per interval
+_YEAR_REFRESH_SECONDS = 3600.0
+_year_cache = [0.0, datetime.now().year]  # [next refresh (monotonic), year]
+
+
+def _current_year() -> int:
+    """Current calendar year, refreshed at most once per _YEAR_REFRESH_SECONDS"""
+    now = monotonic()
+    if now >= _year_cache[0]:
+        _year_cache[0] = now + _YEAR_REFRESH_SECONDS
+        _year_cache[1] = datetime.now().year
+    return _year_cache[1]
+
+
+# Required text attributes and the error raised when one is blank
+_REQUIRED_TEXT_FIELDS = (
+    ("make", "Car make is required"),
+    ("model", "Car model is required"),
+    ("color", "Car color is required"),
+    ("license_plate", "License plate is required"),
+    ("category", "Car category is required"),
+)
+
+
+@generate_to_dict
+@dataclass(slots=True)
 class Car(Entity):
     """Car entity with business logic"""
 
@@ -65,7 +92,8 @@ class Car(Entity):
     engine_size: Optional[str] = None
 
     # Features and amenities
-    features: List[str] = field(default_factory=list)
+    # Insertion-ordered set (dict keys); lists passed in are converted
+    features: Dict[str, None] = field(default_factory=dict)
     has_gps: bool = False
     has_bluetooth: bool = False
     has_usb_charger: bool = False
@@ -79,10 +107,21 @@ class Car(Entity):
     # Additional flexible data
     car_data: Dict[str, Any] = field(default_factory=dict)
 
+    # Rate per booking type, built on first lookup and reset when rates change
+    _rate_table: Optional[Dict[str, Money]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def __post_init__(self):
         """Validate car after creation"""
-        super().__post_init__()
+        # Explicit base call: zero-arg super() breaks on slots=True dataclasses
+        Entity.__post_init__(self)
         self.validate()
+        # Low-cardinality strings share a single copy across instances
+        self.make = sys.intern(self.make)
+        self.color = sys.intern(self.color)
+        self.category = sys.intern(self.category)
+        self.features = dict.fromkeys(self.features)
 
     def validate(self):
         """Validate car business rules"""
@@ -92,25 +131,14 @@ class Car(Entity):
 
     def _validate_basic_info(self):
         """Validate basic car information"""
-        if not self.make or not self.make.strip():
-            raise ValidationError("Car make is required")
-
-        if not self.model or not self.model.strip():
-            raise ValidationError("Car model is required")
-
-        if self.year < 1900 or self.year > datetime.now().year + 2:
-            raise ValidationError(
-                f"Car year must be between 1900 and {datetime.now().year + 2}"
-            )
+        for attr, message in _REQUIRED_TEXT_FIELDS:
+            value = getattr(self, attr)
+            if not value or not value.strip():
+                raise ValidationError(message)
 
-        if not self.color or not self.color.strip():
-            raise ValidationError("Car color is required")
-
-        if not self.license_plate or not self.license_plate.strip():
-            raise ValidationError("License plate is required")
-
-        if not self.category or not self.category.strip():
-            raise ValidationError("Car category is required")
+        max_year = _current_year() + 2
+        if self.year < 1900 or self.year > max_year:
+            raise ValidationError(f"Car year must be between 1900 and {max_year}")
 
     def _validate_rates(self):
         """Validate pricing rates"""
@@ -165,11 +193,12 @@ class Car(Entity):
         if self.status == CarStatus.RENTED:
             raise BusinessRuleViolation("Cannot send rented car for maintenance")
 
+        now = datetime.now()
         self.status = CarStatus.MAINTENANCE
         if reason:
             self.car_data["maintenance_reason"] = reason
-            self.car_data["maintenance_started"] = datetime.now().isoformat()
-        self.mark_updated()
+            self.car_data["maintenance_started"] = now.isoformat()
+        self.mark_updated(now)
 
     def complete_maintenance(
         self,
@@ -188,15 +217,16 @@ class Car(Entity):
         if next_service_date:
             self.next_service_date = next_service_date
 
-        self.last_service_date = datetime.now()
+        now = datetime.now()
+        self.last_service_date = now
         self.status = CarStatus.AVAILABLE
 
         # Clear maintenance data
         self.car_data.pop("maintenance_reason", None)
         self.car_data.pop("maintenance_started", None)
-        self.car_data["last_maintenance_completed"] = datetime.now().isoformat()
+        self.car_data["last_maintenance_completed"] = now.isoformat()
 
-        self.mark_updated()
+        self.mark_updated(now)
 
     def put_out_of_service(self, reason: str) -> None:
         """Put car out of service"""
@@ -206,10 +236,11 @@ class Car(Entity):
         if self.status == CarStatus.RENTED:
             raise BusinessRuleViolation("Cannot put rented car out of service")
 
+        now = datetime.now()
         self.status = CarStatus.OUT_OF_SERVICE
         self.car_data["out_of_service_reason"] = reason
-        self.car_data["out_of_service_date"] = datetime.now().isoformat()
-        self.mark_updated()
+        self.car_data["out_of_service_date"] = now.isoformat()
+        self.mark_updated(now)
 
     def return_to_service(self) -> None:
         """Return car to service"""
@@ -221,9 +252,10 @@ class Car(Entity):
         # Clear out of service data
         self.car_data.pop("out_of_service_reason", None)
         self.car_data.pop("out_of_service_date", None)
-        self.car_data["returned_to_service_date"] = datetime.now().isoformat()
+        now = datetime.now()
+        self.car_data["returned_to_service_date"] = now.isoformat()
 
-        self.mark_updated()
+        self.mark_updated(now)
 
     def add_feature(self, feature: str) -> None:
         """Add a feature to the car"""
@@ -232,13 +264,13 @@ class Car(Entity):
 
         feature = feature.strip()
         if feature not in self.features:
-            self.features.append(feature)
+            self.features[feature] = None
             self.mark_updated()
 
     def remove_feature(self, feature: str) -> None:
         """Remove a feature from the car"""
         if feature in self.features:
-            self.features.remove(feature)
+            del self.features[feature]
             self.mark_updated()
 
     def update_rates(
@@ -263,18 +295,38 @@ class Car(Entity):
                 raise ValidationError("Monthly rate must be positive")
             self.monthly_rate = monthly_rate
 
+        self._rate_table = None
         self.mark_updated()
 
     def get_rate_for_booking_type(self, booking_type: str) -> Money:
         """Get rate for specific booking type"""
-        if booking_type == "Day":
-            return self.daily_rate
-        elif booking_type == "Week":
-            return self.weekly_rate or self.daily_rate.multiply(7)
-        elif booking_type == "Month":
-            return self.monthly_rate or self.daily_rate.multiply(30)
-        else:
+        rate_table = self._rate_table
+        if rate_table is None:
+            rate_table = self._rate_table = {
+                "Day": self.daily_rate,
+                "Week": self.weekly_rate or self.daily_rate.multiply(7),
+                "Month": self.monthly_rate or self.daily_rate.multiply(30),
+            }
+        rate = rate_table.get(booking_type)
+        if rate is None:
             raise ValidationError(f"Invalid booking type: {booking_type}")
+        return rate
+
+    @property
+    def search_text(self) -> str:
+        """Lowercased searchable fields joined by a separator no query contains"""
+        # Built on each access: make, model, year, color and category can all
+        # be reassigned on a live entity
+        return "\x1f".join(
+            (
+                self.make,
+                self.model,
+                self.license_plate,
+                self.color,
+                self.category,
+                str(self.year),
+            )
+        ).lower()
 
     @property
     def display_name(self) -> str:
@@ -284,52 +336,63 @@ class Car(Entity):
     @property
     def age_years(self) -> int:
         """Get car age in years"""
-        return datetime.now().year - self.year
+        return _current_year() - self.year
 
     @property
     def is_new(self) -> bool:
         """Check if car is considered new (less than 2 years old)"""
         return self.age_years < 2
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for serialization"""
-        return {
-            "id": self.id,
-            "make": self.make,
-            "model": self.model,
-            "year": self.year,
-            "color": self.color,
-            "license_plate": self.license_plate,
-            "category": self.category,
-            "display_name": self.display_name,
-            "age_years": self.age_years,
-            "is_new": self.is_new,
-            "daily_rate": self.daily_rate.to_float(),
-            "weekly_rate": self.weekly_rate.to_float() if self.weekly_rate else None,
-            "monthly_rate": self.monthly_rate.to_float() if self.monthly_rate else None,
-            "currency": self.daily_rate.currency,
-            "status": self.status.value,
-            "is_available": self.is_available(),
-            "location": self.location,
-            "mileage": self.mileage,
-            "fuel_type": self.fuel_type.value if self.fuel_type else None,
-            "transmission": self.transmission.value if self.transmission else None,
-            "seats": self.seats,
-            "engine_size": self.engine_size,
-            "features": self.features,
-            "has_gps": self.has_gps,
-            "has_bluetooth": self.has_bluetooth,
-            "has_usb_charger": self.has_usb_charger,
-            "has_backup_camera": self.has_backup_camera,
-            "last_service_date": (
-                self.last_service_date.isoformat() if self.last_service_date else None
-            ),
-            "next_service_date": (
-                self.next_service_date.isoformat() if self.next_service_date else None
-            ),
-            "service_interval_km": self.service_interval_km,
-            "is_overdue_for_service": self.is_overdue_for_service(),
-            "car_data": self.car_data,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
-        }
+    # (key, expression) pairs compiled into to_dict by generate_to_dict. Values
+    # are JSON-safe, matching Contract and User: ISO strings and enum values.
+    _TO_DICT_FIELDS = (
+        ("id", "self.id"),
+        ("make", "self.make"),
+        ("model", "self.model"),
+        ("year", "self.year"),
+        ("color", "self.color"),
+        ("license_plate", "self.license_plate"),
+        ("category", "self.category"),
+        ("display_name", "self.display_name"),
+        ("age_years", "self.age_years"),
+        ("is_new", "self.is_new"),
+        ("daily_rate", "self.daily_rate.to_float()"),
+        ("weekly_rate", "self.weekly_rate.to_float() if self.weekly_rate else None"),
+        ("monthly_rate", "self.monthly_rate.to_float() if self.monthly_rate else None"),
+        ("currency", "self.daily_rate.currency"),
+        ("status", "self.status.value"),
+        ("is_available", "self.is_available()"),
+        ("location", "self.location"),
+        ("mileage", "self.mileage"),
+        ("fuel_type", "self.fuel_type.value if self.fuel_type else None"),
+        (
+            "transmission",
+            "self.transmission.value if self.transmission else None",
+        ),
+        ("seats", "self.seats"),
+        ("engine_size", "self.engine_size"),
+        ("features", "list(self.features)"),
+        ("has_gps", "self.has_gps"),
+        ("has_bluetooth", "self.has_bluetooth"),
+        ("has_usb_charger", "self.has_usb_charger"),
+        ("has_backup_camera", "self.has_backup_camera"),
+        (
+            "last_service_date",
+            "self.last_service_date.isoformat() if self.last_service_date else None",
+        ),
+        (
+            "next_service_date",
+            "self.next_service_date.isoformat() if self.next_service_date else None",
+        ),
+        ("service_interval_km", "self.service_interval_km"),
+        ("is_overdue_for_service", "self.is_overdue_for_service()"),
+        ("car_data", "self.car_data"),
+        (
+            "created_at",
+            "self.created_at.isoformat() if self.created_at else None",
+        ),
+        (
+            "updated_at",
+            "self.updated_at.isoformat() if self.updated_at else None",
+        ),
+    )
@@ -3,16 +3,22 @@ Contract entity - Core business object for rental contracts
 """
 
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Dict, List, Optional
-
-from ..base import BusinessRuleViolation, Entity, ValidationError
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..base import (
+    BusinessRuleViolation,
+    Entity,
+    ValidationError,
+    generate_to_dict,
+    new_id,
+)
 from ..value_objects.date_range import DateRange
 from ..value_objects.money import Money
 
 
-class ContractStatus(Enum):
+class ContractStatus(str, Enum):
     """Contract status enumeration"""
 
     ACTIVE = "active"
@@ -21,7 +27,7 @@ class ContractStatus(Enum):
     EXTENDED = "extended"
 
 
-class PaymentStatus(Enum):
+class PaymentStatus(str, Enum):
     """Payment status enumeration"""
 
     PENDING = "pending"
@@ -31,7 +37,23 @@ class PaymentStatus(Enum):
     REFUNDED = "refunded"
 
 
-@dataclass
+_BOOKING_TYPES = frozenset({"Day", "Week", "Month"})
+
+# Statuses in which a contract is still running
+_OPEN_STATUSES = frozenset({ContractStatus.ACTIVE, ContractStatus.EXTENDED})
+
+_EXTENDABLE_PAYMENT_STATUSES = frozenset({PaymentStatus.PAID, PaymentStatus.PARTIAL})
+
+# Required text attributes and the error raised when one is blank
+_REQUIRED_TEXT_FIELDS = (
+    ("order_id", "Order ID is required"),
+    ("contract_number", "Contract number is required"),
+    ("user_id", "User ID is required"),
+    ("car_id", "Car ID is required"),
+)
+
+
+@dataclass(slots=True)
 class ExtensionDetails:
     """Details of a contract extension"""
 
@@ -42,8 +64,31 @@ class ExtensionDetails:
     count: int
     created_at: datetime = field(default_factory=datetime.now)
 
+    # Extensions are never edited after creation, so the dates are rendered once
+    _iso_dates: Optional[Tuple[str, str, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization"""
+        iso_dates = self._iso_dates
+        if iso_dates is None:
+            iso_dates = self._iso_dates = (
+                self.extended_date.isoformat(),
+                self.new_end_date.isoformat(),
+                self.created_at.isoformat(),
+            )
+        return {
+            "extended_date": iso_dates[0],
+            "new_end_date": iso_dates[1],
+            "extension_cost": self.extension_cost.to_float(),
+            "extension_type": self.extension_type,
+            "count": self.count,
+            "created_at": iso_dates[2],
+        }
+
+
+@dataclass(slots=True)
 class TransactionInfo:
     """Transaction information"""
 
@@ -53,8 +98,38 @@ class TransactionInfo:
     amount: Optional[Money] = None
     timestamp: Optional[datetime] = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization"""
+        return {
+            "status": self.status,
+            "transaction_id": self.transaction_id,
+            "payment_method": self.payment_method,
+        }
+
+
+@dataclass(slots=True)
+class CancellationRecord:
+    """
+    Why and when a contract was cancelled
+    cancelled_at is None for older contracts that never recorded it
+    """
+
+    reason: str
+    cancelled_at: Optional[datetime] = None
+
+    def __post_init__(self):
+        # Built by hand rather than through Contract, so it is checked here
+        # even for contracts loaded with from_trusted
+        if not isinstance(self.reason, str) or not self.reason.strip():
+            raise ValidationError("Cancellation reason is required")
+        if self.cancelled_at is not None and not isinstance(
+            self.cancelled_at, datetime
+        ):
+            raise ValidationError("Cancellation time must be a datetime")
+
 
-@dataclass
+@generate_to_dict
+@dataclass(slots=True)
 class Contract(Entity):
     """Contract entity with business logic"""
 
@@ -81,34 +156,38 @@ class Contract(Entity):
     is_extended: bool = False
     extension_history: List[ExtensionDetails] = field(default_factory=list)
 
+    # Set by cancel()
+    cancellation: Optional[CancellationRecord] = None
+
     # Metadata inherited from Entity base class
 
     # Additional data (flexible storage)
     booking_details: Dict[str, Any] = field(default_factory=dict)
 
+    # Cached created_at.isoformat(), keyed on the datetime it was rendered from
+    _created_at_iso: Optional[Tuple[datetime, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def __post_init__(self):
         """Validate contract after creation"""
-        super().__post_init__()
+        # Entity.__post_init__ inlined: the init=False id and timestamps are
+        # always unset when the constructor runs
+        self.id = new_id()
+        self.created_at = self.updated_at = datetime.now()
         self.validate()
 
     def validate(self):
         """Validate contract business rules"""
-        if not self.order_id or not self.order_id.strip():
-            raise ValidationError("Order ID is required")
-
-        if not self.contract_number or not self.contract_number.strip():
-            raise ValidationError("Contract number is required")
-
-        if not self.user_id or not self.user_id.strip():
-            raise ValidationError("User ID is required")
-
-        if not self.car_id or not self.car_id.strip():
-            raise ValidationError("Car ID is required")
+        for attr, message in _REQUIRED_TEXT_FIELDS:
+            value = getattr(self, attr)
+            if not value or not value.strip():
+                raise ValidationError(message)
 
         if self.count <= 0:
             raise ValidationError("Count must be positive")
 
-        if self.booking_type not in ["Day", "Week", "Month"]:
+        if self.booking_type not in _BOOKING_TYPES:
             raise ValidationError("Booking type must be Day, Week, or Month")
 
         # Validate money amounts are not negative
@@ -120,10 +199,10 @@ class Contract(Entity):
 
     def can_extend(self) -> bool:
         """Check if contract can be extended"""
-        return self.status == ContractStatus.ACTIVE and self.payment_status in [
-            PaymentStatus.PAID,
-            PaymentStatus.PARTIAL,
-        ]
+        return (
+            self.status == ContractStatus.ACTIVE
+            and self.payment_status in _EXTENDABLE_PAYMENT_STATUSES
+        )
 
     def extend(
         self,
@@ -131,6 +210,7 @@ class Contract(Entity):
         extension_cost: Money,
         extension_type: str,
         count: int,
+        now: Optional[datetime] = None,
     ) -> None:
         """Extend the contract"""
         if not self.can_extend():
@@ -139,7 +219,7 @@ class Contract(Entity):
         if new_end_date <= self.date_range.end_date:
             raise ValidationError("Extension date must be after current end date")
 
-        if extension_type not in ["Day", "Week", "Month"]:
+        if extension_type not in _BOOKING_TYPES:
             raise ValidationError("Extension type must be Day, Week, or Month")
 
         if count <= 0:
@@ -149,12 +229,14 @@ class Contract(Entity):
             raise ValidationError("Extension cost cannot be negative")
 
         # Create extension record
+        now = now or datetime.now()
         extension = ExtensionDetails(
-            extended_date=datetime.now(),
+            extended_date=now,
             new_end_date=new_end_date,
             extension_cost=extension_cost,
             extension_type=extension_type,
             count=count,
+            created_at=now,
         )
 
         # Update contract
@@ -162,25 +244,27 @@ class Contract(Entity):
         self.total_cost = self.total_cost.add(extension_cost)
         self.is_extended = True
         self.extension_history.append(extension)
-        self.mark_updated()
+        self.mark_updated(now)
 
         if self.status == ContractStatus.ACTIVE:
             self.status = ContractStatus.EXTENDED
 
     def complete(self) -> None:
         """Mark contract as completed"""
-        if self.status not in [ContractStatus.ACTIVE, ContractStatus.EXTENDED]:
+        if self.status not in _OPEN_STATUSES:
             raise BusinessRuleViolation(
                 "Only active or extended contracts can be completed"
             )
 
-        if self.payment_status not in [PaymentStatus.PAID]:
+        if self.payment_status != PaymentStatus.PAID:
             raise BusinessRuleViolation("Contract must be fully paid before completion")
 
         self.status = ContractStatus.COMPLETED
         self.mark_updated()
 
-    def cancel(self, reason: Optional[str] = None) -> None:
+    def cancel(
+        self, reason: Optional[str] = None, now: Optional[datetime] = None
+    ) -> None:
         """Cancel the contract"""
         if self.status == ContractStatus.COMPLETED:
             raise BusinessRuleViolation("Cannot cancel a completed contract")
@@ -188,14 +272,17 @@ class Contract(Entity):
         if not reason or not reason.strip():
             raise ValidationError("Cancellation reason is required")
 
+        now = now or datetime.now()
         self.status = ContractStatus.CANCELLED
-        self.mark_updated()
+        self.mark_updated(now)
 
-        self.booking_details["cancellation_reason"] = reason
-        self.booking_details["cancelled_at"] = datetime.now().isoformat()
+        self.cancellation = CancellationRecord(reason=reason, cancelled_at=now)
 
     def update_payment_status(
-        self, status: PaymentStatus, transaction_info: Optional[TransactionInfo] = None
+        self,
+        status: PaymentStatus,
+        transaction_info: Optional[TransactionInfo] = None,
+        now: Optional[datetime] = None,
     ) -> None:
         """Update payment status"""
         # Business rule: Cannot change status of cancelled contracts
@@ -207,78 +294,82 @@ class Contract(Entity):
         self.payment_status = status
         if transaction_info:
             self.transaction_info = transaction_info
-        self.mark_updated()
+        self.mark_updated(now)
 
-    def calculate_remaining_days(self) -> int:
+    def calculate_remaining_days(self, now: Optional[datetime] = None) -> int:
         """Calculate remaining days in contract"""
-        if self.status not in [ContractStatus.ACTIVE, ContractStatus.EXTENDED]:
+        if self.status not in _OPEN_STATUSES:
             return 0
 
-        remaining = (self.date_range.end_date - datetime.now()).days
+        remaining = (self.date_range.end_date - (now or datetime.now())).days
         return max(0, remaining)
 
-    def is_overdue(self) -> bool:
+    def is_overdue(self, now: Optional[datetime] = None) -> bool:
         """Check if contract is overdue"""
         return (
-            self.status in [ContractStatus.ACTIVE, ContractStatus.EXTENDED]
-            and datetime.now() > self.date_range.end_date
+            self.status in _OPEN_STATUSES
+            and (now or datetime.now()) > self.date_range.end_date
         )
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for serialization"""
+    @property
+    def created_at_iso(self) -> str:
+        """created_at as an ISO string, re-rendered only if created_at is replaced"""
+        cached = self._created_at_iso
+        created_at = self.created_at
+        if cached is None or cached[0] is not created_at:
+            cached = self._created_at_iso = (created_at, created_at.isoformat())
+        return cached[1]
+
+    # (key, expression) pairs compiled into to_dict by generate_to_dict. Status
+    # enums are str-based, so they already serialize as their value.
+    _TO_DICT_FIELDS = (
+        ("id", "self.id"),
+        ("OrderId", "self.order_id"),
+        ("ContractNumber", "self.contract_number"),
+        ("user_id", "self.user_id"),
+        ("car_id", "self.car_id"),
+        ("booking_id", "self.booking_id"),
+        ("start_date", "self.date_range.start_date.isoformat()"),
+        ("end_date", "self.date_range.end_date.isoformat()"),
+        ("count", "self.count"),
+        ("BookingType", "self.booking_type"),
+        ("booking_cost", "self.booking_cost.to_float()"),
+        ("taxes", "self.taxes.to_float()"),
+        ("Delivery", "self.delivery_fee.to_float()"),
+        ("offersTotal", "self.offers_total.to_float()"),
+        ("total_cost", "self.total_cost.to_float()"),
+        ("Currency", "self.total_cost.currency"),
+        ("ContractStatus", "self.status"),
+        ("payment_status", "self.payment_status"),
+        ("IsExtended", "self.is_extended"),
+        (
+            "cancellation_reason",
+            "self.cancellation.reason if self.cancellation else None",
+        ),
+        (
+            "cancelled_at",
+            "self.cancellation.cancelled_at.isoformat()"
+            " if self.cancellation and self.cancellation.cancelled_at else None",
+        ),
+        ("created_at", "self.created_at_iso"),
+        ("updated_at", "self.updated_at.isoformat()"),
         # Clean booking_details to remove non-serializable objects
-        clean_booking_details = {}
-        if self.booking_details:
-            clean_booking_details = self._clean_for_serialization(self.booking_details)
-
-        return {
-            "id": self.id,
-            "OrderId": self.order_id,
-            "ContractNumber": self.contract_number,
-            "user_id": self.user_id,
-            "car_id": self.car_id,
-            "booking_id": self.booking_id,
-            "start_date": self.date_range.start_date.isoformat(),
-            "end_date": self.date_range.end_date.isoformat(),
-            "count": self.count,
-            "BookingType": self.booking_type,
-            "booking_cost": self.booking_cost.to_float(),
-            "taxes": self.taxes.to_float(),
-            "Delivery": self.delivery_fee.to_float(),
-            "offersTotal": self.offers_total.to_float(),
-            "total_cost": self.total_cost.to_float(),
-            "Currency": self.total_cost.currency,
-            "ContractStatus": self.status.value,
-            "payment_status": self.payment_status.value,
-            "IsExtended": self.is_extended,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
-            "BookingDetails": clean_booking_details,
-            "transaction_info": (
-                {
-                    "status": self.transaction_info.status.value,
-                    "transaction_id": self.transaction_info.transaction_id,
-                    "payment_method": self.transaction_info.payment_method,
-                }
-                if self.transaction_info
-                else None
-            ),
-            "listExtendDetails": (
-                [
-                    {
-                        "extended_date": ext.extended_date.isoformat(),
-                        "new_end_date": ext.new_end_date.isoformat(),
-                        "extension_cost": ext.extension_cost.to_float(),
-                        "extension_type": ext.extension_type,
-                        "count": ext.count,
-                        "created_at": ext.created_at.isoformat(),
-                    }
-                    for ext in self.extension_history
-                ]
-                if self.extension_history
-                else []
-            ),
-        }
+        (
+            "BookingDetails",
+            "self._clean_for_serialization(self.booking_details)"
+            " if self.booking_details else {}",
+        ),
+        (
+            "transaction_info",
+            "self.transaction_info.to_dict() if self.transaction_info else None",
+        ),
+        # Most contracts are never extended; skip the comprehension for them
+        (
+            "listExtendDetails",
+            "[ext.to_dict() for ext in self.extension_history]"
+            " if self.extension_history else []",
+        ),
+    )
 
     def _clean_for_serialization(self, obj: Any) -> Any:
         """Recursively clean object for JSON serialization"""
@@ -308,3 +399,28 @@ class Contract(Entity):
         else:
             # Return primitive types as-is
             return obj
+
+
+def find_overdue_contracts(
+    contracts: Iterable[Contract], now: Optional[datetime] = None
+) -> List[Contract]:
+    """Return the overdue contracts, reading the clock once for the batch"""
+    now = now or datetime.now()
+    # Same check as Contract.is_overdue, inlined to skip a method call per row
+    return [
+        contract
+        for contract in contracts
+        if contract.status in _OPEN_STATUSES and now > contract.date_range.end_date
+    ]
+
+
+def find_expiring_contracts(
+    contracts: Iterable[Contract], days: int = 7, now: Optional[datetime] = None
+) -> List[Contract]:
+    """Return the open contracts ending within the given number of days"""
+    cutoff = (now or datetime.now()) + timedelta(days=days)
+    return [
+        contract
+        for contract in contracts
+        if contract.status in _OPEN_STATUSES and contract.date_range.end_date <= cutoff
+    ]
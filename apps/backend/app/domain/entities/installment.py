@@ -6,10 +6,29 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Dict, Optional
 
-# Simple dataclasses, no need for base Entity
+from ..base import generate_to_dict
 
+# Simple dataclasses, no need for base Entity
 
-@dataclass
+# English month names used by Installment.format_date
+_MONTHS = (
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+)
+
+
+@generate_to_dict
+@dataclass(slots=True)
 class Transaction:
     """Payment transaction details"""
 
@@ -27,37 +46,29 @@ class Transaction:
     currency: Optional[str] = None
     moysar_fee: Optional[float] = None
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
-        data = {
-            "id": self.id,
-            "type": self.type,
-            "status": self.status,
-            "totalAmount": self.total_amount,
-            "amountPaiedWithPayment": self.amount_paid_with_payment,
-            "amountPaiedWithWallet": self.amount_paid_with_wallet,
-        }
-
-        # Add optional fields if present
-        if self.payment_date:
-            data["paymentDate"] = self.payment_date
-        if self.payment_method:
-            data["paymentMethod"] = self.payment_method
-        if self.source:
-            data["source"] = self.source
-        if self.payment_last4:
-            data["paymentLast4"] = self.payment_last4
-        if self.moysar_payment_id:
-            data["moysarPaymentId"] = self.moysar_payment_id
-        if self.currency:
-            data["currency"] = self.currency
-        if self.moysar_fee is not None:
-            data["moysarFee"] = self.moysar_fee
-
-        return data
-
-
-@dataclass
+    # (key, expression) pairs compiled into to_dict by generate_to_dict
+    _TO_DICT_FIELDS = (
+        ("id", "self.id"),
+        ("type", "self.type"),
+        ("status", "self.status"),
+        ("totalAmount", "self.total_amount"),
+        ("amountPaiedWithPayment", "self.amount_paid_with_payment"),
+        ("amountPaiedWithWallet", "self.amount_paid_with_wallet"),
+    )
+
+    # Optional fields, added only if present: (key, attribute, check_none)
+    _TO_DICT_OPTIONAL = (
+        ("paymentDate", "payment_date", False),
+        ("paymentMethod", "payment_method", False),
+        ("source", "source", False),
+        ("paymentLast4", "payment_last4", False),
+        ("moysarPaymentId", "moysar_payment_id", False),
+        ("currency", "currency", False),
+        ("moysarFee", "moysar_fee", True),
+    )
+
+
+@dataclass(slots=True)
 class Installment:
     """Installment entity for contracts and bookings"""
 
@@ -93,4 +104,5 @@ class Installment:
     @staticmethod
     def format_date(date: datetime) -> str:
         """Format date for display"""
-        return date.strftime("%B %d, %Y")  # e.g., "January 26, 2025"
+        # e.g., "January 26, 2025"; avoids the locale-aware strftime path
+        return f"{_MONTHS[date.month - 1]} {date.day:02d}, {date.year}"
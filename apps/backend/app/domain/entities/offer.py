@@ -6,10 +6,13 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Dict, Optional
 
+from ..base import generate_to_dict
+
 # Simple dataclasses, no need for base Entity
 
 
-@dataclass
+@generate_to_dict
+@dataclass(slots=True)
 class OfferItem:
     """Individual offer item added to a contract or booking"""
 
@@ -24,51 +27,44 @@ class OfferItem:
     custom_amount: Optional[float] = None  # Custom amount if payment method is 'custom'
     offer_end_date: Optional[datetime] = None  # End date for specific offer types
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
-        data = {
-            "offer": self.offer,
-            "offerAr": self.offer_ar,
-            "offerType": self.offer_type,
-            "offerPrice": self.offer_price,
-            "offerTotalPrice": self.offer_total_price,
-            "offerRef": self.offer_ref,
-        }
-
-        # Add optional fields
-        if self.payment_method:
-            data["paymentMethod"] = self.payment_method
-        if self.amount_type:
-            data["amountType"] = self.amount_type
-        if self.custom_amount is not None:
-            data["customAmount"] = self.custom_amount
-        if self.offer_end_date:
-            data["offerEndDate"] = self.offer_end_date
+    # (key, expression) pairs compiled into to_dict by generate_to_dict
+    _TO_DICT_FIELDS = (
+        ("offer", "self.offer"),
+        ("offerAr", "self.offer_ar"),
+        ("offerType", "self.offer_type"),
+        ("offerPrice", "self.offer_price"),
+        ("offerTotalPrice", "self.offer_total_price"),
+        ("offerRef", "self.offer_ref"),
+    )
 
-        return data
+    # Optional fields, added only if present: (key, attribute, check_none)
+    _TO_DICT_OPTIONAL = (
+        ("paymentMethod", "payment_method", False),
+        ("amountType", "amount_type", False),
+        ("customAmount", "custom_amount", True),
+        ("offerEndDate", "offer_end_date", False),
+    )
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "OfferItem":
         """Create from dictionary"""
+        get = data.get
+        custom_amount = get("customAmount")
         return cls(
-            offer=data.get("offer", ""),
-            offer_ar=data.get("offerAr", ""),
-            offer_type=data.get("offerType", ""),
-            offer_price=float(data.get("offerPrice", 0)),
-            offer_total_price=float(data.get("offerTotalPrice", 0)),
-            offer_ref=data.get("offerRef", ""),
-            payment_method=data.get("paymentMethod"),
-            amount_type=data.get("amountType"),
-            custom_amount=(
-                float(data.get("customAmount"))
-                if data.get("customAmount") is not None
-                else None
-            ),
-            offer_end_date=data.get("offerEndDate"),
+            offer=get("offer", ""),
+            offer_ar=get("offerAr", ""),
+            offer_type=get("offerType", ""),
+            offer_price=float(get("offerPrice", 0)),
+            offer_total_price=float(get("offerTotalPrice", 0)),
+            offer_ref=get("offerRef", ""),
+            payment_method=get("paymentMethod"),
+            amount_type=get("amountType"),
+            custom_amount=float(custom_amount) if custom_amount is not None else None,
+            offer_end_date=get("offerEndDate"),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class OfferHistory:
     """History entry for offer modifications"""
 
@@ -5,13 +5,19 @@ User entity - Core business object for user management
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
-
-from ..base import BusinessRuleViolation, Entity, ValidationError
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..base import (
+    BusinessRuleViolation,
+    Entity,
+    ValidationError,
+    generate_to_dict,
+    new_id,
+)
 from ..value_objects.money import Money
 
 
-class UserStatus(Enum):
+class UserStatus(str, Enum):
     """User status enumeration"""
 
     ACTIVE = "active"
@@ -20,7 +26,19 @@ class UserStatus(Enum):
     PENDING_VERIFICATION = "pending_verification"
 
 
-@dataclass
+_LANGUAGES = frozenset({"en", "ar"})
+
+# Required text attributes checked after the email, with their error messages
+_REQUIRED_TEXT_FIELDS = (
+    ("first_name", "First name is required"),
+    ("last_name", "Last name is required"),
+    ("phone_number", "Phone number is required"),
+    ("nationality", "Nationality is required"),
+    ("status_number", "Status number (ID/Passport) is required"),
+)
+
+
+@dataclass(slots=True)
 class SavedAddress:
     """User's saved address"""
 
@@ -43,7 +61,8 @@ class SavedAddress:
         }
 
 
-@dataclass
+@generate_to_dict
+@dataclass(slots=True)
 class User(Entity):
     """User entity with business logic"""
 
@@ -73,9 +92,17 @@ class User(Entity):
     # Additional flexible data
     user_data: Dict[str, Any] = field(default_factory=dict)
 
+    # Cached full name, keyed on the (first_name, last_name) it was built from
+    _full_name: Optional[Tuple[str, str, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def __post_init__(self):
         """Validate user after creation"""
-        super().__post_init__()
+        # Entity.__post_init__ inlined: the init=False id and timestamps are
+        # always unset when the constructor runs
+        self.id = new_id()
+        self.created_at = self.updated_at = datetime.now()
         self.validate()
 
     def validate(self):
@@ -86,25 +113,15 @@ class User(Entity):
         if "@" not in self.email:
             raise ValidationError("Email must be valid")
 
-        if not self.first_name or not self.first_name.strip():
-            raise ValidationError("First name is required")
-
-        if not self.last_name or not self.last_name.strip():
-            raise ValidationError("Last name is required")
-
-        if not self.phone_number or not self.phone_number.strip():
-            raise ValidationError("Phone number is required")
-
-        if not self.nationality or not self.nationality.strip():
-            raise ValidationError("Nationality is required")
-
-        if not self.status_number or not self.status_number.strip():
-            raise ValidationError("Status number (ID/Passport) is required")
+        for attr, message in _REQUIRED_TEXT_FIELDS:
+            value = getattr(self, attr)
+            if not value or not value.strip():
+                raise ValidationError(message)
 
         if self.wallet_balance.amount < 0:
             raise ValidationError("Wallet balance cannot be negative")
 
-        if self.preferred_language not in ["en", "ar"]:
+        if self.preferred_language not in _LANGUAGES:
             raise ValidationError("Preferred language must be 'en' or 'ar'")
 
     def can_make_bookings(self) -> bool:
@@ -199,8 +216,9 @@ class User(Entity):
     def add_saved_address(self, address: SavedAddress) -> None:
         """Add a saved address"""
         # Check for duplicate address names
+        name = address.name.lower()
         for existing_addr in self.saved_addresses:
-            if existing_addr.name.lower() == address.name.lower():
+            if existing_addr.name.lower() == name:
                 raise ValidationError(f"Address name '{address.name}' already exists")
 
         # Limit number of saved addresses
@@ -212,9 +230,11 @@ class User(Entity):
 
     def remove_saved_address(self, address_id: str) -> None:
         """Remove a saved address"""
-        self.saved_addresses = [
-            addr for addr in self.saved_addresses if addr.id != address_id
-        ]
+        # Delete in place; IDs are unique so the first match is the only one
+        for index, addr in enumerate(self.saved_addresses):
+            if addr.id == address_id:
+                del self.saved_addresses[index]
+                break
         self.mark_updated()
 
     def get_saved_address(self, address_id: str) -> Optional[SavedAddress]:
@@ -250,7 +270,7 @@ class User(Entity):
             self.phone_verified = False
 
         if preferred_language is not None:
-            if preferred_language not in ["en", "ar"]:
+            if preferred_language not in _LANGUAGES:
                 raise ValidationError("Preferred language must be 'en' or 'ar'")
             self.preferred_language = preferred_language
 
@@ -258,35 +278,47 @@ class User(Entity):
 
     @property
     def full_name(self) -> str:
-        """Get user's full name"""
-        return f"{self.first_name} {self.last_name}".strip()
+        """Get user's full name, rebuilt only if either name is replaced"""
+        cached = self._full_name
+        first_name, last_name = self.first_name, self.last_name
+        if cached is None or cached[0] is not first_name or cached[1] is not last_name:
+            cached = self._full_name = (
+                first_name,
+                last_name,
+                f"{first_name} {last_name}".strip(),
+            )
+        return cached[2]
 
     @property
     def is_verified(self) -> bool:
         """Check if user is fully verified"""
         return self.email_verified and self.phone_verified
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for serialization"""
-        return {
-            "id": self.id,
-            "email": self.email,
-            "first_name": self.first_name,
-            "last_name": self.last_name,
-            "full_name": self.full_name,
-            "phone_number": self.phone_number,
-            "nationality": self.nationality,
-            "status_number": self.status_number,
-            "status": self.status.value,
-            "wallet_balance": self.wallet_balance.to_float(),
-            "wallet_currency": self.wallet_balance.currency,
-            "preferred_language": self.preferred_language,
-            "email_verified": self.email_verified,
-            "phone_verified": self.phone_verified,
-            "is_verified": self.is_verified,
-            "can_make_bookings": self.can_make_bookings(),
-            "saved_addresses": [addr.to_dict() for addr in self.saved_addresses],
-            "user_data": self.user_data,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
-        }
+    # (key, expression) pairs compiled into to_dict by generate_to_dict. Status
+    # enums are str-based, so they already serialize as their value.
+    _TO_DICT_FIELDS = (
+        ("id", "self.id"),
+        ("email", "self.email"),
+        ("first_name", "self.first_name"),
+        ("last_name", "self.last_name"),
+        ("full_name", "self.full_name"),
+        ("phone_number", "self.phone_number"),
+        ("nationality", "self.nationality"),
+        ("status_number", "self.status_number"),
+        ("status", "self.status"),
+        ("wallet_balance", "self.wallet_balance.to_float()"),
+        ("wallet_currency", "self.wallet_balance.currency"),
+        ("preferred_language", "self.preferred_language"),
+        ("email_verified", "self.email_verified"),
+        ("phone_verified", "self.phone_verified"),
+        ("is_verified", "self.is_verified"),
+        ("can_make_bookings", "self.can_make_bookings()"),
+        (
+            "saved_addresses",
+            "[addr.to_dict() for addr in self.saved_addresses]"
+            " if self.saved_addresses else []",
+        ),
+        ("user_data", "self.user_data"),
+        ("created_at", "self.created_at.isoformat()"),
+        ("updated_at", "self.updated_at.isoformat()"),
+    )
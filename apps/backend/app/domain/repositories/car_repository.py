@@ -16,6 +16,11 @@ class CarRepository(ABC):
         """Find car by ID"""
         pass
 
+    @abstractmethod
+    async def find_by_ids(self, car_ids: List[str]) -> Dict[str, Car]:
+        """Find several cars by ID in one round trip, keyed by ID"""
+        pass
+
     @abstractmethod
     async def find_by_license_plate(self, license_plate: str) -> Optional[Car]:
         """Find car by license plate"""
@@ -32,10 +37,13 @@ class CarRepository(ABC):
         available_only: Optional[bool] = None,
         location: Optional[str] = None,
         search: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         List cars with pagination and filters
         Returns dict with 'cars', 'total', 'page', 'total_pages'
+        and 'nextCursor'. Passing a cursor resumes after the last item of the
+        previous page instead of using the page offset.
         """
         pass
 
@@ -51,7 +59,12 @@ class CarRepository(ABC):
 
     @abstractmethod
     async def count_by_status(self, status: str) -> int:
-        """Count cars by status"""
+        """Count cars by status (prefer counts_by_status for several)"""
+        pass
+
+    @abstractmethod
+    async def counts_by_status(self) -> Dict[str, int]:
+        """Count cars for every status in one pass, keyed by status"""
         pass
 
     @abstractmethod
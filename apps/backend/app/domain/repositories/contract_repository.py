@@ -17,11 +17,21 @@ class ContractRepository(ABC):
         """Find contract by ID"""
         pass
 
+    @abstractmethod
+    async def find_by_ids(self, contract_ids: List[str]) -> Dict[str, Contract]:
+        """Find several contracts by ID in one round trip, keyed by ID"""
+        pass
+
     @abstractmethod
     async def find_by_order_id(self, order_id: str) -> Optional[Contract]:
         """Find contract by order ID"""
         pass
 
+    @abstractmethod
+    async def find_by_order_ids(self, order_ids: List[str]) -> Dict[str, Contract]:
+        """Find contracts for several order IDs, keyed by order ID"""
+        pass
+
     @abstractmethod
     async def find_by_contract_number(self, contract_number: str) -> Optional[Contract]:
         """Find contract by contract number"""
@@ -38,10 +48,13 @@ class ContractRepository(ABC):
         date_from: Optional[datetime] = None,
         date_to: Optional[datetime] = None,
         search: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         List contracts with pagination and filters
         Returns dict with 'contracts', 'total', 'page', 'total_pages'
+        and 'nextCursor'. Passing a cursor resumes after the last item of the
+        previous page instead of using the page offset.
         """
         pass
 
@@ -57,7 +70,12 @@ class ContractRepository(ABC):
 
     @abstractmethod
     async def count_by_status(self, status: str) -> int:
-        """Count contracts by status"""
+        """Count contracts by status (prefer counts_by_status for several)"""
+        pass
+
+    @abstractmethod
+    async def counts_by_status(self) -> Dict[str, int]:
+        """Count contracts for every status in one pass, keyed by status"""
         pass
 
     @abstractmethod
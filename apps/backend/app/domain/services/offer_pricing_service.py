@@ -4,15 +4,20 @@ Handles all offer types with proper business rules and pricing calculations
 """
 
 import logging
+from dataclasses import dataclass
 from datetime import datetime
+from decimal import Decimal
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
-from ..base import ValidationError
+from ..base import ValidationError, first_value
 from ..value_objects.money import Money
 
 logger = logging.getLogger(__name__)
 
+# Starting offers total; Decimal is immutable, so one instance is shared
+_ZERO = Decimal(0)
+
 
 class OfferType(Enum):
     """Supported offer types"""
@@ -31,6 +36,19 @@ class BookingType(Enum):
     MONTH = "Month"
 
 
+@dataclass(frozen=True, slots=True)
+class QuotePlan:
+    """Per-quote values shared by every offer priced in that quote"""
+
+    booking_type: str
+    units: int
+    total_days: int
+    current_car_price: float
+    currency: str = "SAR"
+    current_end_date: Optional[datetime] = None
+    new_end_date: Optional[datetime] = None
+
+
 class OfferPricingService:
     """
     Enhanced service for offer pricing and extension calculations
@@ -38,13 +56,42 @@ class OfferPricingService:
     """
 
     TAX_RATE = 0.15  # 15% tax rate
+    _TAX_FACTOR = Decimal(str(TAX_RATE))  # as Money.multiply converts it
     INSURANCE_PERCENTAGE = 0.20  # 20% of current car price
     KM_PERCENTAGE = 0.25  # 25% of current car price
     DAYS_PER_WEEK = 7
     DAYS_PER_MONTH = 30
 
+    # Lookups keyed by the raw BookingType value, so the hot paths skip the
+    # enum constructor
+    _BOOKING_DAYS = {"Day": 1, "Week": DAYS_PER_WEEK, "Month": DAYS_PER_MONTH}
+    _PRICE_KEY = {
+        "Day": "rental_price_day",
+        "Week": "rental_price_week",
+        "Month": "rental_price_month",
+    }
+    # External ChildChair price level used for each booking type, as an index
+    # into the (L2, L3) tuples built by set_external_offer_prices
+    _CHILD_CHAIR_LEVEL = {"Day": None, "Week": 0, "Month": 1}
+    _LEVEL_NAMES = ("L2", "L3")
+    _NO_LEVEL_PRICES = (None, None)
+    # Offer types whose calculators read the offer's own price; insurance and
+    # KM are priced from the car alone
+    _OFFER_TYPES_WITH_PRICE = frozenset(
+        (OfferType.CHILD_CHAIR.value, OfferType.DOCUMENTS.value)
+    )
+
     def __init__(self):
         self.external_offer_prices: Dict[str, Dict[str, float]] = {}
+        # external_offer_prices flattened to {offer_name: (L2, L3)}
+        self._level_prices: Dict[str, tuple] = {}
+        # Offer price calculators keyed by the raw OfferType value
+        self._offer_handlers = {
+            OfferType.INSURANCE.value: self._insurance,
+            OfferType.KM.value: self._km,
+            OfferType.CHILD_CHAIR.value: self._child_chair,
+            OfferType.DOCUMENTS.value: self._documents,
+        }
 
     def set_external_offer_prices(
         self, offer_prices: Dict[str, Dict[str, float]]
@@ -54,6 +101,10 @@ class OfferPricingService:
         Format: {offer_name: {L2: price, L3: price}}
         """
         self.external_offer_prices = offer_prices
+        self._level_prices = {
+            name: (prices.get("L2"), prices.get("L3"))
+            for name, prices in offer_prices.items()
+        }
 
     def calculate_current_car_price(
         self,
@@ -66,33 +117,25 @@ class OfferPricingService:
         Calculate current car price considering discounts
         This is the improved logic that uses current pricing instead of original
         """
-        booking_type_enum = BookingType(booking_type)
+        try:
+            price_key = self._PRICE_KEY[booking_type]
+        except KeyError:
+            raise ValidationError(f"Invalid booking type: {booking_type}")
 
         # Get base price based on booking type
-        if booking_type_enum == BookingType.DAY:
+        if booking_type == "Day":
             # Check for booked day price first (already discounted price)
             base_price = car_data.get("booked_day_price")
             if base_price:
                 return base_price
 
             # Use rental price with discount
-            base_price = car_data.get(
-                "rental_price_day", car_data.get("rental_price", 0)
-            )
-            if has_discount and discount_percent > 0:
-                base_price = base_price * (1 - discount_percent / 100)
-
-        elif booking_type_enum == BookingType.WEEK:
-            base_price = car_data.get("rental_price_week", 0)
-            if has_discount and discount_percent > 0:
-                base_price = base_price * (1 - discount_percent / 100)
-
-        elif booking_type_enum == BookingType.MONTH:
-            base_price = car_data.get("rental_price_month", 0)
-            if has_discount and discount_percent > 0:
-                base_price = base_price * (1 - discount_percent / 100)
+            base_price = first_value(car_data, price_key, "rental_price", default=0)
         else:
-            raise ValidationError(f"Invalid booking type: {booking_type}")
+            base_price = car_data.get(price_key, 0)
+
+        if has_discount and discount_percent > 0:
+            base_price = base_price * (1 - discount_percent / 100)
 
         if base_price <= 0:
             raise ValidationError(f"Invalid car price for booking type {booking_type}")
@@ -101,15 +144,9 @@ class OfferPricingService:
 
     def calculate_total_days(self, booking_type: str, units: int) -> int:
         """Calculate total days based on booking type and units"""
-        booking_type_enum = BookingType(booking_type)
-
-        if booking_type_enum == BookingType.DAY:
-            return units
-        elif booking_type_enum == BookingType.WEEK:
-            return units * self.DAYS_PER_WEEK
-        elif booking_type_enum == BookingType.MONTH:
-            return units * self.DAYS_PER_MONTH
-        else:
+        try:
+            return units * self._BOOKING_DAYS[booking_type]
+        except KeyError:
             raise ValidationError(f"Invalid booking type: {booking_type}")
 
     def calculate_insurance_offer_price(
@@ -124,7 +161,11 @@ class OfferPricingService:
         insurance_cost = total_rental_cost * self.INSURANCE_PERCENTAGE
 
         logger.debug(
-            f"Insurance calculation: {current_car_price} × {units} × {self.INSURANCE_PERCENTAGE} = {insurance_cost}"
+            "Insurance calculation: %s × %s × %s = %s",
+            current_car_price,
+            units,
+            self.INSURANCE_PERCENTAGE,
+            insurance_cost,
         )
 
         return Money(insurance_cost, currency)
@@ -141,7 +182,11 @@ class OfferPricingService:
         km_cost = total_rental_cost * self.KM_PERCENTAGE
 
         logger.debug(
-            f"KM calculation: {current_car_price} × {units} × {self.KM_PERCENTAGE} = {km_cost}"
+            "KM calculation: %s × %s × %s = %s",
+            current_car_price,
+            units,
+            self.KM_PERCENTAGE,
+            km_cost,
         )
 
         return Money(km_cost, currency)
@@ -158,61 +203,61 @@ class OfferPricingService:
         Calculate ChildChair offer price with complex logic
         Supports daily rates and L2/L3 pricing for week/month extensions
         """
-        booking_type_enum = BookingType(booking_type)
-        offer_name = offer_data.get("offer", offer_data.get("name", ""))
-
-        # Get stored external prices if available
-        external_prices = self.external_offer_prices.get(offer_name, {})
+        try:
+            level = self._CHILD_CHAIR_LEVEL[booking_type]
+        except KeyError:
+            raise ValidationError(f"Invalid booking type: {booking_type}")
 
-        if booking_type_enum == BookingType.DAY:
+        if level is None:
             # Daily calculation: offer_price × units
-            daily_price = offer_data.get("offerPrice", offer_data.get("price", 0))
+            daily_price = first_value(offer_data, "offerPrice", "price", default=0)
             total_cost = daily_price * units
 
             logger.debug(
-                f"ChildChair daily calculation: {daily_price} × {units} = {total_cost}"
+                "ChildChair daily calculation: %s × %s = %s",
+                daily_price,
+                units,
+                total_cost,
             )
 
-        elif booking_type_enum == BookingType.WEEK:
-            # Weekly calculation: prefer L2 price, fallback to daily
-            if "L2" in external_prices:
-                l2_daily_rate = external_prices["L2"]
-                total_cost = l2_daily_rate * total_days
+            return Money(total_cost, currency)
 
-                logger.debug(
-                    f"ChildChair weekly (L2): {l2_daily_rate} × {total_days} = {total_cost}"
-                )
-            else:
-                # Fallback to daily rate
-                daily_price = offer_data.get("offerPrice", offer_data.get("price", 0))
-                total_cost = daily_price * total_days
-
-                logger.debug(
-                    f"ChildChair weekly (fallback): {daily_price} × {total_days} = {total_cost}"
-                )
-
-        elif booking_type_enum == BookingType.MONTH:
-            # Monthly calculation: prefer L3 price, fallback to daily
-            if "L3" in external_prices:
-                l3_daily_rate = external_prices["L3"]
-                total_cost = l3_daily_rate * total_days
+        # Get stored external prices if available
+        offer_name = first_value(offer_data, "offer", "name", default="")
+        level_prices = self._level_prices.get(offer_name, self._NO_LEVEL_PRICES)
+        level_daily_rate = level_prices[level]
 
-                logger.debug(
-                    f"ChildChair monthly (L3): {l3_daily_rate} × {total_days} = {total_cost}"
-                )
-            else:
-                # Fallback to daily rate
-                daily_price = offer_data.get("offerPrice", offer_data.get("price", 0))
-                total_cost = daily_price * total_days
+        if level_daily_rate is not None:
+            # Weekly/monthly calculation: prefer the L2/L3 daily rate
+            total_cost = level_daily_rate * total_days
 
-                logger.debug(
-                    f"ChildChair monthly (fallback): {daily_price} × {total_days} = {total_cost}"
-                )
+            logger.debug(
+                "ChildChair %s (%s): %s × %s = %s",
+                booking_type,
+                self._LEVEL_NAMES[level],
+                level_daily_rate,
+                total_days,
+                total_cost,
+            )
         else:
-            raise ValidationError(f"Invalid booking type: {booking_type}")
+            # Fallback to daily rate
+            daily_price = first_value(offer_data, "offerPrice", "price", default=0)
+            total_cost = daily_price * total_days
+
+            logger.debug(
+                "ChildChair %s (fallback): %s × %s = %s",
+                booking_type,
+                daily_price,
+                total_days,
+                total_cost,
+            )
 
         return Money(total_cost, currency)
 
+    def _months_covering(self, days: int) -> int:
+        """Whole months needed to cover days, rounded up, at least one"""
+        return max(1, -(-days // self.DAYS_PER_MONTH))
+
     def calculate_documents_offer_price(
         self,
         offer_data: Dict[str, Any],
@@ -225,16 +270,17 @@ class OfferPricingService:
         Documents are priced per month, calculated based on extension period
         """
         # Calculate months between current end date and new end date
-        time_diff = new_end_date - current_end_date
-        extension_days = time_diff.days
-        months_to_add = max(1, (extension_days + 29) // 30)  # Round up to nearest month
+        months_to_add = self._months_covering((new_end_date - current_end_date).days)
 
         # Documents pricing is per month
-        monthly_price = offer_data.get("offerPrice", offer_data.get("price", 0))
+        monthly_price = first_value(offer_data, "offerPrice", "price", default=0)
         total_cost = monthly_price * months_to_add
 
         logger.debug(
-            f"Documents calculation: {monthly_price} × {months_to_add} months = {total_cost}"
+            "Documents calculation: %s × %s months = %s",
+            monthly_price,
+            months_to_add,
+            total_cost,
         )
 
         return Money(total_cost, currency)
@@ -250,28 +296,24 @@ class OfferPricingService:
         Calculate Documents offer price for new bookings
         Documents are always charged per month
         """
-        booking_type_enum = BookingType(booking_type)
-        monthly_price = offer_data.get("offerPrice", offer_data.get("price", 0))
-
-        if booking_type_enum == BookingType.DAY:
-            # For daily bookings, calculate months needed
-            total_days = units
-            months_needed = max(1, (total_days + 29) // 30)  # Round up to nearest month
-            total_cost = monthly_price * months_needed
-        elif booking_type_enum == BookingType.WEEK:
-            # For weekly bookings, calculate months needed
-            total_days = units * self.DAYS_PER_WEEK
-            months_needed = max(1, (total_days + 29) // 30)  # Round up to nearest month
-            total_cost = monthly_price * months_needed
-        elif booking_type_enum == BookingType.MONTH:
+        monthly_price = first_value(offer_data, "offerPrice", "price", default=0)
+
+        if booking_type == "Month":
             # For monthly bookings, charge per month
             months_needed = units
-            total_cost = monthly_price * units
         else:
-            raise ValidationError(f"Invalid booking type: {booking_type}")
+            # For daily and weekly bookings, calculate months needed
+            months_needed = self._months_covering(
+                self.calculate_total_days(booking_type, units)
+            )
+
+        total_cost = monthly_price * months_needed
 
         logger.debug(
-            f"Documents booking calculation: {monthly_price} × {months_needed} months = {total_cost}"
+            "Documents booking calculation: %s × %s months = %s",
+            monthly_price,
+            months_needed,
+            total_cost,
         )
 
         return Money(total_cost, currency)
@@ -287,52 +329,102 @@ class OfferPricingService:
         new_end_date: Optional[datetime] = None,
         has_discount: bool = False,
         discount_percent: float = 0.0,
+        precomputed_current_car_price: Optional[float] = None,
+        precomputed_total_days: Optional[int] = None,
     ) -> Money:
         """
         Calculate price for any offer type
         Central method that delegates to specific calculation methods
+        Callers pricing several offers can pass the car price and total days
+        they already computed to skip recomputing them per offer
         """
-        offer_type = offer_data.get("offerType", offer_data.get("type", ""))
-
-        try:
-            offer_type_enum = OfferType(offer_type)
-        except ValueError:
-            raise ValidationError(f"Unsupported offer type: {offer_type}")
+        handler = self._offer_handler(offer_data)
 
         # Calculate current car price (with discount if applicable)
-        current_car_price = self.calculate_current_car_price(
-            car_data, booking_type, has_discount, discount_percent
+        current_car_price = precomputed_current_car_price
+        if current_car_price is None:
+            current_car_price = self.calculate_current_car_price(
+                car_data, booking_type, has_discount, discount_percent
+            )
+
+        total_days = precomputed_total_days
+        if total_days is None:
+            total_days = self.calculate_total_days(booking_type, units)
+
+        plan = QuotePlan(
+            booking_type,
+            units,
+            total_days,
+            current_car_price,
+            currency,
+            current_end_date,
+            new_end_date,
         )
+        return handler(offer_data, plan)
 
-        total_days = self.calculate_total_days(booking_type, units)
+    def _calculate_offer_price_with_plan(
+        self, offer_data: Dict[str, Any], plan: QuotePlan
+    ) -> Money:
+        """Price one offer from values already resolved for the quote"""
+        return self._offer_handler(offer_data)(offer_data, plan)
 
-        if offer_type_enum == OfferType.INSURANCE:
-            return self.calculate_insurance_offer_price(
-                current_car_price, units, currency
-            )
+    def _offer_handler(self, offer_data: Dict[str, Any]):
+        """Look up the price calculator for an offer's type"""
+        offer_type = first_value(offer_data, "offerType", "type", default="")
 
-        elif offer_type_enum == OfferType.KM:
-            return self.calculate_km_offer_price(current_car_price, units, currency)
+        handler = self._offer_handlers.get(offer_type)
+        if handler is None:
+            raise ValidationError(f"Unsupported offer type: {offer_type}")
+        return handler
 
-        elif offer_type_enum == OfferType.CHILD_CHAIR:
-            return self.calculate_child_chair_offer_price(
-                offer_data, booking_type, units, total_days, currency
-            )
+    def _priceable_offers(self, offers: List[Dict[str, Any]]):
+        """
+        Yield (offer, handler) for offers with a known type and, for types
+        priced from the offer itself, a numeric price; the rest are logged and
+        skipped instead of failing the quote
+        """
+        for offer in offers:
+            offer_type = first_value(offer, "offerType", "type", default="")
+            handler = self._offer_handlers.get(offer_type)
+            if handler is None:
+                logger.warning("Skipping offer that cannot be priced: %s", offer)
+                continue
+            if offer_type in self._OFFER_TYPES_WITH_PRICE:
+                price = first_value(offer, "offerPrice", "price", default=0)
+                if isinstance(price, bool) or not isinstance(
+                    price, (int, float, Decimal)
+                ):
+                    logger.warning("Skipping offer that cannot be priced: %s", offer)
+                    continue
+            yield offer, handler
 
-        elif offer_type_enum == OfferType.DOCUMENTS:
-            # For new bookings (no contract dates), use booking-specific calculation
-            if not current_end_date or not new_end_date:
-                return self.calculate_documents_offer_price_for_booking(
-                    offer_data, booking_type, units, currency
-                )
-            # For contract extensions, use date-based calculation
-            return self.calculate_documents_offer_price(
-                offer_data, current_end_date, new_end_date, currency
-            )
-        else:
-            raise ValidationError(
-                f"Calculation not implemented for offer type: {offer_type}"
+    # Dispatch adapters: every offer calculator behind the same signature
+
+    def _insurance(self, offer_data: Dict[str, Any], plan: QuotePlan) -> Money:
+        return self.calculate_insurance_offer_price(
+            plan.current_car_price, plan.units, plan.currency
+        )
+
+    def _km(self, offer_data: Dict[str, Any], plan: QuotePlan) -> Money:
+        return self.calculate_km_offer_price(
+            plan.current_car_price, plan.units, plan.currency
+        )
+
+    def _child_chair(self, offer_data: Dict[str, Any], plan: QuotePlan) -> Money:
+        return self.calculate_child_chair_offer_price(
+            offer_data, plan.booking_type, plan.units, plan.total_days, plan.currency
+        )
+
+    def _documents(self, offer_data: Dict[str, Any], plan: QuotePlan) -> Money:
+        # For new bookings (no contract dates), use booking-specific calculation
+        if not plan.current_end_date or not plan.new_end_date:
+            return self.calculate_documents_offer_price_for_booking(
+                offer_data, plan.booking_type, plan.units, plan.currency
             )
+        # For contract extensions, use date-based calculation
+        return self.calculate_documents_offer_price(
+            offer_data, plan.current_end_date, plan.new_end_date, plan.currency
+        )
 
     def calculate_extension_cost(
         self,
@@ -344,14 +436,18 @@ class OfferPricingService:
         discount_percent: float = 0.0,
         is_custom_rate: bool = False,
         custom_rate: Optional[float] = None,
+        precomputed_rate: Optional[float] = None,
     ) -> Money:
         """
         Calculate base extension cost for contract extension
+        precomputed_rate is a current car price the caller already computed
         """
         if is_custom_rate and custom_rate is not None:
             if custom_rate <= 0:
                 raise ValidationError("Custom rate must be positive")
             rate = custom_rate
+        elif precomputed_rate is not None:
+            rate = precomputed_rate
         else:
             rate = self.calculate_current_car_price(
                 car_data, booking_type, has_discount, discount_percent
@@ -359,7 +455,9 @@ class OfferPricingService:
 
         extension_cost = rate * units
 
-        logger.debug(f"Extension cost calculation: {rate} × {units} = {extension_cost}")
+        logger.debug(
+            "Extension cost calculation: %s × %s = %s", rate, units, extension_cost
+        )
 
         return Money(extension_cost, currency)
 
@@ -381,6 +479,14 @@ class OfferPricingService:
         Calculate complete extension cost breakdown including all offers
         Returns detailed breakdown for transparency
         """
+        # Work out the car price once; a custom rate replaces it for the
+        # extension itself, while offers are still priced from the car's rate
+        car_price = None
+        if not is_custom_rate:
+            car_price = self.calculate_current_car_price(
+                car_data, booking_type, has_discount, discount_percent
+            )
+
         # Calculate base extension cost
         extension_cost = self.calculate_extension_cost(
             car_data,
@@ -391,69 +497,83 @@ class OfferPricingService:
             discount_percent,
             is_custom_rate,
             custom_rate,
+            precomputed_rate=car_price,
         )
 
-        # Calculate offers total
-        total_offers_cost = Money(0, currency)
+        total_days = self.calculate_total_days(booking_type, units)
+
+        # Calculate offers total as a plain Decimal sum
+        offers_amount = _ZERO
         offer_breakdown = []
 
         if offers:
-            for offer in offers:
-                try:
-                    offer_cost = self.calculate_offer_price(
-                        offer,
-                        car_data,
-                        booking_type,
-                        units,
-                        currency,
-                        current_end_date,
-                        new_end_date,
-                        has_discount,
-                        discount_percent,
-                    )
-                    total_offers_cost = total_offers_cost.add(offer_cost)
+            # Offers are priced from the car's own rate, even with a custom rate
+            try:
+                plan = QuotePlan(
+                    booking_type,
+                    units,
+                    total_days,
+                    (
+                        car_price
+                        if car_price is not None
+                        else self.calculate_current_car_price(
+                            car_data, booking_type, has_discount, discount_percent
+                        )
+                    ),
+                    currency,
+                    current_end_date,
+                    new_end_date,
+                )
+            except ValidationError as e:
+                # Without a car price no offer can be priced; skip them all
+                logger.warning("Failed to calculate price for offers %s: %s", offers, e)
+                plan = None
+
+            if plan is not None:
+                for offer, handler in self._priceable_offers(offers):
+                    try:
+                        offer_cost = handler(offer, plan)
+                    except Exception as e:
+                        logger.warning(
+                            "Failed to calculate price for offer %s: %s", offer, e
+                        )
+                        # Continue with other offers instead of failing completely
+                        continue
+                    offers_amount += offer_cost.amount
                     offer_breakdown.append(
                         {
-                            "name": offer.get("offer", offer.get("name", "Unknown")),
-                            "type": offer.get(
-                                "offerType", offer.get("type", "Unknown")
+                            "name": first_value(
+                                offer, "offer", "name", default="Unknown"
+                            ),
+                            "type": first_value(
+                                offer, "offerType", "type", default="Unknown"
                             ),
                             "cost": offer_cost.amount,
                         }
                     )
-                except Exception as e:
-                    logger.warning(f"Failed to calculate price for offer {offer}: {e}")
-                    # Continue with other offers instead of failing completely
-                    continue
 
-        # Calculate subtotal
-        subtotal = extension_cost.add(total_offers_cost)
+        # Only amounts are returned, so the totals stay plain Decimals
+        subtotal = extension_cost.amount + offers_amount
 
         # Calculate taxes (15%)
-        taxes = subtotal.multiply(self.TAX_RATE)
+        taxes = subtotal * self._TAX_FACTOR
 
         # Calculate total with taxes
-        total_cost = subtotal.add(taxes)
+        total_cost = subtotal + taxes
 
         return {
             "extension_cost": extension_cost.amount,
-            "offers_total": total_offers_cost.amount,
+            "offers_total": offers_amount,
             "offer_breakdown": offer_breakdown,
-            "subtotal": subtotal.amount,
-            "taxes": taxes.amount,
-            "total_cost": total_cost.amount,
+            "subtotal": subtotal,
+            "taxes": taxes,
+            "total_cost": total_cost,
             "currency": currency,
             "calculation_details": {
                 "booking_type": booking_type,
                 "units": units,
-                "total_days": self.calculate_total_days(booking_type, units),
-                "current_car_price": (
-                    self.calculate_current_car_price(
-                        car_data, booking_type, has_discount, discount_percent
-                    )
-                    if not is_custom_rate
-                    else custom_rate
-                ),
+                "total_days": total_days,
+                "current_car_price": car_price if not is_custom_rate else custom_rate,
                 "has_discount": has_discount,
                 "discount_percent": discount_percent,
                 "tax_rate": self.TAX_RATE,
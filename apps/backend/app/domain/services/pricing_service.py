@@ -2,54 +2,98 @@
 Pricing domain service - Encapsulates complex pricing business logic
 """
 
+from dataclasses import dataclass
 from datetime import datetime
+from decimal import Decimal
+from functools import lru_cache
 from typing import Any, Dict, List
 
-from ..base import ValidationError
+from ..base import ValidationError, first_value
 from ..entities.contract import Contract
 from ..value_objects.money import Money
 
+# KM Package is 25% of base price
+_KM_PACKAGE_FACTOR = Decimal("0.25")
+
+
+def _to_decimal(value) -> Decimal:
+    """Convert an amount to Decimal the same way the Money constructor does"""
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+@lru_cache(maxsize=16)
+def _zero_money(currency: str) -> Money:
+    """Shared zero amount per currency; Money is immutable, so reuse is safe"""
+    return Money(0, currency)
+
+
+@lru_cache(maxsize=4096)
+def _percentage_factor(percentage: float) -> Decimal:
+    """Decimal multiplier for a percentage, as Money.multiply would build it"""
+    return Decimal(str(percentage / 100))
+
+
+@dataclass(frozen=True, slots=True)
+class PricingBreakdown:
+    """Booking cost breakdown returned by PricingService"""
+
+    booking_cost: Money
+    taxes: Money
+    delivery_fee: Money
+    offers_total: Money
+    total_cost: Money
+
 
 class PricingService:
     """Domain service for pricing calculations"""
 
     TAX_RATE = 0.15  # 15% tax rate
 
+    _DAILY_RATE_KEYS = ("rental_price_day", "rental_price")
+
+    # booking_type -> (rate keys in lookup order, days used for the daily fallback)
+    _RATE_FIELDS = {
+        "Day": (_DAILY_RATE_KEYS, 1),
+        "Week": (("rental_price_week",), 7),
+        "Month": (("rental_price_month", "rental_price_mounth"), 30),
+    }
+
+    def __init__(self):
+        # Offer price calculators keyed by the lower-cased offer type
+        self._offer_handlers = {
+            "km_package": self._km_package_price,
+            "insurance": self._insurance_price,
+            "documents": self._fixed_price,
+            "child_chair": self._child_chair_price,
+        }
+
     def calculate_base_price(
         self, car_data: Dict[str, Any], booking_type: str, count: int
     ) -> Money:
         """Calculate base rental price"""
-        if booking_type == "Day":
-            daily_rate = car_data.get(
-                "rental_price_day", car_data.get("rental_price", 0)
-            )
-            base_amount = daily_rate * count
-        elif booking_type == "Week":
-            weekly_rate = car_data.get("rental_price_week", 0)
-            if weekly_rate == 0:
-                # Fallback to daily rate * 7
-                daily_rate = car_data.get(
-                    "rental_price_day", car_data.get("rental_price", 0)
-                )
-                weekly_rate = daily_rate * 7
-            base_amount = weekly_rate * count
-        elif booking_type == "Month":
-            monthly_rate = car_data.get(
-                "rental_price_month", car_data.get("rental_price_mounth", 0)
-            )
-            if monthly_rate == 0:
-                # Fallback to daily rate * 30
-                daily_rate = car_data.get(
-                    "rental_price_day", car_data.get("rental_price", 0)
-                )
-                monthly_rate = daily_rate * 30
-            base_amount = monthly_rate * count
-        else:
-            raise ValidationError(f"Invalid booking type: {booking_type}")
+        base_amount = self._base_amount(
+            car_data, self._rate_fields(booking_type), count
+        )
 
         currency = car_data.get("Currency", "SAR")
         return Money(base_amount, currency)
 
+    def _rate_fields(self, booking_type: str) -> tuple:
+        """Look up the _RATE_FIELDS row for a booking type"""
+        try:
+            return self._RATE_FIELDS[booking_type]
+        except KeyError:
+            raise ValidationError(f"Invalid booking type: {booking_type}")
+
+    def _base_amount(self, car_data: Dict[str, Any], rate_fields: tuple, count: int):
+        """Rental amount for count units at the rate named by rate_fields"""
+        rate_keys, days = rate_fields
+        # A missing or zero rate falls back to daily rate * days
+        rate = first_value(car_data, *rate_keys) or (
+            first_value(car_data, *self._DAILY_RATE_KEYS, default=0) * days
+        )
+        return rate * count
+
     def calculate_package_price(
         self, car_data: Dict[str, Any], package_months: int
     ) -> Money:
@@ -79,38 +123,46 @@ class PricingService:
         self, offers: List[Dict[str, Any]], base_price: Money
     ) -> Money:
         """Calculate total cost of selected offers"""
-        total = Money(0, base_price.currency)
-
-        for offer in offers:
-            offer_price = self._calculate_offer_price(offer, base_price)
-            total = total.add(offer_price)
-
-        return total
-
-    def _calculate_offer_price(self, offer: Dict[str, Any], base_price: Money) -> Money:
-        """Calculate price for a single offer"""
-        offer_type = offer.get("type", "").lower()
-
-        if offer_type == "km_package":
-            # KM Package is 25% of base price
-            return base_price.multiply(0.25)
-        elif offer_type == "insurance":
-            # Insurance is a percentage of base price
-            percentage = offer.get("percentage", 0)
-            return base_price.multiply(percentage / 100)
-        elif offer_type == "documents":
-            # Documents is a fixed price
-            fixed_price = offer.get("price", 0)
-            return Money(fixed_price, base_price.currency)
-        elif offer_type == "child_chair":
-            # Child chair has daily rates
-            daily_rate = offer.get("daily_rate", 0)
-            days = offer.get("days", 1)
-            return Money(daily_rate * days, base_price.currency)
-        else:
+        if not offers:
+            return _zero_money(base_price.currency)
+
+        base_amount = base_price.amount
+        total = sum(
+            (self._calculate_offer_price(offer, base_amount) for offer in offers),
+            Decimal(0),
+        )
+        return Money(total, base_price.currency)
+
+    def _calculate_offer_price(
+        self, offer: Dict[str, Any], base_amount: Decimal
+    ) -> Decimal:
+        """Calculate the amount for a single offer, in the base price's currency"""
+        handler = self._offer_handlers.get(offer.get("type", "").lower())
+        if handler is None:
             # Unknown offer type - use fixed price if available
-            fixed_price = offer.get("price", 0)
-            return Money(fixed_price, base_price.currency)
+            return self._fixed_price(offer, base_amount)
+        return handler(offer, base_amount)
+
+    def _km_package_price(self, offer: Dict[str, Any], base_amount: Decimal) -> Decimal:
+        return base_amount * _KM_PACKAGE_FACTOR
+
+    def _insurance_price(self, offer: Dict[str, Any], base_amount: Decimal) -> Decimal:
+        # Insurance is a percentage of base price; catalog percentages repeat,
+        # so their Decimal factors are cached
+        percentage = offer.get("percentage", 0)
+        return base_amount * _percentage_factor(percentage)
+
+    def _fixed_price(self, offer: Dict[str, Any], base_amount: Decimal) -> Decimal:
+        # Documents (and unknown offer types) use a fixed price
+        return _to_decimal(offer.get("price", 0))
+
+    def _child_chair_price(
+        self, offer: Dict[str, Any], base_amount: Decimal
+    ) -> Decimal:
+        # Child chair has daily rates
+        daily_rate = offer.get("daily_rate", 0)
+        days = offer.get("days", 1)
+        return _to_decimal(daily_rate * days)
 
     def calculate_total_booking_cost(
         self,
@@ -122,7 +174,7 @@ class PricingService:
         offers: List[Dict[str, Any]] = None,
         is_package_booking: bool = False,
         package_months: int = None,
-    ) -> Dict[str, Money]:
+    ) -> PricingBreakdown:
         """Calculate complete booking cost breakdown"""
 
         currency = car_data.get("Currency", "SAR")
@@ -138,7 +190,7 @@ class PricingService:
             booking_cost = self.apply_discount(booking_cost, discount_percent)
 
         # Calculate offers
-        offers_total = Money(0, currency)
+        offers_total = _zero_money(currency)
         if offers:
             offers_total = self.calculate_offers_total(offers, booking_cost)
 
@@ -148,16 +200,78 @@ class PricingService:
         # Delivery fee
         delivery = Money(delivery_fee, currency)
 
-        # Total cost
-        total_cost = booking_cost.add(taxes).add(delivery).add(offers_total)
+        # Total cost, summed as amounts and wrapped once
+        total_cost = Money(
+            booking_cost.amount + taxes.amount + delivery.amount + offers_total.amount,
+            currency,
+        )
+
+        return PricingBreakdown(
+            booking_cost=booking_cost,
+            taxes=taxes,
+            delivery_fee=delivery,
+            offers_total=offers_total,
+            total_cost=total_cost,
+        )
+
+    def calculate_total_booking_cost_many(
+        self,
+        cars_data: List[Dict[str, Any]],
+        booking_type: str,
+        count: int,
+        discount_percent: float = 0,
+        delivery_fee: float = 0,
+        offers: List[Dict[str, Any]] = None,
+    ) -> List[PricingBreakdown]:
+        """
+        Calculate the booking cost breakdown for several cars at once
+        Same result as calculate_total_booking_cost per car, but the booking
+        type, discount and tax factors are resolved once for the whole batch
+        """
+        rate_fields = self._rate_fields(booking_type)
+
+        # Same factors Money.apply_discount and Money.calculate_tax use
+        discount_factor = None
+        if discount_percent > 0:
+            if discount_percent > 100:
+                raise ValidationError("Discount percent must be between 0 and 100")
+            discount_factor = 1 - Decimal(str(discount_percent)) / 100
+        tax_factor = Decimal(str(self.TAX_RATE)) / 100
+        delivery_amount = Decimal(str(delivery_fee))
+
+        results = []
+        for car_data in cars_data:
+            currency = car_data.get("Currency", "SAR")
+            booking_cost = Money(
+                self._base_amount(car_data, rate_fields, count), currency
+            )
+            if discount_factor is not None:
+                booking_cost = booking_cost.multiply(discount_factor)
 
-        return {
-            "booking_cost": booking_cost,
-            "taxes": taxes,
-            "delivery_fee": delivery,
-            "offers_total": offers_total,
-            "total_cost": total_cost,
-        }
+            offers_total = (
+                self.calculate_offers_total(offers, booking_cost)
+                if offers
+                else _zero_money(currency)
+            )
+            taxes = booking_cost.multiply(tax_factor)
+
+            results.append(
+                PricingBreakdown(
+                    booking_cost=booking_cost,
+                    taxes=taxes,
+                    delivery_fee=Money(delivery_amount, currency),
+                    offers_total=offers_total,
+                    total_cost=Money(
+                        booking_cost.amount
+                        + taxes.amount
+                        + delivery_amount
+                        + offers_total.amount,
+                        currency,
+                    ),
+                )
+            )
+
+        return results
 
     def calculate_extension_cost(
         self,
@@ -219,7 +333,7 @@ class PricingService:
 
         # Add taxes on extension
         extension_taxes = self.calculate_taxes(extension_cost)
-        total_extension_cost = extension_cost.add(extension_taxes)
+        total_extension_cost = extension_cost + extension_taxes
 
         return total_extension_cost
 
@@ -2,13 +2,123 @@
 Wallet domain service for handling wallet operations and business logic
 """
 
+import asyncio
+import logging
+from contextlib import aclosing
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Dict, Optional
-
-from ...infrastructure.firebase_collections import get_firebase_db
+from functools import lru_cache
+from time import monotonic
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from google.cloud.firestore import SERVER_TIMESTAMP, Increment, async_transactional
+except ImportError:
+    SERVER_TIMESTAMP = Increment = async_transactional = None
+
+from ...infrastructure.firebase_collections import get_async_firebase_db
+from ...infrastructure.persistence.converters import (
+    decode_timestamp_cursor,
+    encode_timestamp_cursor,
+)
 from ..value_objects.money import Money
 
+logger = logging.getLogger(__name__)
+
+# Seconds a wallet balance read is reused before Firestore is queried again
+BALANCE_CACHE_TTL = 2.0
+BALANCE_CACHE_SIZE = 10_000
+
+# Field masks for wallet reads; user documents also carry profile data that
+# the wallet never needs
+_BALANCE_FIELDS = ["Wallet_Balance", "Currency"]
+_DEDUCT_FIELDS = ["Wallet_Balance"]
+
+# Returned for missing wallets and failed reads; Money is immutable so one
+# instance is shared
+_ZERO_BALANCE = Money(Decimal(0), "SAR")
+
+# Process-wide {user_id: (expiry, balance)}, shared by every WalletService and
+# dropped for a user whenever their wallet is written
+_balance_cache: Dict[str, Tuple[float, Money]] = {}
+
+
+def _cache_balance(user_id: str, balance: Money) -> None:
+    """Remember a balance read, evicting the oldest entry when full"""
+    _balance_cache.pop(user_id, None)
+    if len(_balance_cache) >= BALANCE_CACHE_SIZE:
+        del _balance_cache[next(iter(_balance_cache))]
+    _balance_cache[user_id] = (monotonic() + BALANCE_CACHE_TTL, balance)
+
+
+@lru_cache(maxsize=4096)
+def _user_ref(db, user_id: str):
+    """
+    Document reference for a user's wallet
+    Keyed on the client too, so a new client never reuses stale references
+    """
+    return db.collection("users").document(user_id)
+
+
+@lru_cache(maxsize=4096)
+def _tx_history_ref(db, user_id: str):
+    """Collection reference for a user's transaction history"""
+    return _user_ref(db, user_id).collection("Transaction_history")
+
+
+def _transaction_record(
+    action: str,
+    amount: Money,
+    reason: str,
+    admin_user_id: Optional[str],
+    related_booking_id: Optional[str],
+    related_contract_id: Optional[str],
+    previous_balance: Optional[Decimal] = None,
+    new_balance: Optional[Decimal] = None,
+) -> Dict[str, Any]:
+    """
+    Build a Transaction_history document
+    Balances are left as None when the write does not read the wallet
+    """
+    return {
+        "action": action,
+        "amount": float(amount.amount),
+        "amountMinor": amount.to_minor(),
+        "reason": reason,
+        "adminUserId": admin_user_id or "system",
+        "timestamp": SERVER_TIMESTAMP,
+        "previousBalance": (
+            float(previous_balance) if previous_balance is not None else None
+        ),
+        "newBalance": float(new_balance) if new_balance is not None else None,
+        "currency": amount.currency,
+        "relatedBookingId": related_booking_id,
+        "relatedContractId": related_contract_id,
+    }
+
+
+def _history_row(
+    doc_id: str, data: Dict[str, Any], timestamp: Optional[datetime], currency: str
+) -> Dict[str, Any]:
+    """
+    Build the API row for a Transaction_history document
+    Fields are read with get() because records predating this service may
+    lack some of them
+    """
+    return {
+        "id": doc_id,
+        "action": data.get("action"),
+        "amount": data.get("amount"),
+        "reason": data.get("reason"),
+        "adminUserId": data.get("adminUserId"),
+        "timestamp": timestamp.isoformat() if timestamp else None,
+        "previousBalance": data.get("previousBalance"),
+        "newBalance": data.get("newBalance"),
+        "currency": data.get("currency", currency),
+        "relatedBookingId": data.get("relatedBookingId"),
+        "relatedContractId": data.get("relatedContractId"),
+    }
+
 
 class WalletService:
     """Domain service for wallet operations"""
@@ -16,26 +126,71 @@ class WalletService:
     def __init__(self):
         self.currency = "SAR"
 
-    def get_wallet_balance(self, user_id: str) -> Money:
+    async def get_wallet_balance(self, user_id: str) -> Money:
         """Get current wallet balance for a user"""
+        cached = _balance_cache.get(user_id)
+        if cached is not None and monotonic() < cached[0]:
+            return cached[1]
+
         try:
-            db = get_firebase_db()
+            db = get_async_firebase_db()
             if not db:
-                return Money(Decimal("0"), self.currency)
-
-            user_doc = db.collection("users").document(user_id).get()
-            if user_doc.exists:
-                data = user_doc.to_dict()
-                balance = data.get("Wallet_Balance", 0.0)
-                currency = data.get("Currency", self.currency)
-                return Money(Decimal(str(balance)), currency)
+                return _ZERO_BALANCE
+
+            user_doc = await _user_ref(db, user_id).get(field_paths=_BALANCE_FIELDS)
+            money = self._balance_from_snapshot(user_doc)
+            _cache_balance(user_id, money)
+            return money
+        except Exception:
+            logger.exception("Error getting wallet balance")
+            return _ZERO_BALANCE
+
+    async def get_wallet_balances(self, user_ids: List[str]) -> Dict[str, Money]:
+        """
+        Get wallet balances for several users
+        Uncached wallets are fetched together in a single get_all() call
+        """
+        now = monotonic()
+        balances: Dict[str, Money] = {}
+        missing = []
+        for user_id in dict.fromkeys(user_ids):
+            cached = _balance_cache.get(user_id)
+            if cached is not None and now < cached[0]:
+                balances[user_id] = cached[1]
             else:
-                return Money(Decimal("0"), self.currency)
-        except Exception as e:
-            print(f"❌ Error getting wallet balance: {e}")
-            return Money(Decimal("0"), self.currency)
+                missing.append(user_id)
+
+        if not missing:
+            return balances
 
-    def add_money_to_wallet(
+        try:
+            db = get_async_firebase_db()
+            if not db:
+                return {**balances, **dict.fromkeys(missing, _ZERO_BALANCE)}
+
+            refs = [_user_ref(db, user_id) for user_id in missing]
+            async for user_doc in db.get_all(refs, field_paths=_BALANCE_FIELDS):
+                money = self._balance_from_snapshot(user_doc)
+                _cache_balance(user_doc.id, money)
+                balances[user_doc.id] = money
+        except Exception:
+            logger.exception("Error getting wallet balances")
+
+        # Anything not returned (or lost to an error) reads as an empty wallet
+        for user_id in missing:
+            balances.setdefault(user_id, _ZERO_BALANCE)
+        return balances
+
+    def _balance_from_snapshot(self, user_doc) -> Money:
+        """Convert a user document snapshot to its wallet balance"""
+        if not user_doc.exists:
+            return _ZERO_BALANCE
+        data = user_doc.to_dict()
+        balance = data.get("Wallet_Balance", 0.0)
+        currency = data.get("Currency", self.currency)
+        return Money(Decimal(str(balance)), currency)
+
+    async def add_money_to_wallet(
         self,
         user_id: str,
         amount: Money,
@@ -44,72 +199,49 @@ class WalletService:
         related_booking_id: Optional[str] = None,
         related_contract_id: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Add money to user's wallet"""
+        """
+        Add money to user's wallet
+        Adding needs no balance check, so the wallet is credited with a
+        server-side Increment instead of a read-modify-write transaction; the
+        balances reported are read back once the credit has committed
+        """
         try:
-            db = get_firebase_db()
+            db = get_async_firebase_db()
             if not db:
                 return {"success": False, "error": "Database connection failed"}
 
-            # Start a transaction
-            transaction_ref = db.transaction()
-
-            def add_money_transaction(transaction):
-                user_ref = db.collection("users").document(user_id)
-                user_doc = transaction.get(user_ref)
-
-                if not user_doc.exists:
-                    raise Exception(f"User {user_id} not found")
-
-                user_data = user_doc.to_dict()
-                current_balance = Decimal(str(user_data.get("Wallet_Balance", 0.0)))
-                new_balance = current_balance + amount.amount
-
-                # Update wallet balance
-                transaction.update(user_ref, {"Wallet_Balance": float(new_balance)})
-
-                # Add transaction record
-                transaction_data = {
-                    "action": "add",
-                    "amount": float(amount.amount),
-                    "reason": reason,
-                    "adminUserId": admin_user_id or "system",
-                    "timestamp": datetime.now(),
-                    "previousBalance": float(current_balance),
-                    "newBalance": float(new_balance),
-                    "currency": amount.currency,
-                    "relatedBookingId": related_booking_id,
-                    "relatedContractId": related_contract_id,
-                }
-
-                transaction_doc_ref = user_ref.collection(
-                    "Transaction_history"
-                ).document()
-                transaction.set(transaction_doc_ref, transaction_data)
-
-                return {
-                    "previousBalance": float(current_balance),
-                    "newBalance": float(new_balance),
-                    "transactionId": transaction_doc_ref.id,
-                }
+            transaction_id = await self._credit_wallet(
+                db,
+                user_id=user_id,
+                amount=amount,
+                reason=reason,
+                admin_user_id=admin_user_id,
+                related_booking_id=related_booking_id,
+                related_contract_id=related_contract_id,
+            )
 
-            result = transaction_ref.transaction(add_money_transaction)
+            # A write landing between the commit and this read is folded into
+            # both balances, but their difference is always this credit
+            user_doc = await _user_ref(db, user_id).get(field_paths=_BALANCE_FIELDS)
+            new_balance = self._balance_from_snapshot(user_doc)
+            _cache_balance(user_id, new_balance)
 
             return {
                 "success": True,
                 "message": f"Added {amount} to wallet",
                 "wallet": {
-                    "previousBalance": result["previousBalance"],
-                    "newBalance": result["newBalance"],
+                    "previousBalance": float(new_balance.amount - amount.amount),
+                    "newBalance": new_balance.to_float(),
                     "currency": amount.currency,
                 },
-                "transactionId": result["transactionId"],
+                "transactionId": transaction_id,
             }
 
         except Exception as e:
-            print(f"❌ Error adding money to wallet: {e}")
+            logger.exception("Error adding money to wallet")
             return {"success": False, "error": str(e)}
 
-    def deduct_money_from_wallet(
+    async def deduct_money_from_wallet(
         self,
         user_id: str,
         amount: Money,
@@ -120,16 +252,16 @@ class WalletService:
     ) -> Dict[str, Any]:
         """Deduct money from user's wallet"""
         try:
-            db = get_firebase_db()
+            db = get_async_firebase_db()
             if not db:
                 return {"success": False, "error": "Database connection failed"}
 
-            # Start a transaction
-            transaction_ref = db.transaction()
-
-            def deduct_money_transaction(transaction):
-                user_ref = db.collection("users").document(user_id)
-                user_doc = transaction.get(user_ref)
+            @async_transactional
+            async def deduct_money_transaction(transaction):
+                user_ref = _user_ref(db, user_id)
+                user_doc = await user_ref.get(
+                    field_paths=_DEDUCT_FIELDS, transaction=transaction
+                )
 
                 if not user_doc.exists:
                     raise Exception(f"User {user_id} not found")
@@ -149,23 +281,20 @@ class WalletService:
                 transaction.update(user_ref, {"Wallet_Balance": float(new_balance)})
 
                 # Add transaction record
-                transaction_data = {
-                    "action": "deduct",
-                    "amount": float(amount.amount),
-                    "reason": reason,
-                    "adminUserId": admin_user_id or "system",
-                    "timestamp": datetime.now(),
-                    "previousBalance": float(current_balance),
-                    "newBalance": float(new_balance),
-                    "currency": amount.currency,
-                    "relatedBookingId": related_booking_id,
-                    "relatedContractId": related_contract_id,
-                }
-
-                transaction_doc_ref = user_ref.collection(
-                    "Transaction_history"
-                ).document()
-                transaction.set(transaction_doc_ref, transaction_data)
+                transaction_doc_ref = _tx_history_ref(db, user_id).document()
+                transaction.set(
+                    transaction_doc_ref,
+                    _transaction_record(
+                        "deduct",
+                        amount,
+                        reason,
+                        admin_user_id,
+                        related_booking_id,
+                        related_contract_id,
+                        previous_balance=current_balance,
+                        new_balance=new_balance,
+                    ),
+                )
 
                 return {
                     "previousBalance": float(current_balance),
@@ -173,7 +302,8 @@ class WalletService:
                     "transactionId": transaction_doc_ref.id,
                 }
 
-            result = transaction_ref.transaction(deduct_money_transaction)
+            result = await deduct_money_transaction(db.transaction())
+            _balance_cache.pop(user_id, None)
 
             return {
                 "success": True,
@@ -187,10 +317,10 @@ class WalletService:
             }
 
         except Exception as e:
-            print(f"❌ Error deducting money from wallet: {e}")
+            logger.exception("Error deducting money from wallet")
             return {"success": False, "error": str(e)}
 
-    def process_refund(
+    async def process_refund(
         self,
         user_id: str,
         refund_amount: Money,
@@ -199,7 +329,7 @@ class WalletService:
         related_contract_id: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Process a refund to user's wallet (special case of add money)"""
-        return self.add_money_to_wallet(
+        return await self.add_money_to_wallet(
             user_id=user_id,
             amount=refund_amount,
             reason=f"Refund: {reason}",
@@ -208,90 +338,138 @@ class WalletService:
             related_contract_id=related_contract_id,
         )
 
-    def get_transaction_history(
+    async def _credit_wallet(
+        self,
+        db,
+        user_id: str,
+        amount: Money,
+        reason: str,
+        admin_user_id: Optional[str] = None,
+        related_booking_id: Optional[str] = None,
+        related_contract_id: Optional[str] = None,
+    ) -> str:
+        """
+        Credit a wallet without reading it: a server-side Increment and the
+        transaction record go out in one batch commit
+        Returns the transaction record ID
+        """
+        user_ref = _user_ref(db, user_id)
+        transaction_doc_ref = _tx_history_ref(db, user_id).document()
+
+        batch = db.batch()
+        # Fails the whole batch if the user does not exist. No minor-unit
+        # balance is kept on the wallet yet: an Increment on a wallet without
+        # one would store the delta as the balance, so it waits for a backfill
+        batch.update(user_ref, {"Wallet_Balance": Increment(float(amount.amount))})
+        batch.set(
+            transaction_doc_ref,
+            _transaction_record(
+                "add",
+                amount,
+                reason,
+                admin_user_id,
+                related_booking_id,
+                related_contract_id,
+            ),
+        )
+        await batch.commit()
+
+        _balance_cache.pop(user_id, None)
+        return transaction_doc_ref.id
+
+    async def get_transaction_history(
         self,
         user_id: str,
         limit: int = 50,
         start_after: Optional[str] = None,
         action_filter: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Get user's transaction history"""
+        """
+        Get user's transaction history
+        start_after is the nextCursor of the previous page; it resumes the
+        query directly from the (timestamp, document ID) it encodes
+        """
         try:
-            db = get_firebase_db()
+            db = get_async_firebase_db()
             if not db:
                 return {"success": False, "error": "Database connection failed"}
 
             # Build query
-            query = (
-                db.collection("users")
-                .document(user_id)
-                .collection("Transaction_history")
+            query = _tx_history_ref(db, user_id)
+            # Document ID breaks timestamp ties so the cursor order is stable
+            query = query.order_by("timestamp", direction="DESCENDING").order_by(
+                "__name__", direction="DESCENDING"
             )
-            query = query.order_by("timestamp", direction="DESCENDING")
 
             if action_filter:
+                # Needs the (action, timestamp desc, __name__ desc) composite
+                # index declared in firestore.indexes.json at the repo root
                 query = query.where("action", "==", action_filter)
 
             if start_after:
-                # Get the document to start after
-                start_doc = (
-                    db.collection("users")
-                    .document(user_id)
-                    .collection("Transaction_history")
-                    .document(start_after)
-                    .get()
-                )
-                if start_doc.exists:
-                    query = query.start_after(start_doc)
+                cursor_timestamp, cursor_id = decode_timestamp_cursor(start_after)
+                query = query.start_after([cursor_timestamp, cursor_id])
 
             query = query.limit(limit + 1)  # Get one extra to check if there are more
 
-            docs = query.get()
             transactions = []
-
-            for i, doc in enumerate(docs):
-                if i >= limit:  # Don't include the extra document in results
-                    break
-
-                data = doc.to_dict()
-                transaction_data = {
-                    "id": doc.id,
-                    "action": data.get("action"),
-                    "amount": data.get("amount"),
-                    "reason": data.get("reason"),
-                    "adminUserId": data.get("adminUserId"),
-                    "timestamp": (
-                        data.get("timestamp").isoformat()
-                        if data.get("timestamp")
-                        else None
-                    ),
-                    "previousBalance": data.get("previousBalance"),
-                    "newBalance": data.get("newBalance"),
-                    "currency": data.get("currency", self.currency),
-                    "relatedBookingId": data.get("relatedBookingId"),
-                    "relatedContractId": data.get("relatedContractId"),
-                }
-                transactions.append(transaction_data)
-
-            has_more = len(docs) > limit
+            last_timestamp = last_id = None
+            has_more = False
+
+            # Streamed so the extra document only signals another page; it is
+            # never converted and the RPC is closed as soon as it arrives
+            async with aclosing(query.stream()) as docs:
+                async for doc in docs:
+                    if len(transactions) >= limit:
+                        has_more = True
+                        break
+
+                    data = doc.to_dict()
+                    last_timestamp, last_id = data.get("timestamp"), doc.id
+                    transactions.append(
+                        _history_row(last_id, data, last_timestamp, self.currency)
+                    )
 
             return {
                 "success": True,
                 "transactions": transactions,
                 "hasMore": has_more,
                 "totalCount": len(transactions),
+                "nextCursor": (
+                    encode_timestamp_cursor(last_timestamp, last_id)
+                    if has_more and last_timestamp
+                    else None
+                ),
             }
 
         except Exception as e:
-            print(f"❌ Error getting transaction history: {e}")
+            logger.exception("Error getting transaction history")
             return {
                 "success": False,
                 "error": str(e),
                 "transactions": [],
                 "hasMore": False,
                 "totalCount": 0,
+                "nextCursor": None,
             }
 
+    async def get_wallet_overview(
+        self, user_id: str, limit: int = 50
+    ) -> Dict[str, Any]:
+        """
+        Get wallet balance and the first page of transaction history
+        Both reads run concurrently on the shared async client
+        """
+        balance, history = await asyncio.gather(
+            self.get_wallet_balance(user_id),
+            self.get_transaction_history(user_id, limit),
+        )
+        return {
+            **history,
+            "balance": balance.to_float(),
+            "currency": balance.currency,
+        }
+
     def calculate_refund_with_tax(
         self, subtotal: Decimal, tax_rate: Decimal = Decimal("0.15")
     ) -> Dict[str, Money]:
@@ -305,26 +483,36 @@ class WalletService:
             "total": Money(total_refund, self.currency),
         }
 
-    def validate_wallet_operation(
-        self, user_id: str, operation_amount: Money, operation_type: str
+    async def validate_wallet_operation(
+        self,
+        user_id: str,
+        operation_amount: Money,
+        operation_type: str,
+        include_balance: bool = False,
     ) -> Dict[str, Any]:
-        """Validate if a wallet operation can be performed"""
-        current_balance = self.get_wallet_balance(user_id)
+        """
+        Validate if a wallet operation can be performed
+        The balance is only read for deductions, or when include_balance is
+        set; otherwise currentBalance is None
+        """
+        current_balance = None
+        if operation_type == "deduct" or include_balance:
+            current_balance = await self.get_wallet_balance(user_id)
 
-        if (
-            operation_type == "deduct"
-            and current_balance.amount < operation_amount.amount
-        ):
+        if operation_amount.amount <= 0:
             return {
                 "valid": False,
-                "error": f"Insufficient balance. Current: {current_balance}, Required: {operation_amount}",
+                "error": "Operation amount must be positive",
                 "currentBalance": current_balance,
             }
 
-        if operation_amount.amount <= 0:
+        if (
+            operation_type == "deduct"
+            and current_balance.amount < operation_amount.amount
+        ):
             return {
                 "valid": False,
-                "error": "Operation amount must be positive",
+                "error": f"Insufficient balance. Current: {current_balance}, Required: {operation_amount}",
                 "currentBalance": current_balance,
             }
 
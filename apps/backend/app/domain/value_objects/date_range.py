@@ -2,25 +2,33 @@
 DateRange value object for handling date ranges
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 
+# Days covered by one unit of each booking type (months count as 30 days)
+_BOOKING_TYPE_DAYS = {"Day": 1, "Week": 7, "Month": 30}
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class DateRange:
     """Immutable value object representing a date range"""
 
     start_date: datetime
     end_date: datetime
+    # Computed once in __post_init__; the range is immutable
+    _duration_days: int = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if self.end_date < self.start_date:
             raise ValueError("End date must be after or equal to start date")
+        object.__setattr__(
+            self, "_duration_days", (self.end_date - self.start_date).days
+        )
 
     @property
     def duration_days(self) -> int:
         """Get duration in days"""
-        return (self.end_date - self.start_date).days
+        return self._duration_days
 
     @property
     def duration_weeks(self) -> float:
@@ -64,16 +72,12 @@ class DateRange:
         cls, start_date: datetime, booking_type: str, count: int = 1
     ) -> "DateRange":
         """Create date range from booking type and count"""
-        if booking_type == "Day":
-            end_date = start_date + timedelta(days=count)
-        elif booking_type == "Week":
-            end_date = start_date + timedelta(weeks=count)
-        elif booking_type == "Month":
-            end_date = start_date + timedelta(days=count * 30)
-        else:
-            raise ValueError(f"Invalid booking type: {booking_type}")
-
-        return cls(start_date, end_date)
+        try:
+            unit_days = _BOOKING_TYPE_DAYS[booking_type]
+        except KeyError:
+            raise ValueError(f"Invalid booking type: {booking_type}") from None
+
+        return cls(start_date, start_date + timedelta(days=count * unit_days))
 
     def __str__(self) -> str:
         return f"{self.start_date.date()} to {self.end_date.date()} ({self.duration_days} days)"
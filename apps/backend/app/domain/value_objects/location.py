@@ -2,7 +2,7 @@
 Location value objects for handling different location types
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Optional
 
@@ -16,7 +16,7 @@ class LocationType(Enum):
     SAME_AS_PICKUP = "same"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Location:
     """Base location value object"""
 
@@ -29,46 +29,58 @@ class Location:
         return self.type == other.type and self.id == other.id
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BranchLocation(Location):
     """Branch location"""
 
-    def __init__(self, branch_data: dict):
-        super().__init__(
-            type=LocationType.BRANCH,
+    type: LocationType = field(default=LocationType.BRANCH, init=False)
+    branch_data: dict = field(default_factory=dict, compare=False, repr=False)
+
+    @classmethod
+    def from_dict(cls, branch_data: dict) -> "BranchLocation":
+        """Create from the branch data stored on a booking"""
+        return cls(
             name=branch_data.get("name", ""),
             id=branch_data.get("id"),
+            branch_data=branch_data,
         )
-        object.__setattr__(self, "branch_data", branch_data)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AirportLocation(Location):
     """Airport location"""
 
-    def __init__(self, airport_data: dict):
-        super().__init__(
-            type=LocationType.AIRPORT,
+    type: LocationType = field(default=LocationType.AIRPORT, init=False)
+    airport_data: dict = field(default_factory=dict, compare=False, repr=False)
+
+    @classmethod
+    def from_dict(cls, airport_data: dict) -> "AirportLocation":
+        """Create from the airport data stored on a booking"""
+        return cls(
             name=airport_data.get("name", ""),
             id=airport_data.get("id"),
+            airport_data=airport_data,
         )
-        object.__setattr__(self, "airport_data", airport_data)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SavedAddressLocation(Location):
     """Saved address location"""
 
-    def __init__(self, address_data: dict):
-        super().__init__(
-            type=LocationType.SAVED_ADDRESS,
+    type: LocationType = field(default=LocationType.SAVED_ADDRESS, init=False)
+    address_data: dict = field(default_factory=dict, compare=False, repr=False)
+
+    @classmethod
+    def from_dict(cls, address_data: dict) -> "SavedAddressLocation":
+        """Create from the saved address data stored on a booking"""
+        return cls(
             name=address_data.get("name", ""),
             id=address_data.get("id"),
+            address_data=address_data,
         )
-        object.__setattr__(self, "address_data", address_data)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LocationPair:
     """Pickup and dropoff location pair"""
 
@@ -85,11 +97,13 @@ class LocationPair:
         """Create from booking details data"""
         # Determine pickup location
         if booking_details.get("isPickup"):
-            pickup = BranchLocation(booking_details.get("PicupBranche", {}))
+            pickup = BranchLocation.from_dict(booking_details.get("PicupBranche", {}))
         elif booking_details.get("isAirport"):
-            pickup = AirportLocation(booking_details.get("Ariport", {}))
+            pickup = AirportLocation.from_dict(booking_details.get("Ariport", {}))
         elif booking_details.get("isSavedAddress"):
-            pickup = SavedAddressLocation(booking_details.get("SavedAddress", {}))
+            pickup = SavedAddressLocation.from_dict(
+                booking_details.get("SavedAddress", {})
+            )
         else:
             pickup = Location(LocationType.BRANCH, "Unknown")
 
@@ -99,11 +113,11 @@ class LocationPair:
         return_saved = booking_details.get("ReturnSavedAddress", {})
 
         if return_branch:
-            dropoff = BranchLocation(return_branch)
+            dropoff = BranchLocation.from_dict(return_branch)
         elif return_airport:
-            dropoff = AirportLocation(return_airport)
+            dropoff = AirportLocation.from_dict(return_airport)
         elif return_saved:
-            dropoff = SavedAddressLocation(return_saved)
+            dropoff = SavedAddressLocation.from_dict(return_saved)
         else:
             dropoff = pickup  # Same as pickup
 
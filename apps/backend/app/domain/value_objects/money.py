@@ -3,11 +3,15 @@ Money value object for handling monetary values with currency
 """
 
 from dataclasses import dataclass
-from decimal import Decimal
+from decimal import ROUND_HALF_UP, Decimal
+from functools import lru_cache
 from typing import Union
 
+# Only a handful of currency codes exist, so their normalized form is cached
+_normalize_currency = lru_cache(maxsize=64)(str.upper)
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Money:
     """Immutable value object representing money with currency"""
 
@@ -15,12 +19,15 @@ class Money:
     currency: str = "SAR"
 
     def __init__(self, amount: Union[int, float, str, Decimal], currency: str = "SAR"):
-        # Ensure amount is stored as Decimal for precision
-        if isinstance(amount, (int, float, str)):
-            object.__setattr__(self, "amount", Decimal(str(amount)))
-        else:
-            object.__setattr__(self, "amount", amount)
-        object.__setattr__(self, "currency", currency.upper())
+        # Ensure amount is stored as Decimal for precision; only floats need
+        # the str() round-trip, ints and strings convert exactly as they are
+        if type(amount) is not Decimal:
+            if isinstance(amount, float):
+                amount = Decimal(str(amount))
+            elif isinstance(amount, (int, str)):
+                amount = Decimal(amount)
+        object.__setattr__(self, "amount", amount)
+        object.__setattr__(self, "currency", _normalize_currency(currency))
 
     def add(self, other: "Money") -> "Money":
         """Add two money values with same currency"""
@@ -30,6 +37,8 @@ class Money:
             )
         return Money(self.amount + other.amount, self.currency)
 
+    __add__ = add
+
     def subtract(self, other: "Money") -> "Money":
         """Subtract money value with same currency"""
         if self.currency != other.currency:
@@ -60,6 +69,10 @@ class Money:
         """Convert to float for JSON serialization"""
         return float(self.amount)
 
+    def to_minor(self) -> int:
+        """Convert to integer minor units (halalas for SAR), rounding half up"""
+        return int(self.amount.scaleb(2).to_integral_value(rounding=ROUND_HALF_UP))
+
     def __str__(self) -> str:
         return f"{self.currency} {self.amount:.2f}"
 
@@ -2,6 +2,7 @@
 Dependency injection container for the application
 """
 
+import threading
 from functools import lru_cache
 from typing import Optional
 
@@ -17,11 +18,16 @@ class DependencyContainer:
         self._contract_repository: Optional[ContractRepository] = None
         self._user_repository: Optional[UserRepository] = None
         self._car_repository: Optional[CarRepository] = None
+        # Sync dependencies run in FastAPI's threadpool; the lock keeps
+        # concurrent first requests from creating a repository twice
+        self._lock = threading.Lock()
 
     def get_contract_repository(self) -> ContractRepository:
         """Get contract repository instance"""
         if self._contract_repository is None:
-            self._contract_repository = self._create_contract_repository()
+            with self._lock:
+                if self._contract_repository is None:
+                    self._contract_repository = self._create_contract_repository()
         return self._contract_repository
 
     def _create_contract_repository(self) -> ContractRepository:
@@ -54,7 +60,9 @@ class DependencyContainer:
     def get_user_repository(self) -> UserRepository:
         """Get user repository instance"""
         if self._user_repository is None:
-            self._user_repository = self._create_user_repository()
+            with self._lock:
+                if self._user_repository is None:
+                    self._user_repository = self._create_user_repository()
         return self._user_repository
 
     def _create_user_repository(self) -> UserRepository:
@@ -87,7 +95,9 @@ class DependencyContainer:
     def get_car_repository(self) -> CarRepository:
         """Get car repository instance"""
         if self._car_repository is None:
-            self._car_repository = self._create_car_repository()
+            with self._lock:
+                if self._car_repository is None:
+                    self._car_repository = self._create_car_repository()
         return self._car_repository
 
     def _create_car_repository(self) -> CarRepository:
@@ -118,17 +128,10 @@ class DependencyContainer:
             return MockCarRepository()
 
 
-# Global container instance
-_container: Optional[DependencyContainer] = None
-
-
 @lru_cache()
 def get_dependency_container() -> DependencyContainer:
     """Get or create dependency container"""
-    global _container
-    if _container is None:
-        _container = DependencyContainer()
-    return _container
+    return DependencyContainer()
 
 
 def get_contract_repository() -> ContractRepository:
@@ -3,9 +3,58 @@ Simple Firebase collection access - Placeholder for new FastAPI structure
 TODO: Implement proper Firebase integration
 """
 
+from typing import Any, Optional
+
+# Shared async Firestore client, created on first use
+_async_db: Optional[Any] = None
+
 
 def get_firebase_db():
     """Get Firebase database client - placeholder implementation"""
     # TODO: Implement Firebase client for FastAPI structure
     print("⚠️ Firebase client not yet implemented in new structure")
     return None
+
+
+def get_async_firebase_db():
+    """
+    Get the shared async Firestore client
+    Returns None when Firebase is not configured, like get_firebase_db
+    """
+    global _async_db
+    if _async_db is None:
+        try:
+            import firebase_admin
+            from firebase_admin import firestore_async
+
+            # Importing the client initializes the Firebase app if possible
+            from .persistence.firebase.firebase_client import firebase_client
+        except ImportError as e:
+            print(f"⚠️ Async Firestore dependencies not available: {e}")
+            return None
+
+        if not firebase_admin._apps or not firebase_client.is_available:
+            return None
+
+        try:
+            _async_db = firestore_async.client()
+        except Exception as e:
+            print(f"⚠️ Failed to create async Firestore client: {e}")
+            return None
+    return _async_db
+
+
+async def warm_up_async_firebase_db() -> None:
+    """
+    Create the shared async client and open its channel ahead of the first
+    request with a single small document read
+    """
+    db = get_async_firebase_db()
+    if db is None:
+        return
+
+    try:
+        await db.collection("_warmup").document("_").get()
+        print("✅ Async Firestore client warmed up")
+    except Exception as e:
+        print(f"⚠️ Async Firestore warm-up failed: {e}")
@@ -2,37 +2,91 @@
 Converters for Firestore data types
 """
 
+import base64
+import binascii
 import json
 import math
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 
-def convert_firestore_document(data: Any) -> Any:
-    """Convert Firestore objects to JSON serializable types"""
+def _isoformat(data: Any) -> str:
+    return data.isoformat()
+
+
+def _document_path(data: Any) -> str:
+    return data.path  # Convert to string path
+
+
+def _geo_point(data: Any) -> Dict[str, float]:
+    return {"latitude": data.latitude, "longitude": data.longitude}
+
+
+def _convert_dict(data: Dict[Any, Any]) -> Dict[Any, Any]:
+    return {k: convert_firestore_document(v) for k, v in data.items()}
+
+
+def _convert_list(data: List[Any]) -> List[Any]:
+    return [convert_firestore_document(item) for item in data]
+
+
+def _identity(data: Any) -> Any:
+    return data
+
+
+def _convert_float(data: float) -> Optional[float]:
+    # Convert NaN and Infinity to null
+    return None if math.isnan(data) or math.isinf(data) else data
+
+
+def _convert_other(data: Any) -> Any:
+    # Handle special numeric values
+    if isinstance(data, float) and (math.isnan(data) or math.isinf(data)):
+        return None  # Convert NaN and Infinity to null
+
+    try:
+        # Try to serialize the value - if it fails, convert to string
+        json.dumps(data)
+        return data
+    except (TypeError, ValueError):
+        return str(data)
+
+
+def _pick_converter(data: Any) -> Callable[[Any], Any]:
+    """Choose how to convert values of data's type by probing data itself"""
     if hasattr(data, "timestamp"):  # Firestore timestamp
-        return data.isoformat()
+        return _isoformat
     elif hasattr(data, "isoformat"):  # datetime object
-        return data.isoformat()
+        return _isoformat
     elif hasattr(data, "path"):  # DocumentReference
-        return data.path  # Convert to string path
+        return _document_path
     elif hasattr(data, "latitude") and hasattr(data, "longitude"):  # GeoPoint
-        return {"latitude": data.latitude, "longitude": data.longitude}
+        return _geo_point
     elif isinstance(data, dict):
-        return {k: convert_firestore_document(v) for k, v in data.items()}
+        return _convert_dict
     elif isinstance(data, list):
-        return [convert_firestore_document(item) for item in data]
-    else:
-        # Handle special numeric values
-        if isinstance(data, float) and (math.isnan(data) or math.isinf(data)):
-            return None  # Convert NaN and Infinity to null
+        return _convert_list
+    return _convert_other
+
 
-        try:
-            # Try to serialize the value - if it fails, convert to string
-            json.dumps(data)
-            return data
-        except (TypeError, ValueError):
-            return str(data)
+# Converter per concrete type, picked on the first value of that type so the
+# attribute probes run once per type rather than once per value. JSON scalars
+# are known up front and never reach the json.dumps probe in _convert_other
+_CONVERTERS: Dict[type, Callable[[Any], Any]] = {
+    str: _identity,
+    int: _identity,
+    bool: _identity,
+    type(None): _identity,
+    float: _convert_float,
+}
+
+
+def convert_firestore_document(data: Any) -> Any:
+    """Convert Firestore objects to JSON serializable types"""
+    converter = _CONVERTERS.get(type(data))
+    if converter is None:
+        converter = _CONVERTERS[type(data)] = _pick_converter(data)
+    return converter(data)
 
 
 def parse_datetime(value: Any) -> datetime:
@@ -54,3 +108,30 @@ def parse_datetime(value: Any) -> datetime:
 def to_firestore_timestamp(dt: datetime):
     """Convert datetime to Firestore timestamp"""
     return dt
+
+
+def encode_cursor(doc_id: str) -> str:
+    """Encode a document ID as an opaque pagination cursor"""
+    return base64.urlsafe_b64encode(doc_id.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> str:
+    """Decode a pagination cursor back to the document ID it points after"""
+    try:
+        return base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+    except (binascii.Error, UnicodeError) as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor}") from e
+
+
+def encode_timestamp_cursor(timestamp: datetime, doc_id: str) -> str:
+    """Encode a (timestamp, document ID) position as an opaque cursor"""
+    return encode_cursor(json.dumps([timestamp.isoformat(), doc_id]))
+
+
+def decode_timestamp_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a cursor from encode_timestamp_cursor to (timestamp, document ID)"""
+    try:
+        timestamp, doc_id = json.loads(decode_cursor(cursor))
+        return datetime.fromisoformat(timestamp), doc_id
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor}") from e
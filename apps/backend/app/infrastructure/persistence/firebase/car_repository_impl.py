@@ -3,12 +3,16 @@ Firebase implementation of Car repository
 """
 
 import asyncio
+import sys
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from time import monotonic
 from typing import Any, Dict, List, Optional
 
 try:
     # Try to import Firestore dependencies
+    from google.cloud.firestore_v1 import FieldFilter
+
     FIRESTORE_AVAILABLE = True
     print("✅ Firestore imported successfully for Car repository")
 except ImportError as e:
@@ -20,9 +24,30 @@ from app.domain.repositories.car_repository import CarRepository
 from app.domain.value_objects.money import Money
 
 if FIRESTORE_AVAILABLE:
-    from ..converters import parse_datetime
+    from ..converters import decode_cursor, encode_cursor, parse_datetime
     from .firebase_client import firebase_client
 
+# Documents fetched per list query before client-side filtering
+LIST_BATCH_SIZE = 100
+
+# Seconds a counts_by_status result is reused before Firestore is queried again
+STATUS_COUNTS_TTL = 30.0
+
+# Whether every car document carries search_tokens. Saved cars get them, but
+# documents written by other clients do not, so list() only narrows searches
+# in Firestore once the collection has been backfilled
+SEARCH_TOKENS_INDEXED = False
+SEARCH_TOKEN_LENGTH = 3
+
+
+def _search_tokens(car: Car) -> List[str]:
+    """Every SEARCH_TOKEN_LENGTH-character slice within one of the car's fields"""
+    n = SEARCH_TOKEN_LENGTH
+    text = car.search_text
+    tokens = {text[i : i + n] for i in range(len(text) - n + 1)}
+    # Slices spanning the field separator can never match a search
+    return sorted(token for token in tokens if "\x1f" not in token)
+
 
 class FirebaseCarRepository(CarRepository):
     """Firebase implementation of Car repository"""
@@ -36,17 +61,33 @@ class FirebaseCarRepository(CarRepository):
             "cars"
         )  # Firebase collection is lowercase
         self.executor = ThreadPoolExecutor(max_workers=4)
+        # Short-lived snapshot of counts_by_status, dropped on every write
+        self._status_counts: Optional[Dict[str, int]] = None
+        self._status_counts_expiry = 0.0
 
     async def _run_query(self, query):
         """Helper to run Firestore query asynchronously"""
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(self.executor, lambda: list(query.stream()))
 
+    async def _count_query(self, query) -> int:
+        """Helper to count query matches server-side without fetching documents"""
+        loop = asyncio.get_event_loop()
+        result = await loop.run_in_executor(self.executor, query.count().get)
+        return int(result[0][0].value)
+
     async def _get_document(self, doc_ref):
         """Helper to get Firestore document asynchronously"""
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(self.executor, doc_ref.get)
 
+    async def _get_documents(self, doc_refs):
+        """Helper to batch-get Firestore documents asynchronously"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self.executor, lambda: list(firebase_client.get_all(doc_refs))
+        )
+
     async def _set_document(self, doc_ref, data):
         """Helper to set Firestore document asynchronously"""
         loop = asyncio.get_event_loop()
@@ -71,6 +112,20 @@ class FirebaseCarRepository(CarRepository):
             return self._to_entity(doc.id, doc.to_dict())
         return None
 
+    async def find_by_ids(self, car_ids: List[str]) -> Dict[str, Car]:
+        """Find several cars by ID in one batched read"""
+        refs = [self.collection.document(car_id) for car_id in dict.fromkeys(car_ids)]
+        if not refs:
+            return {}
+
+        cars = {}
+        for doc in await self._get_documents(refs):
+            if doc.exists:
+                car = self._to_entity(doc.id, doc.to_dict())
+                if car:
+                    cars[doc.id] = car
+        return cars
+
     async def find_by_license_plate(self, license_plate: str) -> Optional[Car]:
         """Find car by license plate"""
         # Since Firebase doesn't have license_plate field and we generate them,
@@ -112,35 +167,67 @@ class FirebaseCarRepository(CarRepository):
         available_only: Optional[bool] = None,
         location: Optional[str] = None,
         search: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
         """List cars with pagination and filters"""
         # Start with basic query - Firebase doesn't have DDD fields, so no database filtering
         query = self.collection.limit(
-            100
+            LIST_BATCH_SIZE
         )  # Get reasonable amount for client-side filtering
 
         # We can filter by make at database level since Firebase has this field
         if make and make != "all":
             query = query.where("make", "==", make)
 
+        # Any car containing the search also contains its first token; the
+        # substring check in _matches_all_filters still confirms each match
+        if SEARCH_TOKENS_INDEXED and search and len(search) >= SEARCH_TOKEN_LENGTH:
+            query = query.where(
+                filter=FieldFilter(
+                    "search_tokens",
+                    "array_contains",
+                    search.lower()[:SEARCH_TOKEN_LENGTH],
+                )
+            )
+
+        if cursor:
+            # Resume the scan after the last car of the previous page; a car
+            # deleted since leaves nothing to resume from, and restarting the
+            # scan would repeat earlier pages
+            last_doc = await self._get_document(
+                self.collection.document(decode_cursor(cursor))
+            )
+            if not last_doc.exists:
+                raise ValueError(f"Invalid pagination cursor: {cursor}")
+            query = query.start_after(last_doc)
+
         # Execute query and get documents
         docs = await self._run_query(query)
-        cars = []
 
-        # Process documents and apply client-side filters
-        for doc in docs:
-            try:
-                car = self._to_entity(doc.id, doc.to_dict())
-                if car and self._matches_all_filters(
-                    car, status, category, available_only, location, search
-                ):
-                    cars.append(car)
-            except Exception as e:
-                print(f"Error processing car {doc.id}: {e}")
-                continue
+        # Drop documents that cannot match the search before paying for their
+        # conversion; survivors are still checked in full on the entity
+        entries = ((doc.id, doc.to_dict()) for doc in docs)
+        if search and "\x1f" not in search:
+            search_lower = search.lower()
+            entries = (
+                (doc_id, data)
+                for doc_id, data in entries
+                if self._may_match_search(doc_id, data, search_lower)
+            )
+        records = (self._to_record(doc_id, data) for doc_id, data in entries)
+
+        # Convert documents and apply client-side filters
+        cars = [
+            car
+            for car in Car.bulk_from_trusted(record for record in records if record)
+            if self._matches_all_filters(
+                car, status, category, available_only, location, search
+            )
+        ]
 
-        # Apply pagination
-        return self._paginate_results(cars, page, limit)
+        # Apply pagination; a full batch means Firestore may hold more cars
+        last_scanned_id = docs[-1].id if len(docs) == LIST_BATCH_SIZE else None
+        return self._paginate_results(cars, page, limit, cursor, last_scanned_id)
 
     def _build_query(
         self,
@@ -211,32 +298,71 @@ class FirebaseCarRepository(CarRepository):
         # Search filter
         if search:
             search_lower = search.lower()
-            if not (
-                search_lower in car.make.lower()
-                or search_lower in car.model.lower()
-                or search_lower in car.license_plate.lower()
-                or search_lower in car.color.lower()
-                or search_lower in car.category.lower()
-                or search_lower in str(car.year)
-            ):
+            if search_lower not in car.search_text:
                 return False
 
         return True
 
+    def _may_match_search(
+        self, doc_id: str, data: Dict[str, Any], search_lower: str
+    ) -> bool:
+        """
+        Cheap pre-check of a raw document against a lowercased search
+        Only returns False when the mapped car's search_text cannot contain the
+        search; unusual field shapes are left to the full conversion
+        """
+        try:
+            fields = self._search_fields(doc_id, data)
+        except Exception:
+            return True
+        text_fields = (
+            fields["make"],
+            fields["model"],
+            fields["license_plate"],
+            fields["color"],
+            fields["category"],
+        )
+        if not (
+            all(isinstance(value, str) for value in text_fields)
+            and isinstance(fields["year"], int)
+        ):
+            return True
+
+        # Same fields, in the same order, as Car.search_text
+        text = "\x1f".join((*text_fields, str(fields["year"]))).lower()
+        return search_lower in text
+
     def _paginate_results(
-        self, cars: List[Car], page: int, limit: int
+        self,
+        cars: List[Car],
+        page: int,
+        limit: int,
+        cursor: Optional[str] = None,
+        last_scanned_id: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Apply pagination to filtered cars"""
+        """
+        Apply pagination to filtered cars
+        last_scanned_id is the last document of a full batch; once the batch's
+        cars are used up, the next page resumes the scan after it
+        """
         total = len(cars)
-        offset = (page - 1) * limit
+        # A cursor query already starts after the previous page
+        offset = 0 if cursor else (page - 1) * limit
         paginated_cars = cars[offset : offset + limit]
 
+        next_id = None
+        if offset + limit < total:
+            next_id = paginated_cars[-1].id
+        elif last_scanned_id:
+            next_id = last_scanned_id
+
         return {
             "cars": [c.to_dict() for c in paginated_cars],
             "total": total,
             "page": page,
             "totalPages": (total + limit - 1) // limit,
-            "hasMore": page < (total + limit - 1) // limit,
+            "hasMore": next_id is not None,
+            "nextCursor": encode_cursor(next_id) if next_id else None,
         }
 
     async def save(self, car: Car) -> Car:
@@ -251,21 +377,56 @@ class FirebaseCarRepository(CarRepository):
             _, doc_ref = await self._add_document(data)
             car.id = doc_ref.id
 
+        self._status_counts = None
         return car
 
     async def delete(self, car_id: str) -> bool:
         """Delete car by ID"""
         try:
             await self._delete_document(self.collection.document(car_id))
+            self._status_counts = None
             return True
         except Exception:
             return False
 
     async def count_by_status(self, status: str) -> int:
         """Count cars by status"""
-        query = self.collection.where("status", "==", status)
-        docs = await self._run_query(query)
-        return len(docs)
+        return (await self.counts_by_status()).get(status, 0)
+
+    async def counts_by_status(self) -> Dict[str, int]:
+        """
+        Count cars for every status, keyed by status
+        Status is not stored but derived from isOutOfService/isOutOfStock (see
+        _parse_enum_values), so it is counted through server-side aggregations
+        over those flags; a missing flag reads as false
+        """
+        now = monotonic()
+        if self._status_counts is not None and now < self._status_counts_expiry:
+            return dict(self._status_counts)
+
+        out_of_service = self.collection.where(
+            filter=FieldFilter("isOutOfService", "==", True)
+        )
+        total, maintenance, out_of_stock, both = await asyncio.gather(
+            self._count_query(self.collection),
+            self._count_query(out_of_service),
+            self._count_query(
+                self.collection.where(filter=FieldFilter("isOutOfStock", "==", True))
+            ),
+            self._count_query(
+                out_of_service.where(filter=FieldFilter("isOutOfStock", "==", True))
+            ),
+        )
+        # Out of service wins over out of stock when both flags are set
+        rented = out_of_stock - both
+
+        self._status_counts = {
+            CarStatus.AVAILABLE.value: total - maintenance - rented,
+            CarStatus.RENTED.value: rented,
+            CarStatus.MAINTENANCE.value: maintenance,
+        }
+        self._status_counts_expiry = now + STATUS_COUNTS_TTL
+        return dict(self._status_counts)
 
     async def find_available_cars(
         self,
@@ -281,61 +442,62 @@ class FirebaseCarRepository(CarRepository):
         if location:
             query = query.where("location", "==", location)
 
-        cars = []
         docs = await self._run_query(query)
-        for doc in docs:
-            try:
-                car = self._to_entity(doc.id, doc.to_dict())
-                if car:
-                    cars.append(car)
-            except Exception:
-                continue
-
-        return cars
+        return self._to_entities(docs)
 
     async def find_cars_due_for_service(self, days_ahead: int = 7) -> List[Car]:
         """Find cars due for service within specified days"""
         future_date = datetime.now() + timedelta(days=days_ahead)
 
-        # Since Firestore has limited date comparison, we'll fetch all cars
-        # and filter client-side
-        query = self.collection.limit(1000)  # Reasonable limit
-        cars = []
-
-        docs = await self._run_query(query)
-        for doc in docs:
-            try:
-                car = self._to_entity(doc.id, doc.to_dict())
-                if (
-                    car
-                    and car.next_service_date
-                    and car.next_service_date <= future_date
-                    and car.status != CarStatus.OUT_OF_SERVICE
-                ):
-                    cars.append(car)
-            except Exception:
-                continue
+        # Only cars with a next_service_date up to future_date leave Firestore;
+        # a single-field range needs no composite index. Firestore ranges never
+        # cross value types, so dates some documents still store as ISO strings
+        # get a string range of their own (ISO strings sort chronologically).
+        # Status is derived from isOutOfService/isOutOfStock on read, so it is
+        # still checked here
+        timestamp_docs, string_docs = await asyncio.gather(
+            self._run_query(
+                self.collection.where(
+                    filter=FieldFilter("next_service_date", "<=", future_date)
+                )
+            ),
+            self._run_query(
+                self.collection.where(
+                    filter=FieldFilter(
+                        "next_service_date", "<=", future_date.isoformat()
+                    )
+                )
+            ),
+        )
 
-        return cars
+        docs = timestamp_docs + string_docs
+        # The string range also matches empty strings, which parse to None
+        return [
+            car
+            for car in self._to_entities(docs)
+            if car.next_service_date
+            and car.next_service_date <= future_date
+            and car.status != CarStatus.OUT_OF_SERVICE
+        ]
 
     async def find_cars_by_make_and_model(self, make: str, model: str) -> List[Car]:
         """Find cars by make and model"""
         query = self.collection.where("make", "==", make).where("model", "==", model)
-        cars = []
-
         docs = await self._run_query(query)
-        for doc in docs:
-            try:
-                car = self._to_entity(doc.id, doc.to_dict())
-                if car:
-                    cars.append(car)
-            except Exception:
-                continue
-
-        return cars
+        return self._to_entities(docs)
 
     def _to_entity(self, doc_id: str, data: Dict[str, Any]) -> Optional[Car]:
         """Convert Firestore document to Car entity"""
+        record = self._to_record(doc_id, data)
+        return Car.from_trusted(record) if record else None
+
+    def _to_entities(self, docs) -> List[Car]:
+        """Convert Firestore documents to Car entities, skipping invalid ones"""
+        records = (self._to_record(doc.id, doc.to_dict()) for doc in docs)
+        return Car.bulk_from_trusted(record for record in records if record)
+
+    def _to_record(self, doc_id: str, data: Dict[str, Any]) -> Optional[Dict]:
+        """Map a Firestore document onto Car field values"""
         try:
             # Clean Firebase objects first
             cleaned_data = self._clean_firebase_objects(data)
@@ -346,64 +508,67 @@ class FirebaseCarRepository(CarRepository):
             service_dates = self._parse_service_dates(cleaned_data)
 
             # Create entity using EXACT Firebase schema mapping
-            # car_type: ["Economy", "All"] - take first non-"All" element
-            car_types = cleaned_data.get("car_type", ["Economy"])
-            category = "Economy"  # Default
-            if car_types and isinstance(car_types, list):
-                # Find first category that's not "All" or Arabic equivalent
-                for cat in car_types:
-                    if cat not in ["All", "الجميع"]:
-                        category = cat
-                        break
-
-            # Generate license plate since Firebase doesn't have this field
-            license_plate = (
-                f"{cleaned_data.get('make', 'CAR')[:3].upper()}-{doc_id[:4]}"
-            )
-
-            car = Car(
-                make=cleaned_data.get("make", ""),
-                model=cleaned_data.get("model", ""),
-                year=cleaned_data.get("year", datetime.now().year),
-                color="Unknown",  # Firebase schema doesn't include color
-                license_plate=license_plate,
-                category=category,
-                daily_rate=money_values["daily_rate"],
-                weekly_rate=money_values["weekly_rate"],
-                monthly_rate=money_values["monthly_rate"],
-                status=enum_values["status"],
-                location=data.get("location"),
-                mileage=data.get("mileage"),
-                fuel_type=enum_values["fuel_type"],
-                transmission=enum_values["transmission"],
-                seats=cleaned_data.get(
-                    "Seats", 5
-                ),  # EXACT Firebase field: "Seats" (capital S)
-                engine_size=None,  # Firebase schema doesn't include engine_size
-                features=self._extract_features(data),
-                has_gps=False,  # Firebase doesn't have these boolean fields
-                has_bluetooth=False,
-                has_usb_charger=False,
-                has_backup_camera=False,
-                last_service_date=service_dates["last_service_date"],
-                next_service_date=service_dates["next_service_date"],
-                service_interval_km=data.get("service_interval_km"),
-                car_data=data.get("car_data", {}),
-            )
-
-            # Set the document ID and timestamps manually after creation
-            car.id = doc_id
-            if data.get("created_at"):
-                car.created_at = parse_datetime(data["created_at"])
-            if data.get("updated_at"):
-                car.updated_at = parse_datetime(data["updated_at"])
-
-            return car
+            fields = self._search_fields(doc_id, cleaned_data)
+            created_at = data.get("created_at")
+            updated_at = data.get("updated_at")
+
+            # Stored documents are trusted, so the record bypasses validation
+            return {
+                "id": doc_id,
+                "make": sys.intern(fields["make"]),
+                "model": fields["model"],
+                "year": fields["year"],
+                "color": fields["color"],
+                "license_plate": fields["license_plate"],
+                "category": sys.intern(fields["category"]),
+                "daily_rate": money_values["daily_rate"],
+                "weekly_rate": money_values["weekly_rate"],
+                "monthly_rate": money_values["monthly_rate"],
+                "status": enum_values["status"],
+                "location": data.get("location"),
+                "mileage": data.get("mileage"),
+                "fuel_type": enum_values["fuel_type"],
+                "transmission": enum_values["transmission"],
+                # EXACT Firebase field: "Seats" (capital S)
+                "seats": cleaned_data.get("Seats", 5),
+                "features": dict.fromkeys(self._extract_features(data)),
+                "last_service_date": service_dates["last_service_date"],
+                "next_service_date": service_dates["next_service_date"],
+                "service_interval_km": data.get("service_interval_km"),
+                "car_data": data.get("car_data", {}),
+                "created_at": parse_datetime(created_at) if created_at else None,
+                "updated_at": parse_datetime(updated_at) if updated_at else None,
+            }
 
         except Exception as e:
             print(f"Error converting document to Car entity: {e}")
             return None
 
+    def _search_fields(self, doc_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Map the document fields Car.search_text is built from
+        Shared by _to_record and the _may_match_search pre-check
+        """
+        # car_type: ["Economy", "All"] - take first non-"All" element
+        car_types = data.get("car_type", ["Economy"])
+        category = "Economy"  # Default
+        if car_types and isinstance(car_types, list):
+            # Find first category that's not "All" or Arabic equivalent
+            for cat in car_types:
+                if cat not in ["All", "الجميع"]:
+                    category = cat
+                    break
+
+        return {
+            "make": data.get("make", ""),
+            "model": data.get("model", ""),
+            "year": data.get("year", datetime.now().year),
+            "color": "Unknown",  # Firebase schema doesn't include color
+            # Generate license plate since Firebase doesn't have this field
+            "license_plate": f"{data.get('make', 'CAR')[:3].upper()}-{doc_id[:4]}",
+            "category": category,
+        }
+
     def _parse_money_values(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Parse money values from Firestore data using exact Firebase schema"""
         # EXACT Firebase field mapping based on MCP schema:
@@ -417,15 +582,12 @@ class FirebaseCarRepository(CarRepository):
             max(daily_price, 1), "SAR"
         )  # Minimum 1 SAR to pass validation
 
-        weekly_rate = None
-        if data.get("rental_price_week"):
-            weekly_rate = Money(data.get("rental_price_week"), "SAR")
+        weekly_price = data.get("rental_price_week")
+        weekly_rate = Money(weekly_price, "SAR") if weekly_price else None
 
-        monthly_rate = None
-        if data.get(
-            "rental_price_mounth"
-        ):  # Firebase typo: "mounth" instead of "month"
-            monthly_rate = Money(data.get("rental_price_mounth"), "SAR")
+        # Firebase typo: "mounth" instead of "month"
+        monthly_price = data.get("rental_price_mounth")
+        monthly_rate = Money(monthly_price, "SAR") if monthly_price else None
 
         return {
             "daily_rate": daily_rate,
@@ -464,17 +626,15 @@ class FirebaseCarRepository(CarRepository):
 
     def _parse_service_dates(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Parse service dates from Firestore data"""
-        last_service_date = None
-        if data.get("last_service_date"):
-            last_service_date = parse_datetime(data["last_service_date"])
-
-        next_service_date = None
-        if data.get("next_service_date"):
-            next_service_date = parse_datetime(data["next_service_date"])
-
+        last_service_date = data.get("last_service_date")
+        next_service_date = data.get("next_service_date")
         return {
-            "last_service_date": last_service_date,
-            "next_service_date": next_service_date,
+            "last_service_date": (
+                parse_datetime(last_service_date) if last_service_date else None
+            ),
+            "next_service_date": (
+                parse_datetime(next_service_date) if next_service_date else None
+            ),
         }
 
     def _from_entity(self, car: Car) -> Dict[str, Any]:
@@ -490,6 +650,8 @@ class FirebaseCarRepository(CarRepository):
         if car.next_service_date:
             data["next_service_date"] = car.next_service_date
 
+        data["search_tokens"] = _search_tokens(car)
+
         # Remove the id field as it's the document ID
         data.pop("id", None)
         # Remove computed fields
@@ -4,7 +4,8 @@ Firebase implementation of Contract repository
 
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime, timedelta
+from datetime import datetime
+from time import monotonic
 from typing import Any, Dict, List, Optional
 
 try:
@@ -47,19 +48,31 @@ except ImportError as e:
         )
 
 from app.domain.entities.contract import (
+    CancellationRecord,
     Contract,
     ContractStatus,
     PaymentStatus,
     TransactionInfo,
+    find_expiring_contracts,
+    find_overdue_contracts,
 )
 from app.domain.repositories.contract_repository import ContractRepository
 from app.domain.value_objects.date_range import DateRange
 from app.domain.value_objects.money import Money
 
 if FIRESTORE_AVAILABLE:
-    from ..converters import parse_datetime
+    from ..converters import decode_cursor, encode_cursor, parse_datetime
     from .firebase_client import firebase_client
 
+# Firestore caps the number of values in a single 'in' filter
+FIRESTORE_IN_LIMIT = 30
+
+# Documents fetched per list query before client-side filtering
+LIST_BATCH_SIZE = 100
+
+# Seconds a counts_by_status result is reused before Firestore is queried again
+STATUS_COUNTS_TTL = 30.0
+
 
 class FirebaseContractRepository(ContractRepository):
     """Firebase implementation of Contract repository"""
@@ -73,17 +86,33 @@ class FirebaseContractRepository(ContractRepository):
             "Contracts"
         )  # EXACT Firebase collection name
         self.executor = ThreadPoolExecutor(max_workers=4)
+        # Short-lived snapshot of counts_by_status, dropped on every write
+        self._status_counts: Optional[Dict[str, int]] = None
+        self._status_counts_expiry = 0.0
 
     async def _run_query(self, query):
         """Helper to run Firestore query asynchronously"""
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(self.executor, lambda: list(query.stream()))
 
+    async def _count_query(self, query) -> int:
+        """Helper to count query matches server-side without fetching documents"""
+        loop = asyncio.get_event_loop()
+        result = await loop.run_in_executor(self.executor, query.count().get)
+        return int(result[0][0].value)
+
     async def _get_document(self, doc_ref):
         """Helper to get Firestore document asynchronously"""
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(self.executor, doc_ref.get)
 
+    async def _get_documents(self, doc_refs):
+        """Helper to batch-get Firestore documents asynchronously"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self.executor, lambda: list(firebase_client.get_all(doc_refs))
+        )
+
     async def _set_document(self, doc_ref, data):
         """Helper to set Firestore document asynchronously"""
         loop = asyncio.get_event_loop()
@@ -108,6 +137,23 @@ class FirebaseContractRepository(ContractRepository):
             return self._to_entity(doc.id, doc.to_dict())
         return None
 
+    async def find_by_ids(self, contract_ids: List[str]) -> Dict[str, Contract]:
+        """Find several contracts by ID in one batched read"""
+        refs = [
+            self.collection.document(contract_id)
+            for contract_id in dict.fromkeys(contract_ids)
+        ]
+        if not refs:
+            return {}
+
+        contracts = {}
+        for doc in await self._get_documents(refs):
+            if doc.exists:
+                contract = self._to_entity(doc.id, doc.to_dict())
+                if contract:
+                    contracts[doc.id] = contract
+        return contracts
+
     async def find_by_order_id(self, order_id: str) -> Optional[Contract]:
         """Find contract by order ID"""
         query = self.collection.where("OrderId", "==", order_id).limit(1)
@@ -117,6 +163,29 @@ class FirebaseContractRepository(ContractRepository):
             return self._to_entity(doc.id, doc.to_dict())
         return None
 
+    async def find_by_order_ids(self, order_ids: List[str]) -> Dict[str, Contract]:
+        """Find contracts for several order IDs with chunked 'in' queries"""
+        order_ids = list(dict.fromkeys(order_ids))
+        queries = [
+            self.collection.where(
+                filter=FieldFilter(
+                    "OrderId", "in", order_ids[start : start + FIRESTORE_IN_LIMIT]
+                )
+            )
+            for start in range(0, len(order_ids), FIRESTORE_IN_LIMIT)
+        ]
+        # Chunks are independent, so they run concurrently on the executor
+        results = await asyncio.gather(*(self._run_query(q) for q in queries))
+
+        contracts = {}
+        for docs in results:
+            for doc in docs:
+                contract = self._to_entity(doc.id, doc.to_dict())
+                # Keep the first match per order, as find_by_order_id does
+                if contract and contract.order_id not in contracts:
+                    contracts[contract.order_id] = contract
+        return contracts
+
     async def find_by_contract_number(self, contract_number: str) -> Optional[Contract]:
         """Find contract by contract number"""
         query = self.collection.where("ContractNumber", "==", contract_number).limit(1)
@@ -136,6 +205,7 @@ class FirebaseContractRepository(ContractRepository):
         date_from: Optional[datetime] = None,
         date_to: Optional[datetime] = None,
         search: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
         """List contracts with pagination and filters"""
         query = self.collection
@@ -145,7 +215,7 @@ class FirebaseContractRepository(ContractRepository):
             query = query.where("ContractStatus", "==", status)
 
         # Fetch more than needed for client-side filtering
-        query = query.limit(100)
+        query = query.limit(LIST_BATCH_SIZE)
 
         # Try to order by creation date
         try:
@@ -153,6 +223,17 @@ class FirebaseContractRepository(ContractRepository):
         except Exception:
             pass
 
+        if cursor:
+            # Resume the scan after the last contract of the previous page; a
+            # contract deleted since leaves nothing to resume from, and
+            # restarting the scan would repeat earlier pages
+            last_doc = await self._get_document(
+                self.collection.document(decode_cursor(cursor))
+            )
+            if not last_doc.exists:
+                raise ValueError(f"Invalid pagination cursor: {cursor}")
+            query = query.start_after(last_doc)
+
         # Execute query
         docs = await self._run_query(query)
         contracts = []
@@ -194,17 +275,26 @@ class FirebaseContractRepository(ContractRepository):
                 print(f"Error processing contract {doc.id}: {e}")
                 continue
 
-        # Apply pagination
+        # Apply pagination; a cursor query already starts after the previous page
         total = len(contracts)
-        offset = (page - 1) * limit
+        offset = 0 if cursor else (page - 1) * limit
         paginated_contracts = contracts[offset : offset + limit]
 
+        # Once the batch's contracts are used up, a full batch means Firestore
+        # may hold more, and the next page resumes the scan after its last one
+        next_id = None
+        if offset + limit < total:
+            next_id = paginated_contracts[-1].id
+        elif len(docs) == LIST_BATCH_SIZE:
+            next_id = docs[-1].id
+
         return {
             "contracts": [c.to_dict() for c in paginated_contracts],
             "total": total,
             "page": page,
             "totalPages": (total + limit - 1) // limit,
-            "hasMore": page < (total + limit - 1) // limit,
+            "hasMore": next_id is not None,
+            "nextCursor": encode_cursor(next_id) if next_id else None,
         }
 
     async def save(self, contract: Contract) -> Contract:
@@ -219,21 +309,46 @@ class FirebaseContractRepository(ContractRepository):
             _, doc_ref = await self._add_document(data)
             contract.id = doc_ref.id
 
+        self._status_counts = None
         return contract
 
     async def delete(self, contract_id: str) -> bool:
         """Delete contract by ID"""
         try:
             await self._delete_document(self.collection.document(contract_id))
+            self._status_counts = None
             return True
         except Exception:
             return False
 
     async def count_by_status(self, status: str) -> int:
         """Count contracts by status"""
-        query = self.collection.where("ContractStatus", "==", status)
-        docs = await self._run_query(query)
-        return len(docs)
+        return (await self.counts_by_status()).get(status, 0)
+
+    async def counts_by_status(self) -> Dict[str, int]:
+        """
+        Count contracts for every status, keyed by status
+        Each status is a server-side count() aggregation; they run concurrently
+        """
+        now = monotonic()
+        if self._status_counts is not None and now < self._status_counts_expiry:
+            return dict(self._status_counts)
+
+        statuses = [contract_status.value for contract_status in ContractStatus]
+        counts = await asyncio.gather(
+            *(
+                self._count_query(
+                    self.collection.where(
+                        filter=FieldFilter("ContractStatus", "==", contract_status)
+                    )
+                )
+                for contract_status in statuses
+            )
+        )
+
+        self._status_counts = dict(zip(statuses, counts))
+        self._status_counts_expiry = now + STATUS_COUNTS_TTL
+        return dict(self._status_counts)
 
     async def find_overdue(self) -> List[Contract]:
         """Find all overdue contracts"""
@@ -246,16 +361,15 @@ class FirebaseContractRepository(ContractRepository):
         for doc in docs:
             try:
                 contract = self._to_entity(doc.id, doc.to_dict())
-                if contract and contract.is_overdue():
+                if contract:
                     contracts.append(contract)
             except Exception:
                 continue
 
-        return contracts
+        return find_overdue_contracts(contracts)
 
     async def find_expiring_soon(self, days: int = 7) -> List[Contract]:
         """Find contracts expiring within specified days"""
-        future_date = datetime.now() + timedelta(days=days)
         query = self.collection.where(
             filter=FieldFilter("ContractStatus", "in", ["active", "extended"])
         )
@@ -265,12 +379,12 @@ class FirebaseContractRepository(ContractRepository):
         for doc in docs:
             try:
                 contract = self._to_entity(doc.id, doc.to_dict())
-                if contract and contract.date_range.end_date <= future_date:
+                if contract:
                     contracts.append(contract)
             except Exception:
                 continue
 
-        return contracts
+        return find_expiring_contracts(contracts, days)
 
     def _clean_firebase_objects(self, obj: Any) -> Any:
         """Clean Firebase objects for JSON serialization"""
@@ -413,39 +527,70 @@ class FirebaseContractRepository(ContractRepository):
                     trans_data.get("status"), PaymentStatus.PENDING
                 )
 
+            # Older documents kept the cancellation inside BookingDetails
+            cancellation = None
+            cancellation_reason = cleaned_data.get(
+                "cancellation_reason"
+            ) or booking_details.get("cancellation_reason")
+            if cancellation_reason:
+                cancelled_at = cleaned_data.get("cancelled_at") or booking_details.get(
+                    "cancelled_at"
+                )
+                # Left unset when the document never recorded when it happened
+                cancellation = CancellationRecord(
+                    reason=cancellation_reason,
+                    cancelled_at=parse_datetime(cancelled_at) if cancelled_at else None,
+                )
+
             # Create entity using EXACT Firebase schema
-            contract = Contract(
-                order_id=cleaned_data.get(
-                    "OrderId", f"ORDER_{doc_id[:8]}"
-                ),  # EXACT: "OrderId"
-                contract_number=cleaned_data.get(
-                    "ContractNumber", f"CNT_{doc_id[:8]}"
-                ),  # EXACT: "ContractNumber"
-                user_id=user_id,
-                car_id=car_id,
-                booking_id=cleaned_data.get("booking_id"),  # May not exist in Firebase
-                date_range=DateRange(start_date, end_date),
-                booking_type=booking_type,
-                count=cleaned_data.get("count", 1),  # EXACT: "count"
-                booking_cost=booking_cost,  # EXACT: "booking_cost"
-                taxes=taxes,  # EXACT: "taxes"
-                delivery_fee=delivery,  # EXACT: "Delivery"
-                offers_total=offers_total,  # EXACT: "offersTotal"
-                total_cost=total_cost,  # EXACT: "total_cost"
-                status=contract_status,
-                payment_status=payment_status,
-                transaction_info=transaction_info,
-                is_extended=cleaned_data.get("IsExtended", False),  # May not exist
-                booking_details=booking_details,  # EXACT: "BookingDetails"
+            # Documents follow the client-app schema and are not written only
+            # through this service, so they are not trusted: the entity is
+            # loaded without the constructor and then checked with validate()
+            contract = Contract.from_trusted(
+                {
+                    "id": doc_id,
+                    # EXACT: "OrderId"
+                    "order_id": cleaned_data.get("OrderId", f"ORDER_{doc_id[:8]}"),
+                    # EXACT: "ContractNumber"
+                    "contract_number": cleaned_data.get(
+                        "ContractNumber", f"CNT_{doc_id[:8]}"
+                    ),
+                    "user_id": user_id,
+                    "car_id": car_id,
+                    # May not exist in Firebase
+                    "booking_id": cleaned_data.get("booking_id"),
+                    "date_range": DateRange(start_date, end_date),
+                    "booking_type": booking_type,
+                    "count": cleaned_data.get("count", 1),  # EXACT: "count"
+                    "booking_cost": booking_cost,  # EXACT: "booking_cost"
+                    "taxes": taxes,  # EXACT: "taxes"
+                    "delivery_fee": delivery,  # EXACT: "Delivery"
+                    "offers_total": offers_total,  # EXACT: "offersTotal"
+                    "total_cost": total_cost,  # EXACT: "total_cost"
+                    "status": contract_status,
+                    "payment_status": payment_status,
+                    "transaction_info": transaction_info,
+                    # May not exist
+                    "is_extended": cleaned_data.get("IsExtended", False),
+                    "cancellation": cancellation,
+                    # EXACT: "BookingDetails"
+                    "booking_details": booking_details,
+                    # EXACT Firebase fields: "created_at" and "updated_at"
+                    "created_at": (
+                        parse_datetime(cleaned_data["created_at"])
+                        if cleaned_data.get("created_at")
+                        else None
+                    ),
+                    "updated_at": (
+                        parse_datetime(cleaned_data["updated_at"])
+                        if cleaned_data.get("updated_at")
+                        else None
+                    ),
+                }
             )
-
-            # Set the document ID and timestamps using exact Firebase schema
-            contract.id = doc_id
-            # EXACT Firebase fields: "created_at" and "updated_at" (Timestamps)
-            if cleaned_data.get("created_at"):
-                contract.created_at = parse_datetime(cleaned_data["created_at"])
-            if cleaned_data.get("updated_at"):
-                contract.updated_at = parse_datetime(cleaned_data["updated_at"])
+            # Invalid documents (non-positive count, negative costs, blank
+            # order or contract number) are dropped like any failed conversion
+            contract.validate()
 
             return contract
 
@@ -81,6 +81,12 @@ class FirebaseClient:
             raise RuntimeError("Firestore client not initialized")
         return self._db.collection(name)
 
+    def get_all(self, doc_refs):
+        """Fetch several documents in a single batched read"""
+        if self._db is None:
+            raise RuntimeError("Firestore client not initialized")
+        return self._db.get_all(doc_refs)
+
     @property
     def is_available(self) -> bool:
         """Check if Firebase is available"""
@@ -42,6 +42,12 @@ class FirebaseUserRepository(UserRepository):
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(self.executor, lambda: list(query.stream()))
 
+    async def _count_query(self, query) -> int:
+        """Helper to count query matches server-side without fetching documents"""
+        loop = asyncio.get_event_loop()
+        result = await loop.run_in_executor(self.executor, query.count().get)
+        return int(result[0][0].value)
+
     async def _get_document(self, doc_ref):
         """Helper to get Firestore document asynchronously"""
         loop = asyncio.get_event_loop()
@@ -236,8 +242,7 @@ class FirebaseUserRepository(UserRepository):
     async def count_by_status(self, status: str) -> int:
         """Count users by status"""
         query = self.collection.where("status", "==", status)
-        docs = await self._run_query(query)
-        return len(docs)
+        return await self._count_query(query)
 
     async def find_by_wallet_balance_above(self, amount: float) -> List[User]:
         """Find users with wallet balance above specified amount"""
@@ -2,12 +2,14 @@
 Mock implementation of Car repository for testing and fallback
 """
 
+from collections import Counter
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
 from app.domain.entities.car import Car, CarStatus, FuelType, TransmissionType
 from app.domain.repositories.car_repository import CarRepository
 from app.domain.value_objects.money import Money
+from app.infrastructure.persistence.converters import decode_cursor, encode_cursor
 
 
 class MockCarRepository(CarRepository):
@@ -131,6 +133,11 @@ class MockCarRepository(CarRepository):
         """Find car by ID"""
         return self._cars.get(car_id)
 
+    async def find_by_ids(self, car_ids: List[str]) -> Dict[str, Car]:
+        """Find several cars by ID"""
+        cars = self._cars
+        return {car_id: cars[car_id] for car_id in car_ids if car_id in cars}
+
     async def find_by_license_plate(self, license_plate: str) -> Optional[Car]:
         """Find car by license plate"""
         for car in self._cars.values():
@@ -148,6 +155,7 @@ class MockCarRepository(CarRepository):
         available_only: Optional[bool] = None,
         location: Optional[str] = None,
         search: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
         """List cars with pagination and filters"""
         cars = list(self._cars.values())
@@ -172,33 +180,34 @@ class MockCarRepository(CarRepository):
 
         if search:
             search_lower = search.lower()
-            cars = [
-                c
-                for c in cars
-                if (
-                    search_lower in c.make.lower()
-                    or search_lower in c.model.lower()
-                    or search_lower in c.license_plate.lower()
-                    or search_lower in c.color.lower()
-                    or search_lower in c.category.lower()
-                    or search_lower in str(c.year)
-                )
-            ]
+            cars = [c for c in cars if search_lower in c.search_text]
 
         # Sort by creation date (newest first)
         cars.sort(key=lambda x: x.created_at, reverse=True)
 
         # Apply pagination
         total = len(cars)
-        offset = (page - 1) * limit
+        if cursor:
+            last_id = decode_cursor(cursor)
+            offset = next((i + 1 for i, c in enumerate(cars) if c.id == last_id), None)
+            if offset is None:
+                raise ValueError(f"Invalid pagination cursor: {cursor}")
+        else:
+            offset = (page - 1) * limit
         paginated_cars = cars[offset : offset + limit]
+        has_more = offset + limit < total
 
         return {
             "cars": [c.to_dict() for c in paginated_cars],
             "total": total,
             "page": page,
             "totalPages": (total + limit - 1) // limit,
-            "hasMore": page < (total + limit - 1) // limit,
+            "hasMore": has_more,
+            "nextCursor": (
+                encode_cursor(paginated_cars[-1].id)
+                if has_more and paginated_cars
+                else None
+            ),
         }
 
     async def save(self, car: Car) -> Car:
@@ -219,7 +228,11 @@ class MockCarRepository(CarRepository):
 
     async def count_by_status(self, status: str) -> int:
         """Count cars by status"""
-        return len([c for c in self._cars.values() if c.status.value == status])
+        return (await self.counts_by_status()).get(status, 0)
+
+    async def counts_by_status(self) -> Dict[str, int]:
+        """Count cars for every status in one pass, keyed by status"""
+        return dict(Counter(c.status.value for c in self._cars.values()))
 
     async def find_available_cars(
         self,
@@ -2,13 +2,21 @@
 Mock implementation of Contract repository for testing and fallback
 """
 
+from collections import Counter
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
-from app.domain.entities.contract import Contract, ContractStatus, PaymentStatus
+from app.domain.entities.contract import (
+    Contract,
+    ContractStatus,
+    PaymentStatus,
+    find_expiring_contracts,
+    find_overdue_contracts,
+)
 from app.domain.repositories.contract_repository import ContractRepository
 from app.domain.value_objects.date_range import DateRange
 from app.domain.value_objects.money import Money
+from app.infrastructure.persistence.converters import decode_cursor, encode_cursor
 
 
 class MockContractRepository(ContractRepository):
@@ -53,6 +61,15 @@ class MockContractRepository(ContractRepository):
         """Find contract by ID"""
         return self._contracts.get(contract_id)
 
+    async def find_by_ids(self, contract_ids: List[str]) -> Dict[str, Contract]:
+        """Find several contracts by ID"""
+        contracts = self._contracts
+        return {
+            contract_id: contracts[contract_id]
+            for contract_id in contract_ids
+            if contract_id in contracts
+        }
+
     async def find_by_order_id(self, order_id: str) -> Optional[Contract]:
         """Find contract by order ID"""
         for contract in self._contracts.values():
@@ -60,6 +77,15 @@ class MockContractRepository(ContractRepository):
                 return contract
         return None
 
+    async def find_by_order_ids(self, order_ids: List[str]) -> Dict[str, Contract]:
+        """Find contracts for several order IDs"""
+        wanted = set(order_ids)
+        found: Dict[str, Contract] = {}
+        for contract in self._contracts.values():
+            if contract.order_id in wanted and contract.order_id not in found:
+                found[contract.order_id] = contract
+        return found
+
     async def find_by_contract_number(self, contract_number: str) -> Optional[Contract]:
         """Find contract by contract number"""
         for contract in self._contracts.values():
@@ -77,6 +103,7 @@ class MockContractRepository(ContractRepository):
         date_from: Optional[datetime] = None,
         date_to: Optional[datetime] = None,
         search: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
         """List contracts with pagination and filters"""
         contracts = list(self._contracts.values())
@@ -110,15 +137,29 @@ class MockContractRepository(ContractRepository):
 
         # Apply pagination
         total = len(contracts)
-        offset = (page - 1) * limit
+        if cursor:
+            last_id = decode_cursor(cursor)
+            offset = next(
+                (i + 1 for i, c in enumerate(contracts) if c.id == last_id), None
+            )
+            if offset is None:
+                raise ValueError(f"Invalid pagination cursor: {cursor}")
+        else:
+            offset = (page - 1) * limit
         paginated_contracts = contracts[offset : offset + limit]
+        has_more = offset + limit < total
 
         return {
             "contracts": [c.to_dict() for c in paginated_contracts],
             "total": total,
             "page": page,
             "totalPages": (total + limit - 1) // limit,
-            "hasMore": page < (total + limit - 1) // limit,
+            "hasMore": has_more,
+            "nextCursor": (
+                encode_cursor(paginated_contracts[-1].id)
+                if has_more and paginated_contracts
+                else None
+            ),
         }
 
     async def save(self, contract: Contract) -> Contract:
@@ -139,18 +180,16 @@ class MockContractRepository(ContractRepository):
 
     async def count_by_status(self, status: str) -> int:
         """Count contracts by status"""
-        return len([c for c in self._contracts.values() if c.status.value == status])
+        return (await self.counts_by_status()).get(status, 0)
+
+    async def counts_by_status(self) -> Dict[str, int]:
+        """Count contracts for every status in one pass, keyed by status"""
+        return dict(Counter(c.status.value for c in self._contracts.values()))
 
     async def find_overdue(self) -> List[Contract]:
         """Find all overdue contracts"""
-        return [c for c in self._contracts.values() if c.is_overdue()]
+        return find_overdue_contracts(self._contracts.values())
 
     async def find_expiring_soon(self, days: int = 7) -> List[Contract]:
         """Find contracts expiring within specified days"""
-        future_date = datetime.now() + timedelta(days=days)
-        return [
-            c
-            for c in self._contracts.values()
-            if c.status in [ContractStatus.ACTIVE, ContractStatus.EXTENDED]
-            and c.date_range.end_date <= future_date
-        ]
+        return find_expiring_contracts(self._contracts.values(), days)
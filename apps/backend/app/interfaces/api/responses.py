@@ -0,0 +1,40 @@
+"""
+JSON responses that encode entity dictionaries in a single pass
+"""
+
+import json
+from datetime import date
+from enum import Enum
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode the values entity to_dict() leaves unrendered"""
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is not None:
+        return to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class EntityJSONResponse(JSONResponse):
+    """JSONResponse that renders datetimes and enums while encoding.
+
+    Returning a response instance from a route skips FastAPI's
+    jsonable_encoder, so the payload is walked once instead of twice.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+            default=_json_default,
+        ).encode("utf-8")
@@ -9,6 +9,7 @@ from pydantic import BaseModel
 
 from app.domain.repositories.car_repository import CarRepository
 from app.infrastructure.dependencies import get_car_repository
+from app.interfaces.api.responses import EntityJSONResponse
 
 router = APIRouter(prefix="/cars", tags=["cars"])
 
@@ -58,12 +59,14 @@ class CarCreate(BaseModel):
 async def get_cars(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    status: Optional[str] = Query(None),
+    # Aliased so the parameter does not shadow fastapi.status
+    status_filter: Optional[str] = Query(None, alias="status"),
     category: Optional[str] = Query(None),
     make: Optional[str] = Query(None),
     available_only: Optional[bool] = Query(None),
     location: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
     repository: CarRepository = Depends(get_car_repository),
 ):
     """Get all cars with pagination and filters"""
@@ -71,18 +74,24 @@ async def get_cars(
         result = await repository.list(
             page=page,
             limit=limit,
-            status=status,
+            status=status_filter,
             category=category,
             make=make,
             available_only=available_only,
             location=location,
             search=search,
+            cursor=cursor,
         )
-        return {
-            "data": result,
-            "message": "Cars retrieved successfully",
-            "status_code": 200,
-        }
+        return EntityJSONResponse(
+            {
+                "data": result,
+                "message": "Cars retrieved successfully",
+                "status_code": 200,
+            }
+        )
+    except ValueError as e:
+        # Malformed cursors, or cursors whose car has been deleted
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -102,11 +111,13 @@ async def get_available_cars(
             category=category,
             location=location,
         )
-        return {
-            "data": {"cars": [c.to_dict() for c in cars]},
-            "message": "Available cars retrieved successfully",
-            "status_code": 200,
-        }
+        return EntityJSONResponse(
+            {
+                "data": {"cars": [c.to_dict() for c in cars]},
+                "message": "Available cars retrieved successfully",
+                "status_code": 200,
+            }
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -122,11 +133,13 @@ async def get_cars_due_for_service(
     """Get cars due for service"""
     try:
         cars = await repository.find_cars_due_for_service(days_ahead=days_ahead)
-        return {
-            "data": {"cars": [c.to_dict() for c in cars]},
-            "message": f"Cars due for service in {days_ahead} days retrieved successfully",
-            "status_code": 200,
-        }
+        return EntityJSONResponse(
+            {
+                "data": {"cars": [c.to_dict() for c in cars]},
+                "message": f"Cars due for service in {days_ahead} days retrieved successfully",
+                "status_code": 200,
+            }
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -52,10 +52,12 @@ class ContractCreate(BaseModel):
 async def get_contracts(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    status: Optional[str] = Query(None),
+    # Aliased so the parameter does not shadow fastapi.status
+    status_filter: Optional[str] = Query(None, alias="status"),
     payment_status: Optional[str] = Query(None),
     user_id: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
     repository: ContractRepository = Depends(get_contract_repository),
 ):
     """Get all contracts with pagination and filters"""
@@ -63,10 +65,11 @@ async def get_contracts(
         result = await repository.list(
             page=page,
             limit=limit,
-            status=status,
+            status=status_filter,
             payment_status=payment_status,
             user_id=user_id,
             search=search,
+            cursor=cursor,
         )
         # result already contains dictionaries from _paginate_results
         return {
@@ -74,6 +77,9 @@ async def get_contracts(
             "message": "Contracts retrieved successfully",
             "status_code": 200,
         }
+    except ValueError as e:
+        # Malformed cursors, or cursors whose contract has been deleted
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         import traceback
 
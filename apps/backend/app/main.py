@@ -11,6 +11,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.config import get_settings
+from app.infrastructure.firebase_collections import warm_up_async_firebase_db
 from app.interfaces.api.v1.bookings import router as bookings_router
 from app.interfaces.api.v1.cars import router as cars_router
 from app.interfaces.api.v1.contracts import router as contracts_router
@@ -22,6 +23,7 @@ from app.interfaces.middleware.error_handler import add_exception_handlers
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
     print("🚀 Starting Car Rental System API v3.0 (FastAPI + DDD)")
+    await warm_up_async_firebase_db()
     yield
     print("🛑 Shutting down Car Rental System API")
 
@@ -248,4 +248,23 @@ def test_cars_search(client):
     
     data = response.json()["data"]
     # Should find cars with "Toyota" in their make
-    assert len(data["cars"]) >= 0  # May or may not find results
\ No newline at end of file
+    assert len(data["cars"]) >= 0  # May or may not find results
+
+@pytest.mark.unit
+def test_get_cars_with_cursor(client):
+    """Test that a cursor resumes listing after the previous page"""
+    response = client.get("/api/v1/cars/", params={"limit": 1})
+    assert response.status_code == 200
+
+    first_page = response.json()["data"]
+    assert first_page["hasMore"] is True
+    assert first_page["nextCursor"]
+
+    response = client.get(
+        "/api/v1/cars/", params={"limit": 1, "cursor": first_page["nextCursor"]}
+    )
+    assert response.status_code == 200
+
+    second_page = response.json()["data"]
+    assert len(second_page["cars"]) == 1
+    assert second_page["cars"][0]["id"] != first_page["cars"][0]["id"]
@@ -0,0 +1,126 @@
+"""
+Tests for Firestore value converters and pagination cursors
+"""
+
+import math
+from datetime import datetime, timezone
+
+import pytest
+
+from app.infrastructure.persistence.converters import (
+    convert_firestore_document,
+    decode_cursor,
+    decode_timestamp_cursor,
+    encode_cursor,
+    encode_timestamp_cursor,
+)
+
+
+class FakeTimestamp(datetime):
+    """Stand-in for Firestore's DatetimeWithNanoseconds"""
+
+
+class FakeGeoPoint:
+    def __init__(self, latitude, longitude):
+        self.latitude = latitude
+        self.longitude = longitude
+
+
+class FakeDocumentReference:
+    def __init__(self, path):
+        self.path = path
+
+
+class Opaque:
+    def __str__(self):
+        return "opaque"
+
+
+@pytest.mark.unit
+def test_scalars_pass_through():
+    """JSON scalars are returned unchanged"""
+    for value in ("text", 42, True, None, 1.5):
+        assert convert_firestore_document(value) == value
+
+
+@pytest.mark.unit
+def test_non_finite_floats_become_none():
+    """NaN and infinities have no JSON form and are dropped to None"""
+    assert convert_firestore_document(math.nan) is None
+    assert convert_firestore_document(math.inf) is None
+    assert convert_firestore_document(-math.inf) is None
+
+
+@pytest.mark.unit
+def test_firestore_types_are_converted():
+    """Timestamps, datetimes, GeoPoints and references get JSON forms"""
+    moment = FakeTimestamp(2024, 6, 1, 8, 30, tzinfo=timezone.utc)
+
+    assert convert_firestore_document(moment) == "2024-06-01T08:30:00+00:00"
+    assert convert_firestore_document(datetime(2024, 6, 1)) == "2024-06-01T00:00:00"
+    assert convert_firestore_document(FakeGeoPoint(24.7, 46.6)) == {
+        "latitude": 24.7,
+        "longitude": 46.6,
+    }
+    assert convert_firestore_document(FakeDocumentReference("cars/abc")) == "cars/abc"
+
+
+@pytest.mark.unit
+def test_nested_documents_are_converted_recursively():
+    """Dicts and lists are walked, converting every value inside them"""
+    document = {
+        "car": FakeDocumentReference("cars/abc"),
+        "pickup": {
+            "location": FakeGeoPoint(21.5, 39.2),
+            "at": FakeTimestamp(2024, 6, 1, tzinfo=timezone.utc),
+        },
+        "history": [
+            {"score": math.nan, "tags": ["a", None]},
+            [FakeDocumentReference("users/u1"), 3],
+        ],
+        "other": Opaque(),
+    }
+
+    assert convert_firestore_document(document) == {
+        "car": "cars/abc",
+        "pickup": {
+            "location": {"latitude": 21.5, "longitude": 39.2},
+            "at": "2024-06-01T00:00:00+00:00",
+        },
+        "history": [
+            {"score": None, "tags": ["a", None]},
+            ["users/u1", 3],
+        ],
+        "other": "opaque",
+    }
+
+
+@pytest.mark.unit
+def test_converter_cache_keeps_types_apart():
+    """Values of a type seen before are still converted by their own rules"""
+    first = convert_firestore_document([FakeGeoPoint(1.0, 2.0)])
+    second = convert_firestore_document([FakeGeoPoint(3.0, 4.0), {"x": 1}])
+
+    assert first == [{"latitude": 1.0, "longitude": 2.0}]
+    assert second == [{"latitude": 3.0, "longitude": 4.0}, {"x": 1}]
+
+
+@pytest.mark.unit
+def test_cursors_round_trip():
+    """Document and timestamp cursors decode to what they encoded"""
+    assert decode_cursor(encode_cursor("doc/ü-1")) == "doc/ü-1"
+
+    moment = datetime(2024, 6, 1, 8, 30, 15, 123456)
+    assert decode_timestamp_cursor(encode_timestamp_cursor(moment, "tx1")) == (
+        moment,
+        "tx1",
+    )
+
+
+@pytest.mark.unit
+def test_malformed_cursors_raise_value_error():
+    """Cursors that do not decode raise ValueError rather than leaking others"""
+    with pytest.raises(ValueError):
+        decode_cursor("abc")
+    with pytest.raises(ValueError):
+        decode_timestamp_cursor(encode_cursor("not json"))
@@ -0,0 +1,346 @@
+"""
+Tests for the generated to_dict and from_trusted entity methods
+"""
+
+import os
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.domain.base import ValidationError, new_id
+from app.domain.entities.booking import Booking, BookingStatus
+from app.domain.entities.car import Car, CarStatus, FuelType, TransmissionType
+from app.domain.entities.contract import (
+    CancellationRecord,
+    Contract,
+    ContractStatus,
+    PaymentStatus,
+)
+from app.domain.entities.offer import OfferItem
+from app.domain.entities.user import User
+from app.domain.value_objects.date_range import DateRange
+from app.domain.value_objects.money import Money
+
+CREATED_AT = datetime(2024, 1, 2, 3, 4, 5)
+UPDATED_AT = datetime(2024, 2, 3, 4, 5, 6)
+
+
+def car_fields(**overrides):
+    """Constructor arguments for a fully populated car"""
+    fields = {
+        "make": "Toyota",
+        "model": "Camry",
+        "year": 2022,
+        "color": "White",
+        "license_plate": "TOY-1234",
+        "category": "Sedan",
+        "daily_rate": Money(Decimal("150.50")),
+        "weekly_rate": Money(Decimal("900")),
+        "monthly_rate": None,
+        "status": CarStatus.RENTED,
+        "location": "Riyadh",
+        "mileage": 12000,
+        "fuel_type": FuelType.HYBRID,
+        "transmission": None,
+        "seats": 5,
+        "features": ["gps", "bluetooth"],
+        "last_service_date": datetime(2024, 1, 15, 9, 30),
+        "next_service_date": None,
+        "car_data": {"source": "test"},
+    }
+    fields.update(overrides)
+    return fields
+
+
+def contract_fields(**overrides):
+    """Constructor arguments for a contract"""
+    fields = {
+        "order_id": "ORDER_1",
+        "contract_number": "CNT_1",
+        "user_id": "user-1",
+        "car_id": "car-1",
+        "date_range": DateRange(datetime(2024, 3, 1), datetime(2024, 3, 8)),
+        "booking_type": "Week",
+        "count": 1,
+        "booking_cost": Money(Decimal("700")),
+        "taxes": Money(Decimal("105")),
+        "delivery_fee": Money(Decimal("0")),
+        "offers_total": Money(Decimal("50")),
+        "total_cost": Money(Decimal("855")),
+        "status": ContractStatus.CANCELLED,
+        "payment_status": PaymentStatus.PAID,
+        "cancellation": CancellationRecord("Changed plans"),
+    }
+    fields.update(overrides)
+    return fields
+
+
+def with_metadata(entity, entity_id="entity-1"):
+    """Pin the generated ID and timestamps so two entities compare equal"""
+    entity.id = entity_id
+    entity.created_at = CREATED_AT
+    entity.updated_at = UPDATED_AT
+    return entity
+
+
+@pytest.mark.unit
+def test_car_to_dict_matches_hand_built_dict():
+    """Generated Car.to_dict renders enums, Money, dates and Optionals"""
+    car = with_metadata(Car(**car_fields()))
+
+    assert car.to_dict() == {
+        "id": "entity-1",
+        "make": "Toyota",
+        "model": "Camry",
+        "year": 2022,
+        "color": "White",
+        "license_plate": "TOY-1234",
+        "category": "Sedan",
+        "display_name": "2022 Toyota Camry",
+        "age_years": car.age_years,
+        "is_new": car.is_new,
+        "daily_rate": 150.5,
+        "weekly_rate": 900.0,
+        "monthly_rate": None,
+        "currency": "SAR",
+        "status": "rented",
+        "is_available": False,
+        "location": "Riyadh",
+        "mileage": 12000,
+        "fuel_type": "hybrid",
+        "transmission": None,
+        "seats": 5,
+        "engine_size": None,
+        "features": ["gps", "bluetooth"],
+        "has_gps": False,
+        "has_bluetooth": False,
+        "has_usb_charger": False,
+        "has_backup_camera": False,
+        "last_service_date": "2024-01-15T09:30:00",
+        "next_service_date": None,
+        "service_interval_km": None,
+        "is_overdue_for_service": False,
+        "car_data": {"source": "test"},
+        "created_at": "2024-01-02T03:04:05",
+        "updated_at": "2024-02-03T04:05:06",
+    }
+
+
+@pytest.mark.unit
+def test_car_to_dict_renders_enum_values_as_plain_strings():
+    """Enum members are rendered as their values, not the members themselves"""
+    data = Car(**car_fields(transmission=TransmissionType.CVT)).to_dict()
+
+    assert type(data["status"]) is str
+    assert type(data["fuel_type"]) is str
+    assert data["transmission"] == "cvt"
+
+
+@pytest.mark.unit
+def test_car_from_trusted_matches_constructor():
+    """A trusted load builds the same car as the validating constructor"""
+    fields = car_fields()
+    built = with_metadata(Car(**fields))
+    loaded = Car.from_trusted(
+        {
+            **fields,
+            "features": dict.fromkeys(fields["features"]),
+            "id": "entity-1",
+            "created_at": CREATED_AT,
+            "updated_at": UPDATED_AT,
+        }
+    )
+
+    assert loaded.to_dict() == built.to_dict()
+    assert loaded.status is CarStatus.RENTED
+    assert loaded.fuel_type is FuelType.HYBRID
+
+
+@pytest.mark.unit
+def test_from_trusted_applies_defaults_and_metadata():
+    """Missing optional fields take their defaults; ID and timestamps are filled"""
+    car = Car.from_trusted(
+        {
+            "make": "Kia",
+            "model": "Rio",
+            "year": 2021,
+            "color": "Red",
+            "license_plate": "KIA-0001",
+            "category": "Economy",
+            "daily_rate": Money(Decimal("90")),
+        }
+    )
+
+    assert car.id
+    assert car.created_at is not None
+    assert car.updated_at == car.created_at
+    assert car.status is CarStatus.AVAILABLE
+    assert car.weekly_rate is None
+    assert car.fuel_type is None
+    assert car.features == {}
+    assert car.car_data == {}
+
+
+@pytest.mark.unit
+def test_from_trusted_default_factories_are_not_shared():
+    """Each trusted load gets its own default containers"""
+    minimal = {
+        "make": "Kia",
+        "model": "Rio",
+        "year": 2021,
+        "color": "Red",
+        "license_plate": "KIA-0001",
+        "category": "Economy",
+        "daily_rate": Money(Decimal("90")),
+    }
+    first, second = Car.bulk_from_trusted([minimal, minimal])
+
+    first.car_data["key"] = "value"
+    assert second.car_data == {}
+    assert first.id != second.id
+    assert first.created_at == second.created_at
+
+
+@pytest.mark.unit
+def test_from_trusted_missing_required_field():
+    """A record without a required field raises ValidationError"""
+    with pytest.raises(ValidationError, match="make"):
+        Car.from_trusted({"model": "Rio"})
+
+
+@pytest.mark.unit
+def test_contract_from_trusted_matches_constructor():
+    """Contract to_dict agrees between the constructor and a trusted load"""
+    fields = contract_fields()
+    built = with_metadata(Contract(**fields))
+    loaded = Contract.from_trusted(
+        {
+            **fields,
+            "id": "entity-1",
+            "created_at": CREATED_AT,
+            "updated_at": UPDATED_AT,
+        }
+    )
+
+    data = loaded.to_dict()
+    assert data == built.to_dict()
+    assert data["ContractStatus"] == "cancelled"
+    assert data["payment_status"] == "paid"
+    assert data["start_date"] == "2024-03-01T00:00:00"
+    assert data["booking_cost"] == 700.0
+    assert data["cancellation_reason"] == "Changed plans"
+    # Legacy cancellations carry no time
+    assert data["cancelled_at"] is None
+    assert data["transaction_info"] is None
+    assert data["listExtendDetails"] == []
+    assert data["created_at"] == "2024-01-02T03:04:05"
+
+
+@pytest.mark.unit
+def test_booking_to_dict_is_json_safe():
+    """Booking dates render as ISO strings and enums as their values"""
+    booking = Booking.from_trusted(
+        {
+            "id": "entity-1",
+            "order_id": "ORDER_1",
+            "booking_number": "BKG_1",
+            "user_id": "user-1",
+            "car_id": "car-1",
+            "date_range": DateRange(datetime(2024, 3, 1), datetime(2024, 3, 2)),
+            "booking_type": "Day",
+            "count": 1,
+            "locations": None,
+            "booking_cost": Money(Decimal("100")),
+            "taxes": Money(Decimal("15")),
+            "delivery_fee": Money(Decimal("0")),
+            "offers_total": Money(Decimal("0")),
+            "total_cost": Money(Decimal("115")),
+            "status": BookingStatus.PENDING,
+            "accepted_at": datetime(2024, 2, 28, 10, 0),
+            "created_at": CREATED_AT,
+            "updated_at": UPDATED_AT,
+        }
+    )
+
+    data = booking.to_dict()
+    assert data["start_date"] == "2024-03-01T00:00:00"
+    assert data["end_date"] == "2024-03-02T00:00:00"
+    assert type(data["OrderStatus"]) is str
+    assert data["OrderStatus"] == BookingStatus.PENDING.value
+    assert type(data["payment_status"]) is str
+    assert data["accepted_at"] == "2024-02-28T10:00:00"
+    assert data["denied_at"] is None
+    assert data["created_at"] == "2024-01-02T03:04:05"
+    assert data["updated_at"] == "2024-02-03T04:05:06"
+
+
+@pytest.mark.unit
+def test_offer_item_to_dict_optional_keys():
+    """Optional keys are added only when set; check_none keeps falsy numbers"""
+    item = OfferItem(
+        offer="Insurance",
+        offer_ar="تأمين",
+        offer_type="Insurance",
+        offer_price=10.0,
+        offer_total_price=70.0,
+        offer_ref="offer-1",
+        payment_method="",
+        custom_amount=0.0,
+    )
+
+    assert item.to_dict() == {
+        "offer": "Insurance",
+        "offerAr": "تأمين",
+        "offerType": "Insurance",
+        "offerPrice": 10.0,
+        "offerTotalPrice": 70.0,
+        "offerRef": "offer-1",
+        "customAmount": 0.0,
+    }
+
+    item.payment_method = "wallet"
+    item.custom_amount = None
+    data = item.to_dict()
+    assert data["paymentMethod"] == "wallet"
+    assert "customAmount" not in data
+
+
+@pytest.mark.unit
+def test_user_full_name_follows_direct_name_changes():
+    """full_name is rebuilt when a name field is assigned directly"""
+    user = User(
+        email="user@example.com",
+        first_name="Ali",
+        last_name="Hassan",
+        phone_number="+966500000000",
+        nationality="SA",
+        status_number="1234567890",
+    )
+    assert user.full_name == "Ali Hassan"
+
+    user.first_name = "Omar"
+    assert user.full_name == "Omar Hassan"
+    assert user.to_dict()["full_name"] == "Omar Hassan"
+
+    user.update_profile(last_name="Saleh")
+    assert user.full_name == "Omar Saleh"
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_child_does_not_reuse_parent_ids():
+    """A forked process draws fresh IDs instead of the inherited pool"""
+    new_id()  # make sure the parent has a pool to inherit
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.write(write_end, new_id().encode())
+        os._exit(0)
+    os.close(write_end)
+    os.waitpid(pid, 0)
+    child_id = os.read(read_end, 64).decode()
+    os.close(read_end)
+
+    # Without the at-fork reset the child pops the parent's next ID
+    assert child_id and child_id != new_id()
@@ -0,0 +1,110 @@
+"""
+Tests for PricingService booking cost breakdowns
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from app.domain.base import ValidationError
+from app.domain.services.pricing_service import PricingBreakdown, PricingService
+from app.domain.value_objects.money import Money
+
+CARS = [
+    {"rental_price": 100, "rental_price_week": 600, "rental_price_month": 2000},
+    # No weekly or monthly rate: falls back to the daily rate
+    {"rental_price_day": 80, "Currency": "usd"},
+    # Legacy misspelled monthly field
+    {"rental_price": 120.5, "rental_price_mounth": 3100},
+]
+
+OFFERS = [
+    {"type": "KM_Package"},
+    {"type": "insurance", "percentage": 10},
+    {"type": "documents", "price": 50},
+    {"type": "child_chair", "daily_rate": 15, "days": 3},
+    {"type": "unknown", "price": 5.5},
+]
+
+
+@pytest.fixture
+def service():
+    return PricingService()
+
+
+@pytest.mark.unit
+def test_total_booking_cost_returns_breakdown(service):
+    """The breakdown holds Money values whose parts add up to the total"""
+    result = service.calculate_total_booking_cost(
+        CARS[0], "Week", 2, discount_percent=10, delivery_fee=25
+    )
+
+    assert isinstance(result, PricingBreakdown)
+    assert result.booking_cost == Money(Decimal("1080"))
+    assert result.delivery_fee == Money(Decimal("25"))
+    assert result.offers_total == Money(0)
+    assert result.taxes == service.calculate_taxes(result.booking_cost)
+    assert result.total_cost.amount == (
+        result.booking_cost.amount
+        + result.taxes.amount
+        + result.delivery_fee.amount
+        + result.offers_total.amount
+    )
+
+
+@pytest.mark.unit
+def test_total_booking_cost_prices_offers(service):
+    """Each offer type is priced from the booking cost or its own fields"""
+    result = service.calculate_total_booking_cost(CARS[0], "Day", 4, offers=OFFERS)
+
+    # 400 base: 25% KM, 10% insurance, 50 documents, 15 * 3 chair, 5.5 fixed
+    assert result.offers_total.amount == Decimal("240.5")
+
+
+@pytest.mark.unit
+def test_breakdown_is_immutable(service):
+    """PricingBreakdown is a frozen value"""
+    result = service.calculate_total_booking_cost(CARS[0], "Day", 1)
+
+    with pytest.raises(AttributeError):
+        result.total_cost = Money(0)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("booking_type", ["Day", "Week", "Month"])
+def test_total_booking_cost_many_matches_single(service, booking_type):
+    """The batch gives the same breakdown as pricing each car alone"""
+    options = {"discount_percent": 12.5, "delivery_fee": 30, "offers": OFFERS}
+
+    batch = service.calculate_total_booking_cost_many(CARS, booking_type, 3, **options)
+
+    assert batch == [
+        service.calculate_total_booking_cost(car, booking_type, 3, **options)
+        for car in CARS
+    ]
+    assert batch[1].total_cost.currency == "USD"
+
+
+@pytest.mark.unit
+def test_total_booking_cost_many_without_discount_or_offers(service):
+    """Defaults match the single-car path too"""
+    batch = service.calculate_total_booking_cost_many(CARS, "Month", 1)
+
+    assert batch == [
+        service.calculate_total_booking_cost(car, "Month", 1) for car in CARS
+    ]
+    assert batch[0].offers_total == Money(0)
+
+
+@pytest.mark.unit
+def test_total_booking_cost_many_empty(service):
+    assert service.calculate_total_booking_cost_many([], "Day", 1) == []
+
+
+@pytest.mark.unit
+def test_total_booking_cost_many_validates_once(service):
+    """Invalid booking types and discounts fail the whole batch"""
+    with pytest.raises(ValidationError):
+        service.calculate_total_booking_cost_many(CARS, "Year", 1)
+    with pytest.raises(ValidationError):
+        service.calculate_total_booking_cost_many(CARS, "Day", 1, discount_percent=150)
@@ -0,0 +1,374 @@
+"""
+Tests for WalletService against an in-memory async Firestore client
+"""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from app.domain.services import wallet_service
+from app.domain.services.wallet_service import WalletService
+from app.domain.value_objects.money import Money
+
+
+class FakeIncrement:
+    """Stand-in for firestore.Increment"""
+
+    def __init__(self, value):
+        self.value = value
+
+
+class FakeSnapshot:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+class FakeQuery:
+    """Ordered, filtered and paged view over a fake collection"""
+
+    def __init__(self, collection, filters=(), start_after=None, limit=None):
+        self._collection = collection
+        self._filters = filters
+        self._start_after = start_after
+        self._limit = limit
+
+    def _copy(self, **changes):
+        state = {
+            "filters": self._filters,
+            "start_after": self._start_after,
+            "limit": self._limit,
+        }
+        state.update(changes)
+        return FakeQuery(self._collection, **state)
+
+    def order_by(self, field, direction=None):
+        # Transaction history is always ordered by (timestamp, __name__) desc
+        return self
+
+    def where(self, field, op, value):
+        assert op == "=="
+        return self._copy(filters=self._filters + ((field, value),))
+
+    def start_after(self, values):
+        return self._copy(start_after=tuple(values))
+
+    def limit(self, count):
+        return self._copy(limit=count)
+
+    async def stream(self):
+        self._collection.db.queries += 1
+        rows = sorted(
+            self._collection.docs.items(),
+            key=lambda item: (item[1]["timestamp"], item[0]),
+            reverse=True,
+        )
+        served = 0
+        for doc_id, data in rows:
+            if any(data.get(field) != value for field, value in self._filters):
+                continue
+            if self._start_after and (data["timestamp"], doc_id) >= self._start_after:
+                continue
+            if self._limit is not None and served >= self._limit:
+                return
+            served += 1
+            self._collection.db.streamed += 1
+            yield FakeSnapshot(doc_id, data)
+
+
+class FakeCollection(FakeQuery):
+    def __init__(self, db):
+        super().__init__(self)
+        self.db = db
+        self.docs = {}
+        # {(document ID, name): collection}, so every reference to a document
+        # sees the same subcollections
+        self.subcollections = {}
+
+    def document(self, doc_id=None):
+        if doc_id is None:
+            self.db.next_id += 1
+            doc_id = f"tx{self.db.next_id:03d}"
+        return FakeDocument(self, doc_id)
+
+
+class FakeDocument:
+    def __init__(self, collection, doc_id):
+        self.parent = collection
+        self.id = doc_id
+
+    @property
+    def data(self):
+        return self.parent.docs.get(self.id)
+
+    async def get(self, field_paths=None, transaction=None):
+        self.parent.db.reads += 1
+        data = self.data
+        if data is not None and field_paths is not None:
+            data = {key: data[key] for key in field_paths if key in data}
+        return FakeSnapshot(self.id, data)
+
+    def collection(self, name):
+        key = (self.id, name)
+        if key not in self.parent.subcollections:
+            self.parent.subcollections[key] = FakeCollection(self.parent.db)
+        return self.parent.subcollections[key]
+
+
+class FakeBatch:
+    def __init__(self, db):
+        self.db = db
+        self.writes = []
+
+    def update(self, ref, data):
+        self.writes.append(("update", ref, data))
+
+    def set(self, ref, data):
+        self.writes.append(("set", ref, data))
+
+    async def commit(self):
+        self.db.commits.append(self.writes)
+        for kind, ref, data in self.writes:
+            if kind == "set":
+                ref.parent.docs[ref.id] = dict(data)
+                continue
+            current = ref.data
+            if current is None:
+                raise LookupError(f"No document to update: {ref.id}")
+            for key, value in data.items():
+                if isinstance(value, FakeIncrement):
+                    value = current.get(key, 0) + value.value
+                current[key] = value
+
+
+class FakeAsyncClient:
+    def __init__(self):
+        self.collections = {}
+        self.commits = []
+        self.reads = 0
+        self.queries = 0
+        self.streamed = 0
+        self.next_id = 0
+
+    def collection(self, name):
+        if name not in self.collections:
+            self.collections[name] = FakeCollection(self)
+        return self.collections[name]
+
+    def batch(self):
+        return FakeBatch(self)
+
+    async def get_all(self, refs, field_paths=None):
+        for ref in refs:
+            yield await ref.get(field_paths=field_paths)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """Fake client holding one wallet, wired into the wallet service"""
+    client = FakeAsyncClient()
+    client.collection("users").docs["user-1"] = {
+        "Wallet_Balance": 100.0,
+        "Currency": "SAR",
+        "email": "user-1@example.com",
+    }
+    monkeypatch.setattr(wallet_service, "get_async_firebase_db", lambda: client)
+    monkeypatch.setattr(wallet_service, "Increment", FakeIncrement)
+    wallet_service._balance_cache.clear()
+    yield client
+    wallet_service._balance_cache.clear()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock for the balance cache"""
+    now = [1000.0]
+    monkeypatch.setattr(wallet_service, "monotonic", lambda: now[0])
+    return now
+
+
+def history(db, user_id="user-1"):
+    return db.collection("users").document(user_id).collection("Transaction_history")
+
+
+@pytest.mark.unit
+async def test_add_money_commits_increment_and_record_in_one_batch(db):
+    """Crediting sends the Increment and the history record in one commit"""
+    result = await WalletService().add_money_to_wallet(
+        "user-1", Money(Decimal("25.50")), "Top up", admin_user_id="admin-1"
+    )
+
+    assert result["success"] is True
+    assert len(db.commits) == 1
+    (update, user_ref, changes), (create, record_ref, record) = db.commits[0]
+    assert (update, user_ref.id) == ("update", "user-1")
+    assert create == "set"
+    assert record_ref.id == result["transactionId"]
+
+    # No read-modify-write: the balance is sent as a server-side delta
+    assert isinstance(changes["Wallet_Balance"], FakeIncrement)
+    assert changes["Wallet_Balance"].value == 25.5
+    assert db.collection("users").docs["user-1"]["Wallet_Balance"] == 125.5
+
+
+@pytest.mark.unit
+async def test_add_money_reports_balances_read_back_after_commit(db):
+    """previousBalance and newBalance come from the committed wallet"""
+    result = await WalletService().add_money_to_wallet(
+        "user-1", Money(Decimal("25.50")), "Top up"
+    )
+
+    assert result["wallet"] == {
+        "previousBalance": 100.0,
+        "newBalance": 125.5,
+        "currency": "SAR",
+    }
+
+
+@pytest.mark.unit
+async def test_add_money_writes_minor_units_on_the_record_only(db):
+    """The record carries exact minor units; the wallet gets no minor balance"""
+    await WalletService().add_money_to_wallet(
+        "user-1", Money(Decimal("10.005")), "Top up"
+    )
+
+    (record,) = history(db).docs.values()
+    assert record["amountMinor"] == 1001  # half up
+    assert record["action"] == "add"
+    assert record["previousBalance"] is None
+    assert "Wallet_Balance_Minor" not in db.collection("users").docs["user-1"]
+
+
+@pytest.mark.unit
+async def test_add_money_to_missing_wallet_fails(db):
+    """The batch fails as a whole when the user does not exist"""
+    result = await WalletService().add_money_to_wallet(
+        "missing", Money(Decimal("5")), "Top up"
+    )
+
+    assert result["success"] is False
+    assert history(db, "missing").docs == {}
+
+
+@pytest.mark.unit
+async def test_balance_is_cached_for_two_seconds(db, clock):
+    """Reads within the TTL are served from the cache"""
+    service = WalletService()
+
+    assert (await service.get_wallet_balance("user-1")).amount == Decimal("100.0")
+    db.collection("users").docs["user-1"]["Wallet_Balance"] = 80.0
+
+    clock[0] += wallet_service.BALANCE_CACHE_TTL - 0.1
+    assert (await service.get_wallet_balance("user-1")).amount == Decimal("100.0")
+    assert db.reads == 1
+
+    clock[0] += 0.2
+    assert (await service.get_wallet_balance("user-1")).amount == Decimal("80.0")
+    assert db.reads == 2
+
+
+@pytest.mark.unit
+async def test_credit_refreshes_cached_balance(db, clock):
+    """A credit replaces the cached balance instead of serving a stale one"""
+    service = WalletService()
+    await service.get_wallet_balance("user-1")
+
+    await service.add_money_to_wallet("user-1", Money(Decimal("5")), "Top up")
+    reads = db.reads
+
+    assert (await service.get_wallet_balance("user-1")).amount == Decimal("105.0")
+    assert db.reads == reads
+
+
+@pytest.mark.unit
+async def test_get_wallet_balances_reads_only_uncached_wallets(db, clock):
+    """Cached wallets are skipped and missing wallets read as zero"""
+    service = WalletService()
+    await service.get_wallet_balance("user-1")
+
+    balances = await service.get_wallet_balances(["user-1", "ghost", "user-1"])
+
+    assert balances["user-1"].amount == Decimal("100.0")
+    assert balances["ghost"].amount == 0
+    assert db.reads == 2
+
+
+@pytest.mark.unit
+async def test_transaction_history_pages_with_cursor(db):
+    """Pages resume from the (timestamp, ID) cursor without overlap"""
+    start = datetime(2024, 5, 1, 12, 0)
+    for i in range(5):
+        history(db).docs[f"tx{i}"] = {
+            "action": "add" if i % 2 == 0 else "deduct",
+            "amount": float(i),
+            # tx1 and tx2 share a timestamp; the document ID breaks the tie
+            "timestamp": start + timedelta(minutes=(0, 1, 1, 3, 4)[i]),
+        }
+    service = WalletService()
+
+    first = await service.get_transaction_history("user-1", limit=2)
+    assert [t["id"] for t in first["transactions"]] == ["tx4", "tx3"]
+    assert first["hasMore"] is True
+
+    second = await service.get_transaction_history(
+        "user-1", limit=2, start_after=first["nextCursor"]
+    )
+    assert [t["id"] for t in second["transactions"]] == ["tx2", "tx1"]
+    assert second["hasMore"] is True
+
+    last = await service.get_transaction_history(
+        "user-1", limit=2, start_after=second["nextCursor"]
+    )
+    assert [t["id"] for t in last["transactions"]] == ["tx0"]
+    assert last["hasMore"] is False
+    assert last["nextCursor"] is None
+
+
+@pytest.mark.unit
+async def test_transaction_history_stops_at_lookahead_document(db):
+    """Only limit + 1 documents are read to detect another page"""
+    start = datetime(2024, 5, 1)
+    for i in range(10):
+        history(db).docs[f"tx{i}"] = {
+            "action": "add",
+            "timestamp": start + timedelta(minutes=i),
+        }
+
+    result = await WalletService().get_transaction_history("user-1", limit=3)
+
+    assert result["totalCount"] == 3
+    assert db.streamed == 4
+
+
+@pytest.mark.unit
+async def test_transaction_history_action_filter(db):
+    """action_filter keeps the cursor order while narrowing the actions"""
+    start = datetime(2024, 5, 1)
+    for i in range(4):
+        history(db).docs[f"tx{i}"] = {
+            "action": "add" if i % 2 == 0 else "deduct",
+            "timestamp": start + timedelta(minutes=i),
+        }
+
+    result = await WalletService().get_transaction_history(
+        "user-1", limit=10, action_filter="deduct"
+    )
+
+    assert [t["id"] for t in result["transactions"]] == ["tx3", "tx1"]
+    assert result["transactions"][0]["timestamp"] == "2024-05-01T00:03:00"
+
+
+@pytest.mark.unit
+async def test_transaction_history_rejects_malformed_cursor(db):
+    """A cursor that does not decode fails the request instead of restarting"""
+    result = await WalletService().get_transaction_history(
+        "user-1", start_after="not-a-cursor"
+    )
+
+    assert result["success"] is False
+    assert result["transactions"] == []